@@ -0,0 +1,121 @@
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, List
+
+from api.clients.cache import ResponseCache
+from api.clients.litres_client import BASE_URL, CART_CHUNK_SIZE, LitresAPIClient
+from api.clients.metrics import LatencyRecorder
+from api.clients.rate_limit import RateLimiter
+from api.clients.response import LitresResponse
+from api.models.cart_model import BulkCartResult
+from utils.allure_sink import AttachmentSink
+
+
+class AsyncLitresAPIClient:
+    """Асинхронный API клиент для Litres с ограничением параллельности
+
+    Запросы выполняет LitresAPIClient (логирование и Allure attachments
+    остаются прежними) в пуле потоков поверх общего пула keep-alive
+    соединений. Семафор ограничивает число одновременных запросов; он
+    создается отдельно для каждого event loop, поэтому клиент можно
+    использовать в нескольких asyncio.run и function-scoped loop.
+    """
+
+    def __init__(self, base_url: str = BASE_URL, concurrency: int = 10, attachments: AttachmentSink = None,
+                 cache: ResponseCache = None, rate_limiter: RateLimiter = None, priority: bool = False,
+                 metrics: LatencyRecorder = None):
+        self.concurrency = concurrency
+        self.client = LitresAPIClient(base_url, pool_maxsize=concurrency, attachments=attachments, cache=cache,
+                                      rate_limiter=rate_limiter, priority=priority, metrics=metrics)
+        self.attachments = self.client.attachments
+        # Семафор привязывается к loop при первом ожидании: {loop: семафор}
+        self._semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._semaphores_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="litres-api")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Закрыть пул потоков и HTTP сессию"""
+        self._executor.shutdown(wait=True)
+        self.client.session.close()
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        """Семафор текущего event loop (создается при первом запросе в нем)"""
+        with self._semaphores_lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.concurrency)
+            return semaphore
+
+    async def _run(self, func: Callable[..., LitresResponse], *args, **kwargs) -> LitresResponse:
+        """Выполнить синхронный вызов клиента с учетом семафора"""
+        loop = asyncio.get_running_loop()
+        async with self._semaphore(loop):
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    # ==================== HTTP METHODS ====================
+
+    async def get(self, endpoint: str, **kwargs) -> LitresResponse:
+        """Выполнить GET запрос"""
+        return await self._run(self.client.get, endpoint, **kwargs)
+
+    async def put(self, endpoint: str, **kwargs) -> LitresResponse:
+        """Выполнить PUT запрос"""
+        return await self._run(self.client.put, endpoint, **kwargs)
+
+    # ==================== CART METHODS ====================
+
+    async def get_cart(self, limit: int = 10) -> LitresResponse:
+        """Получить содержимое корзины"""
+        return await self._run(self.client.get_cart, limit)
+
+    async def add_to_cart(self, art_ids: List[int]) -> LitresResponse:
+        """Добавить книги в корзину"""
+        return await self._run(self.client.add_to_cart, art_ids)
+
+    async def remove_from_cart(self, art_ids: List[int]) -> LitresResponse:
+        """Удалить книги из корзины"""
+        return await self._run(self.client.remove_from_cart, art_ids)
+
+    async def add_to_cart_bulk(self, art_ids: List[int], chunk_size: int = CART_CHUNK_SIZE) -> BulkCartResult:
+        """Добавить много книг в корзину параллельными запросами по частям"""
+        return await self._run(self.client.add_to_cart_bulk, art_ids, chunk_size, self.concurrency)
+
+    async def remove_from_cart_bulk(self, art_ids: List[int], chunk_size: int = CART_CHUNK_SIZE) -> BulkCartResult:
+        """Удалить много книг из корзины параллельными запросами по частям"""
+        return await self._run(self.client.remove_from_cart_bulk, art_ids, chunk_size, self.concurrency)
+
+    # ==================== SEARCH METHODS ====================
+
+    async def search_books(self, query: str, limit: int = 24, offset: int = 0) -> LitresResponse:
+        """Поиск книг"""
+        return await self._run(self.client.search_books, query, limit, offset)
+
+    async def search_many(self, queries: Iterable[str], limit: int = 24) -> List[LitresResponse]:
+        """Параллельный поиск по списку запросов (порядок ответов совпадает с запросами)"""
+        return await self.gather(*(self.search_books(query, limit=limit) for query in queries))
+
+    # ==================== BOOKS METHODS ====================
+
+    async def get_book_details(self, art_id: int) -> LitresResponse:
+        """Получить детали книги"""
+        return await self._run(self.client.get_book_details, art_id)
+
+    # ==================== BATCH ====================
+
+    @staticmethod
+    async def gather(*aws: Awaitable[Any], return_exceptions: bool = False) -> List[Any]:
+        """Дождаться всех запросов пачки, аналог asyncio.gather
+
+        Параллельность ограничена семафором клиента, поэтому можно
+        передавать сразу тысячи корутин.
+        """
+        return list(await asyncio.gather(*aws, return_exceptions=return_exceptions))
@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+import datetime
+from collections import OrderedDict
+from typing import Optional
+
+import requests
+
+# Настройки кэша из окружения: LITRES_API_CACHE = "" (выключен) | "memory" | "disk"
+CACHE_MODE = os.getenv("LITRES_API_CACHE", "")
+CACHE_TTL = float(os.getenv("LITRES_API_CACHE_TTL", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("LITRES_API_CACHE_MAX_ENTRIES", "1024"))
+CACHE_PATH = os.getenv("LITRES_API_CACHE_PATH", os.path.join(tempfile.gettempdir(), "litres_api_cache.sqlite"))
+
+
+def make_cache_key(method: str, url: str, params: dict = None) -> str:
+    """Ключ кэша: метод, URL и параметры, отсортированные по имени"""
+    items = sorted((params or {}).items())
+    return f"{method.upper()} {url} {json.dumps(items, ensure_ascii=False, default=str)}"
+
+
+def _dump_response(response: requests.Response) -> dict:
+    return {
+        "status_code": response.status_code,
+        "headers": dict(response.headers),
+        "url": response.url,
+        "encoding": response.encoding,
+        "elapsed": response.elapsed.total_seconds(),
+    }
+
+
+def _load_response(meta: dict, content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = meta["status_code"]
+    response.headers.update(meta["headers"])
+    response.url = meta["url"]
+    response.encoding = meta["encoding"]
+    response.elapsed = datetime.timedelta(seconds=meta["elapsed"])
+    response._content = content
+    return response
+
+
+class ResponseCache:
+    """Кэш ответов GET запросов в памяти с TTL и вытеснением LRU"""
+
+    def __init__(self, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[requests.Response]:
+        """Ответ из кэша или None, если записи нет или она устарела"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            meta, content = entry[1], entry[2]
+        return _load_response(meta, content)
+
+    def set(self, key: str, response: requests.Response):
+        """Сохранить ответ в кэш"""
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, _dump_response(response), response.content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Очистить кэш"""
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskResponseCache(ResponseCache):
+    """Кэш ответов в общем файле SQLite
+
+    Один файл могут использовать несколько процессов (воркеры xdist):
+    SQLite сам сериализует запись.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES):
+        super().__init__(ttl, max_entries)
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, expires REAL, accessed REAL, meta TEXT, content BLOB)"
+            )
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        # Соединение SQLite нельзя делить между потоками
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[requests.Response]:
+        now = time.time()
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT meta, content FROM responses WHERE key = ? AND expires >= ?", (key, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return _load_response(json.loads(row[0]), row[1])
+
+    def set(self, key: str, response: requests.Response):
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, now + self.ttl, now, json.dumps(_dump_response(response)), response.content)
+            )
+            connection.execute("DELETE FROM responses WHERE expires < ?", (now,))
+            connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+
+
+def make_cache(mode: str = CACHE_MODE) -> Optional[ResponseCache]:
+    """Создать кэш по режиму LITRES_API_CACHE (None если кэш выключен)"""
+    if mode == "memory":
+        return ResponseCache()
+    if mode == "disk":
+        return DiskResponseCache()
+    return None
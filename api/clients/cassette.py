@@ -0,0 +1,234 @@
+import os
+import re
+import gzip
+import fcntl
+import json
+import base64
+import logging
+import threading
+from collections import defaultdict
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+# Кассета для API тестов: путь к файлу и режим
+#   replay - только воспроизведение, сеть не используется
+#   record - все запросы идут в сеть и записываются
+#   once   - воспроизведение, а запросы, которых нет в кассете, записываются
+CASSETTE_PATH = os.getenv("LITRES_API_CASSETTE", "")
+RECORD_MODE = os.getenv("LITRES_API_RECORD_MODE", "replay")
+
+CASSETTE_VERSION = 1
+
+# Заголовки, которые не имеют смысла для уже распакованного тела
+_SKIP_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection", "set-cookie"}
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Запроса нет в кассете, а режим не позволяет обращаться к сети"""
+
+
+class MatchRule:
+    """Правило сопоставления запросов для эндпоинтов, путь которых подходит под pattern
+
+    ignore_params - параметры, которые не учитываются в ключе;
+    match_body - учитывать ли тело запроса (например, art_ids корзины).
+    """
+
+    def __init__(self, pattern: str, ignore_params: List[str] = (), match_body: bool = False):
+        self.pattern = re.compile(pattern)
+        self.ignore_params = set(ignore_params)
+        self.match_body = match_body
+
+    def key(self, request: requests.PreparedRequest) -> str:
+        parts = urlsplit(request.url)
+        params = sorted(
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if name not in self.ignore_params
+        )
+        key = f"{request.method} {parts.netloc}{parts.path} {json.dumps(params, ensure_ascii=False)}"
+        if self.match_body and request.body:
+            body = request.body.decode("utf-8") if isinstance(request.body, bytes) else request.body
+            key += f" {body}"
+        return key
+
+
+DEFAULT_RULES = [
+    MatchRule(r"/cart/arts/(add|remove)$", match_body=True),
+    MatchRule(r".*"),
+]
+
+
+class Cassette:
+    """Хранилище записанных запросов/ответов
+
+    На диске - сжатый gzip файл JSON Lines, в памяти - индекс по ключу
+    запроса. Одинаковые запросы, записанные несколько раз (например,
+    корзина до и после добавления), воспроизводятся по порядку, а после
+    последней записи повторяется последняя.
+
+    Первая запись ключа в сессии заменяет его старые записи из файла, так
+    что перезапись обновляет устаревшие ответы. save() объединяет кассету
+    с файлом под блокировкой: ключи, записанные в этой сессии, заменяются,
+    записи других воркеров xdist сохраняются.
+    """
+
+    def __init__(self, path: str, rules: List[MatchRule] = None):
+        self.path = path
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self._index = defaultdict(list)
+        self._played = defaultdict(int)
+        # Ключи, записанные в этой сессии
+        self._recorded = set()
+        self._lock = threading.Lock()
+        self.dirty = False
+        if os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._index.values())
+
+    def __contains__(self, request: requests.PreparedRequest):
+        return self.match_key(request) in self._index
+
+    def match_key(self, request: requests.PreparedRequest) -> str:
+        """Ключ запроса по первому подходящему правилу"""
+        path = urlsplit(request.url).path
+        for rule in self.rules:
+            if rule.pattern.search(path):
+                return rule.key(request)
+        return DEFAULT_RULES[-1].key(request)
+
+    def play(self, request: requests.PreparedRequest) -> Optional[dict]:
+        """Следующая запись для запроса или None"""
+        key = self.match_key(request)
+        with self._lock:
+            entries = self._index.get(key)
+            if not entries:
+                return None
+            position = min(self._played[key], len(entries) - 1)
+            self._played[key] += 1
+            return entries[position]
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response):
+        """Добавить обмен запрос/ответ в кассету"""
+        entry = {
+            "key": self.match_key(request),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {name: value for name, value in response.headers.items()
+                        if name.lower() not in _SKIP_HEADERS},
+        }
+        try:
+            entry["body"] = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(response.content).decode("ascii")
+        with self._lock:
+            if entry["key"] not in self._recorded:
+                self._recorded.add(entry["key"])
+                self._index[entry["key"]] = []
+            self._index[entry["key"]].append(entry)
+            self.dirty = True
+
+    def save(self):
+        """Записать кассету на диск, объединив с записями других процессов"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            index = self._read(self.path) if os.path.exists(self.path) else defaultdict(list)
+            for key in self._recorded:
+                index[key] = self._index[key]
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as file:
+                file.write(json.dumps({"version": CASSETTE_VERSION}) + "\n")
+                for entries in index.values():
+                    for entry in entries:
+                        file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+    def _load(self):
+        self._index = self._read(self.path)
+
+    @staticmethod
+    def _read(path: str) -> defaultdict:
+        index = defaultdict(list)
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Неподдерживаемая версия кассеты {path}: {header}")
+            for line in file:
+                entry = json.loads(line)
+                index[entry["key"]].append(entry)
+        return index
+
+
+class CassetteAdapter(HTTPAdapter):
+    """HTTP адаптер requests, который записывает и воспроизводит обмены из кассеты"""
+
+    def __init__(self, cassette: Cassette, mode: str = RECORD_MODE, **kwargs):
+        if mode not in ("replay", "record", "once"):
+            raise ValueError(f"Неизвестный режим кассеты: {mode}")
+        self.cassette = cassette
+        self.mode = mode
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.mode != "record":
+            entry = self.cassette.play(request)
+            if entry is not None:
+                return self._build_response(request, entry)
+            if self.mode == "replay":
+                raise CassetteMiss(f"Нет записи в кассете {self.cassette.path}: "
+                                   f"{self.cassette.match_key(request)}", request=request)
+        response = super().send(request, **kwargs)
+        self.cassette.record(request, response)
+        return response
+
+    @staticmethod
+    def _build_response(request: requests.PreparedRequest, entry: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        if "body_b64" in entry:
+            response._content = base64.b64decode(entry["body_b64"])
+        else:
+            response._content = entry["body"].encode("utf-8")
+        response.url = request.url
+        response.request = request
+        return response
+
+
+def use_cassette(session: requests.Session, path: str = CASSETTE_PATH, mode: str = RECORD_MODE,
+                 rules: List[MatchRule] = None, cassette: Cassette = None) -> CassetteAdapter:
+    """Подключить кассету к сессии клиента (например, LitresAPIClient.session)
+
+    Настройки пула соединений и замер фаз соединения берутся из текущего
+    адаптера сессии.
+    cassette - уже открытая кассета, общая для нескольких клиентов.
+    После записи нужно вызвать adapter.cassette.save().
+    """
+    current = session.get_adapter("https://")
+    adapter = CassetteAdapter(
+        cassette if cassette is not None else Cassette(path, rules), mode,
+        pool_connections=getattr(current, "_pool_connections", 10),
+        pool_maxsize=getattr(current, "_pool_maxsize", 10),
+    )
+    current_pools = getattr(current, "poolmanager", None)
+    if current_pools is not None:
+        # Классы пулов с замером connect/TLS (api.clients.metrics.instrument_adapter)
+        adapter.poolmanager.pool_classes_by_scheme = current_pools.pool_classes_by_scheme
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    logger.info("Cassette %s mounted in %s mode (%d entries)", adapter.cassette.path, mode, len(adapter.cassette))
+    return adapter
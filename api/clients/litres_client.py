@@ -1,8 +1,21 @@
+import os
+import copy
+import time
 import requests
 import logging
 import allure
 import json
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+from requests.adapters import HTTPAdapter
+from api.clients.cache import ResponseCache, make_cache_key
+from api.clients.metrics import (LatencyRecorder, connection_timings, instrument_adapter, reset_connection_timings,
+                                 time_to_first_byte)
+from api.clients.rate_limit import RateLimiter
+from api.clients.resilience import Resilience, endpoint_key
+from api.clients.response import JSON_BACKEND, LitresResponse
+from api.models.cart_model import BulkCartResult
+from utils.allure_sink import AttachmentSink
 
 # Настройка логирования
 logging.basicConfig(
@@ -12,8 +25,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Тела запросов/ответов логируются на этом уровне и обрезаются до лимита символов
+BODY_LOG_LEVEL = logging.DEBUG
+BODY_LOG_LIMIT = 2000
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False)
+
+# Общий бюджет соединений к API на все воркеры xdist и число соединений,
+# которые открываются заранее при старте воркера
+POOL_MAXSIZE_TOTAL = int(os.getenv("LITRES_API_POOL_TOTAL", "64"))
+WARM_CONNECTIONS = int(os.getenv("LITRES_API_WARM_CONNECTIONS", "2"))
+
+# Массовые операции с корзиной: размер одной части и число параллельных запросов
+CART_CHUNK_SIZE = int(os.getenv("LITRES_CART_CHUNK_SIZE", "50"))
+CART_MAX_WORKERS = int(os.getenv("LITRES_CART_MAX_WORKERS", "4"))
+
 # ==================== API ENDPOINTS ====================
-BASE_URL = "https://api.litres.ru/foundation/api"
+# LITRES_API_BASE_URL переключает клиент, например, на локальную заглушку (api/stub)
+BASE_URL = os.getenv("LITRES_API_BASE_URL", "https://api.litres.ru/foundation/api")
 
 # Cart endpoints
 CART_ADD = "/cart/arts/add"
@@ -29,12 +58,72 @@ SEARCH = "/search"
 BOOK_DETAILS = "/arts/{art_id}"
 
 
+def pool_size_for_workers(total: int = POOL_MAXSIZE_TOTAL) -> int:
+    """Размер пула соединений одного воркера xdist (не меньше 4)"""
+    workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return max(4, total // max(workers, 1))
+
+
+class _LazyBody:
+    """Тело запроса/ответа, которое сериализуется только при выводе в лог"""
+
+    __slots__ = ('body', 'limit')
+
+    def __init__(self, body, limit: int):
+        self.body = body
+        self.limit = limit
+
+    def __str__(self):
+        if isinstance(self.body, str):
+            text = self.body
+        elif not self.limit:
+            return json.dumps(self.body, ensure_ascii=False)
+        else:
+            # Кодируем по частям и останавливаемся, как только набрали лимит
+            chunks, size = [], 0
+            for chunk in _json_encoder.iterencode(self.body):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > self.limit:
+                    break
+            text = ''.join(chunks)
+        if self.limit and len(text) > self.limit:
+            return f"{text[:self.limit]}... [обрезано]"
+        return text
+
+
 class LitresAPIClient:
     """API клиент для Litres с логированием и Allure attachments"""
 
-    def __init__(self, base_url: str = BASE_URL):
+    def __init__(self, base_url: str = BASE_URL, pool_connections: int = 1, pool_maxsize: int = 10,
+                 body_log_level: int = BODY_LOG_LEVEL, body_log_limit: int = BODY_LOG_LIMIT,
+                 json_backend: str = JSON_BACKEND, attachments: AttachmentSink = None,
+                 cache: ResponseCache = None, resilience: Resilience = None,
+                 rate_limiter: RateLimiter = None, priority: bool = False, metrics: LatencyRecorder = None):
         self.base_url = base_url
+        # Таймауты, повторы и circuit breaker (общие для копий клиента из fork)
+        self.resilience = resilience if resilience is not None else Resilience()
+        # Общий для воркеров лимит запросов; priority - запросы smoke тестов
+        self.rate_limiter = rate_limiter
+        self.priority = priority
+        # Гистограммы задержек по эндпоинтам (None - не собирать)
+        self.metrics = metrics
+        # Кэш ответов идемпотентных GET запросов (поиск, детали книги)
+        self.cache = cache
+        # По умолчанию attachments прикрепляются сразу; отложенный буфер
+        # передает фикстура и сбрасывает его по окончании теста
+        self.attachments = attachments if attachments is not None else AttachmentSink(deferred=False)
+        self.json_backend = json_backend
+        self.body_log_level = body_log_level
+        self.body_log_limit = body_log_limit
         self.session = requests.Session()
+        # Пул keep-alive соединений: pool_maxsize ограничивает число
+        # одновременных соединений к одному хосту
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        if metrics is not None:
+            instrument_adapter(adapter)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
             'Accept': 'application/json, text/plain, */*',
@@ -46,64 +135,129 @@ class LitresAPIClient:
             'ui-currency': 'RUB',
         })
 
+    def fork(self, attachments: AttachmentSink = None, priority: bool = None) -> "LitresAPIClient":
+        """Легкая копия клиента для одного теста
+
+        Пул соединений (HTTP адаптеры), кэш и настройки общие с исходным
+        клиентом, а заголовки и cookies у копии свои, поэтому тесты не
+        влияют друг на друга. Сессию копии не закрывают: это закрыло бы
+        общий пул.
+        """
+        client = copy.copy(self)
+        client.session = requests.Session()
+        client.session.headers = self.session.headers.copy()
+        for prefix, adapter in self.session.adapters.items():
+            client.session.mount(prefix, adapter)
+        client.attachments = attachments if attachments is not None else AttachmentSink(deferred=False)
+        if priority is not None:
+            client.priority = priority
+        return client
+
+    def warm_up(self, connections: int = WARM_CONNECTIONS):
+        """Заранее открыть keep-alive соединения (TCP + TLS) к API
+
+        Ошибки прогрева только логируются: тесты сами сообщат о
+        недоступности API.
+        """
+        def touch(_):
+            try:
+                self.session.head(self.base_url, timeout=5).close()
+            except requests.RequestException as e:
+                logger.warning("Warm-up %s failed: %s", self.base_url, e)
+
+        with ThreadPoolExecutor(max_workers=max(connections, 1)) as executor:
+            list(executor.map(touch, range(connections)))
+
     def _log_request(self, method: str, url: str, **kwargs):
         """Логирование запроса"""
-        logger.info(f"{method} {url}")
-        if 'json' in kwargs:
-            logger.info(f"Request body: {json.dumps(kwargs['json'], ensure_ascii=False)}")
+        logger.info("%s %s", method, url)
         if 'params' in kwargs:
-            logger.info(f"Request params: {kwargs['params']}")
+            logger.info("Request params: %s", kwargs['params'])
+        if 'json' in kwargs and logger.isEnabledFor(self.body_log_level):
+            logger.log(self.body_log_level, "Request body: %s", _LazyBody(kwargs['json'], self.body_log_limit))
 
-    def _log_response(self, response: requests.Response):
-        """Логирование ответа"""
-        logger.info(f"Status code: {response.status_code}")
-        logger.info(f"Response time: {response.elapsed.total_seconds()}s")
-        try:
-            logger.info(f"Response body: {json.dumps(response.json(), ensure_ascii=False)}")
-        except:
-            logger.info(f"Response body: {response.text}")
+    def _log_response(self, response: LitresResponse):
+        """Логирование ответа
 
-    def _attach_to_allure(self, response: requests.Response, request_data: dict = None):
+        Тело ответа форматируется только если уровень body_log_level включен.
+        """
+        logger.info("Status code: %s", response.status_code)
+        logger.info("Response time: %ss", response.elapsed.total_seconds())
+        if logger.isEnabledFor(self.body_log_level):
+            response_json = response.parsed
+            body = response_json if response_json is not None else response.text
+            logger.log(self.body_log_level, "Response body: %s", _LazyBody(body, self.body_log_limit))
+
+    def _attach_to_allure(self, response: LitresResponse, request_data: dict = None):
         """Добавление request/response в Allure отчет"""
         if request_data:
-            allure.attach(
-                json.dumps(request_data, indent=2, ensure_ascii=False),
-                name="Request",
-                attachment_type=allure.attachment_type.JSON
-            )
+            self.attachments.add("Request", request_data, allure.attachment_type.JSON)
 
-        try:
-            response_json = response.json()
-            allure.attach(
-                json.dumps(response_json, indent=2, ensure_ascii=False),
-                name="Response",
-                attachment_type=allure.attachment_type.JSON
-            )
-        except:
-            allure.attach(
-                response.text,
-                name="Response",
-                attachment_type=allure.attachment_type.TEXT
-            )
+        response_json = response.parsed
+        if response_json is not None:
+            self.attachments.add("Response", response_json, allure.attachment_type.JSON)
+        else:
+            self.attachments.add("Response", response.text, allure.attachment_type.TEXT)
 
     # ==================== HTTP METHODS ====================
 
+    def _send(self, method: str, endpoint: str, url: str, **kwargs) -> requests.Response:
+        """Отправить запрос с таймаутом эндпоинта, повторами и circuit breaker"""
+        kwargs.setdefault('timeout', self.resilience.timeout_for(endpoint))
+
+        def send() -> requests.Response:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(method, endpoint, self.priority)
+            if self.metrics is None:
+                response = self.session.request(method, url, **kwargs)
+            else:
+                response = self._timed_request(method, endpoint, url, **kwargs)
+            if self.rate_limiter is not None and response.status_code == 429:
+                # Сервер все равно ограничил: притормаживаем эндпоинт для всех воркеров
+                retry_after = response.headers.get('Retry-After', '')
+                self.rate_limiter.penalize(method, endpoint, float(retry_after) if retry_after.isdigit() else 1.0)
+            return response
+
+        return self.resilience.call(method, endpoint, send)
+
+    def _timed_request(self, method: str, endpoint: str, url: str, **kwargs) -> requests.Response:
+        """Запрос с записью фаз connect/TLS/TTFB/total в гистограммы"""
+        reset_connection_timings()
+        start = time.perf_counter()
+        response = self.session.request(method, url, **kwargs)
+        total = time.perf_counter() - start
+        connect, tls = connection_timings()
+        self.metrics.record(endpoint_key(method, endpoint), connect=connect, tls=tls,
+                            ttfb=time_to_first_byte(response.elapsed.total_seconds(), connect, tls), total=total)
+        return response
+
     @allure.step("GET {endpoint}")
-    def get(self, endpoint: str, **kwargs) -> requests.Response:
-        """Выполнить GET запрос"""
+    def get(self, endpoint: str, use_cache: bool = False, **kwargs) -> LitresResponse:
+        """Выполнить GET запрос
+
+        С use_cache=True ответ берется из кэша клиента, если он включен.
+        """
         url = f"{self.base_url}{endpoint}"
         self._log_request("GET", url, **kwargs)
-        response = self.session.get(url, **kwargs)
+        cache_key = make_cache_key("GET", url, kwargs.get('params')) if use_cache and self.cache else None
+        raw_response = self.cache.get(cache_key) if cache_key else None
+        if raw_response is not None:
+            logger.info("Cache hit: GET %s", url)
+        else:
+            raw_response = self._send("GET", endpoint, url, **kwargs)
+            if cache_key and raw_response.ok:
+                self.cache.set(cache_key, raw_response)
+        response = LitresResponse(raw_response, self.json_backend)
         self._log_response(response)
         self._attach_to_allure(response, kwargs.get('params'))
         return response
 
     @allure.step("PUT {endpoint}")
-    def put(self, endpoint: str, **kwargs) -> requests.Response:
+    def put(self, endpoint: str, **kwargs) -> LitresResponse:
         """Выполнить PUT запрос"""
         url = f"{self.base_url}{endpoint}"
         self._log_request("PUT", url, **kwargs)
-        response = self.session.put(url, **kwargs)
+        response = LitresResponse(self._send("PUT", endpoint, url, **kwargs), self.json_backend)
         self._log_response(response)
         self._attach_to_allure(response, kwargs.get('json'))
         return response
@@ -111,7 +265,7 @@ class LitresAPIClient:
     # ==================== CART METHODS ====================
 
     @allure.step("Получить корзину")
-    def get_cart(self, limit: int = 10) -> requests.Response:
+    def get_cart(self, limit: int = 10) -> LitresResponse:
         """Получить содержимое корзины"""
         params = {
             'art_groups': [1, 2, 8],
@@ -120,19 +274,62 @@ class LitresAPIClient:
         return self.get(WISHLIST_ARTS, params=params)
 
     @allure.step("Добавить книги в корзину: {art_ids}")
-    def add_to_cart(self, art_ids: List[int]) -> requests.Response:
+    def add_to_cart(self, art_ids: List[int]) -> LitresResponse:
         """Добавить книги в корзину"""
         return self.put(CART_ADD, json={"art_ids": art_ids})
 
     @allure.step("Удалить книги из корзины: {art_ids}")
-    def remove_from_cart(self, art_ids: List[int]) -> requests.Response:
+    def remove_from_cart(self, art_ids: List[int]) -> LitresResponse:
         """Удалить книги из корзины"""
         return self.put(CART_REMOVE, json={"art_ids": art_ids})
 
+    @allure.step("Добавить книги в корзину частями по {chunk_size}")
+    def add_to_cart_bulk(self, art_ids: List[int], chunk_size: int = CART_CHUNK_SIZE,
+                         max_workers: int = CART_MAX_WORKERS) -> BulkCartResult:
+        """Добавить много книг в корзину параллельными запросами по chunk_size ID"""
+        return self._cart_bulk(self.add_to_cart, art_ids, chunk_size, max_workers)
+
+    @allure.step("Удалить книги из корзины частями по {chunk_size}")
+    def remove_from_cart_bulk(self, art_ids: List[int], chunk_size: int = CART_CHUNK_SIZE,
+                              max_workers: int = CART_MAX_WORKERS) -> BulkCartResult:
+        """Удалить много книг из корзины параллельными запросами по chunk_size ID"""
+        return self._cart_bulk(self.remove_from_cart, art_ids, chunk_size, max_workers)
+
+    def _cart_bulk(self, operation, art_ids: List[int], chunk_size: int, max_workers: int) -> BulkCartResult:
+        """Разбить ID на части, отправить их параллельно и собрать общий итог"""
+        unique_ids = list(dict.fromkeys(art_ids))
+        chunks = [unique_ids[i:i + chunk_size] for i in range(0, len(unique_ids), chunk_size)]
+        result = BulkCartResult()
+
+        def send(chunk: List[int]):
+            try:
+                response = operation(chunk)
+            except requests.RequestException as e:
+                return chunk, None, f"{type(e).__name__}: {e}"
+            return chunk, response, None if response.ok else f"HTTP {response.status_code}"
+
+        outcomes = []
+        if chunks and not self.session.cookies:
+            # Первая часть отдельно: сервер заводит сессию (cookie) и
+            # остальные части попадут в ту же корзину
+            outcomes.append(send(chunks.pop(0)))
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+            outcomes.extend(executor.map(send, chunks))
+
+        for chunk, response, error in outcomes:
+            if response is not None:
+                result.responses.append(response)
+            if error is None:
+                result.succeeded.extend(chunk)
+            else:
+                logger.warning("Cart chunk of %d ids failed: %s", len(chunk), error)
+                result.failed.update((art_id, error) for art_id in chunk)
+        return result
+
     # ==================== SEARCH METHODS ====================
 
     @allure.step("Поиск книг по запросу '{query}'")
-    def search_books(self, query: str, limit: int = 24, offset: int = 0) -> requests.Response:
+    def search_books(self, query: str, limit: int = 24, offset: int = 0) -> LitresResponse:
         """Поиск книг"""
         params = {
             'q': query,
@@ -142,12 +339,44 @@ class LitresAPIClient:
             'show_unavailable': 'false',
             'types': ['text_book', 'audiobook', 'podcast']
         }
-        return self.get(SEARCH, params=params)
+        return self.get(SEARCH, use_cache=True, params=params)
+
+    def iter_search(self, query: str, page_size: int = 24, max_items: Optional[int] = None) -> Iterator[dict]:
+        """Ленивый обход результатов поиска по страницам
+
+        Возвращает элементы payload.data по одному. Следующая страница
+        запрашивается в фоне, пока обрабатывается текущая; в памяти
+        не больше двух страниц. Обход заканчивается на последней странице
+        или после max_items элементов.
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="litres-search")
+
+        def fetch(offset: int):
+            limit = page_size if max_items is None else min(page_size, max_items - offset)
+            return executor.submit(self.search_books, query, limit, offset)
+
+        try:
+            offset = 0
+            page = fetch(offset)
+            while page is not None:
+                response = page.result()
+                response.raise_for_status()
+                payload = response.json().get('payload') or {}
+                items = payload.get('data') or []
+                offset += len(items)
+
+                pagination = payload.get('pagination')
+                has_next = len(items) == page_size and (pagination is None or pagination.get('next_page'))
+                page = fetch(offset) if has_next and (max_items is None or offset < max_items) else None
+
+                yield from items
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     # ==================== BOOKS METHODS ====================
 
     @allure.step("Получить детали книги {art_id}")
-    def get_book_details(self, art_id: int) -> requests.Response:
+    def get_book_details(self, art_id: int) -> LitresResponse:
         """Получить детали книги"""
         endpoint = BOOK_DETAILS.format(art_id=art_id)
-        return self.get(endpoint)
\ No newline at end of file
+        return self.get(endpoint, use_cache=True)
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""Гистограммы задержек запросов API клиента
+
+Для каждого эндпоинта (GET /arts/{id}) копятся фазы запроса:
+    connect - DNS + TCP соединение (только для нового соединения)
+    tls     - TLS рукопожатие (только для нового HTTPS соединения)
+    ttfb    - от отправки запроса до заголовков ответа (response.elapsed
+              без connect и TLS нового соединения)
+    total   - весь запрос вместе с чтением тела
+
+Гистограммы лог-линейные, как в HdrHistogram: 128 корзин на каждую
+степень двойки (погрешность < 1%), поэтому их можно складывать между
+воркерами xdist без потери точности перцентилей.
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, Iterable, Optional
+
+import allure
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Куда записать сводку по окончании прогона ("" - не записывать)
+LATENCY_REPORT_PATH = os.getenv("LITRES_API_LATENCY_REPORT", "api-latency.json")
+
+PHASES = ("connect", "tls", "ttfb", "total")
+PERCENTILES = (50, 90, 95, 99)
+SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+class LatencyHistogram:
+    """Лог-линейная гистограмма задержек в микросекундах"""
+
+    __slots__ = ("counts", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    @staticmethod
+    def bucket_index(value: int) -> int:
+        shift = max(value.bit_length() - SUB_BUCKET_BITS - 1, 0)
+        return shift * _SUB_BUCKETS + (value >> shift)
+
+    @staticmethod
+    def bucket_bounds(index: int):
+        shift = max(index // _SUB_BUCKETS - 1, 0)
+        mantissa = index - shift * _SUB_BUCKETS
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        value = max(int(seconds * 1_000_000), 0)
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> int:
+        """Значение перцентиля (мкс) с точностью до корзины"""
+        if not self.count:
+            return 0
+        rank = max(percent / 100 * self.count, 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self.bucket_bounds(index)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """Сводка в миллисекундах"""
+        result = {"count": self.count, "mean_ms": round(self.sum / self.count / 1000, 3) if self.count else 0.0,
+                  "min_ms": (self.min or 0) / 1000}
+        for percent in PERCENTILES:
+            result[f"p{percent}_ms"] = self.percentile(percent) / 1000
+        result["max_ms"] = self.max / 1000
+        return result
+
+    def to_dict(self) -> dict:
+        return {"counts": {str(index): count for index, count in self.counts.items()},
+                "count": self.count, "sum": self.sum, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data["counts"].items()}
+        histogram.count, histogram.sum = data["count"], data["sum"]
+        histogram.min, histogram.max = data["min"], data["max"]
+        return histogram
+
+
+class LatencyRecorder:
+    """Гистограммы фаз запроса по эндпоинтам (потокобезопасно)"""
+
+    def __init__(self):
+        self.histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.histograms)
+
+    def record(self, key: str, **phases: Optional[float]):
+        """Записать фазы одного запроса; None - фазы не было"""
+        with self._lock:
+            endpoint = self.histograms.setdefault(key, {})
+            for phase, seconds in phases.items():
+                if seconds is not None:
+                    endpoint.setdefault(phase, LatencyHistogram()).record(seconds)
+
+    def merge(self, other: "LatencyRecorder"):
+        with self._lock:
+            for key, phases in other.histograms.items():
+                endpoint = self.histograms.setdefault(key, {})
+                for phase, histogram in phases.items():
+                    endpoint.setdefault(phase, LatencyHistogram()).merge(histogram)
+
+    def summary(self) -> dict:
+        """{эндпоинт: {фаза: {count, mean_ms, p50_ms, ...}}}"""
+        with self._lock:
+            return {
+                key: {phase: phases[phase].summary() for phase in PHASES if phase in phases}
+                for key, phases in sorted(self.histograms.items())
+            }
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {key: {phase: histogram.to_dict() for phase, histogram in phases.items()}
+                    for key, phases in self.histograms.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyRecorder":
+        recorder = cls()
+        recorder.histograms = {
+            key: {phase: LatencyHistogram.from_dict(histogram) for phase, histogram in phases.items()}
+            for key, phases in data.items()
+        }
+        return recorder
+
+    @classmethod
+    def merged(cls, recorders: Iterable["LatencyRecorder"]) -> "LatencyRecorder":
+        result = cls()
+        for recorder in recorders:
+            result.merge(recorder)
+        return result
+
+    def attach_to_allure(self, name: str = "API latency"):
+        """Прикрепить сводку к Allure отчету"""
+        allure.attach(json.dumps(self.summary(), ensure_ascii=False, indent=2), name=name,
+                      attachment_type=allure.attachment_type.JSON)
+
+    def write_report(self, path: str = LATENCY_REPORT_PATH):
+        """Записать сводку в JSON файл"""
+        if not path:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, ensure_ascii=False, indent=2)
+
+
+# ==================== ФАЗЫ СОЕДИНЕНИЯ ====================
+
+_timings = threading.local()
+
+
+class _TimedConnectionMixin:
+    """Засекает установку соединения; urllib3 соединяется в потоке запроса"""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _timings.connect = time.perf_counter() - start
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        if isinstance(self, HTTPSConnection):
+            _timings.tls = max(time.perf_counter() - start - (getattr(_timings, "connect", None) or 0.0), 0.0)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+def instrument_adapter(adapter: HTTPAdapter):
+    """Засекать connect/TLS в новых пулах адаптера"""
+    adapter.poolmanager.pool_classes_by_scheme = {
+        "http": _TimedHTTPConnectionPool,
+        "https": _TimedHTTPSConnectionPool,
+    }
+
+
+def reset_connection_timings():
+    _timings.connect = None
+    _timings.tls = None
+
+
+def time_to_first_byte(elapsed: float, connect: Optional[float], tls: Optional[float]) -> float:
+    """TTFB: response.elapsed включает установку нового соединения, она вычитается"""
+    return max(elapsed - (connect or 0.0) - (tls or 0.0), 0.0)
+
+
+def connection_timings():
+    """(connect, tls) последнего запроса текущего потока, None - соединение переиспользовано"""
+    return getattr(_timings, "connect", None), getattr(_timings, "tls", None)
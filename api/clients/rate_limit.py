@@ -0,0 +1,160 @@
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from api.clients.resilience import endpoint_key
+
+try:
+    import fcntl
+except ImportError:  # Windows: общий файл недоступен, бюджет делится между воркерами
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Ограничение частоты запросов (QPS) на эндпоинт для всего прогона, 0 - выключено
+RATE_LIMIT = float(os.getenv("LITRES_API_RATE_LIMIT", "0"))
+# Отдельные лимиты: "GET /search=5,PUT /cart/arts/add=2" (ID в пути - {id})
+RATE_LIMITS = os.getenv("LITRES_API_RATE_LIMITS", "")
+# Запас токенов (по умолчанию - секунда работы на полной скорости)
+RATE_BURST = float(os.getenv("LITRES_API_RATE_BURST", "0"))
+# Доля запаса, которую могут использовать только приоритетные (smoke) тесты
+RATE_PRIORITY_RESERVE = float(os.getenv("LITRES_API_RATE_RESERVE", "0.2"))
+RATE_STATE_PATH = os.getenv("LITRES_API_RATE_STATE", os.path.join(tempfile.gettempdir(), "litres_api_rate.json"))
+
+
+def parse_limits(spec: str) -> Dict[str, float]:
+    """Разобрать LITRES_API_RATE_LIMITS в {"GET /search": 5.0}"""
+    limits = {}
+    for item in spec.split(","):
+        if item.strip():
+            key, _, rate = item.rpartition("=")
+            limits[" ".join(key.split())] = float(rate)
+    return limits
+
+
+class RateLimiter:
+    """Token bucket на каждый эндпоинт, общий для воркеров xdist
+
+    Состояние корзин лежит в небольшом JSON файле и меняется под
+    блокировкой fcntl.flock, поэтому лимит действует на весь прогон, а не
+    на один процесс. Без fcntl состояние хранится в памяти, а лимит
+    делится на число воркеров.
+
+    Обычные запросы не опускают корзину ниже резерва (reserve * burst),
+    приоритетные могут забрать ее целиком: smoke тесты не ждут в очереди
+    за регрессионными.
+    """
+
+    def __init__(self, limits: Dict[str, float] = None, default_rate: float = RATE_LIMIT,
+                 burst: float = RATE_BURST, reserve: float = RATE_PRIORITY_RESERVE,
+                 path: str = RATE_STATE_PATH, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.limits = limits if limits is not None else parse_limits(RATE_LIMITS)
+        self.default_rate = default_rate
+        self.burst = burst
+        self.reserve = reserve
+        self.path = path
+        self.clock = clock
+        self.sleep = sleep
+        self.waited = 0.0
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._state: Dict[str, list] = {}
+        self._share = 1 if fcntl is not None else int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+
+    def rate_for(self, key: str) -> float:
+        """Лимит запросов в секунду для ключа эндпоинта (0 - без ограничения)"""
+        return self.limits.get(key, self.default_rate) / self._share
+
+    def burst_for(self, rate: float) -> float:
+        return max(self.burst / self._share if self.burst else rate, 1.0)
+
+    def acquire(self, method: str, endpoint: str, priority: bool = False) -> float:
+        """Дождаться токена для запроса, вернуть время ожидания (сек)"""
+        key = endpoint_key(method, endpoint)
+        rate = self.rate_for(key)
+        if rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            delay = self._take(key, rate, priority)
+            if delay <= 0:
+                break
+            self.sleep(delay)
+            waited += delay
+        if waited:
+            self.waited += waited
+            logger.debug("Rate limit %s: waited %.3fs", key, waited)
+        return waited
+
+    def penalize(self, method: str, endpoint: str, seconds: float):
+        """Приостановить эндпоинт для всех воркеров (например, после 429)"""
+        key = endpoint_key(method, endpoint)
+        rate = self.rate_for(key)
+        if rate <= 0:
+            return
+        with self._locked_state() as state:
+            tokens, _ = self._refill(state, key, rate)
+            state[key] = [min(tokens, 0.0) - seconds * rate, self.clock()]
+        logger.warning("Rate limit %s: paused for %.2fs", key, seconds)
+
+    def _refill(self, state: Dict[str, list], key: str, rate: float):
+        now = self.clock()
+        burst = self.burst_for(rate)
+        tokens, updated = state.get(key, (burst, now))
+        return min(burst, tokens + max(now - updated, 0.0) * rate), now
+
+    def _take(self, key: str, rate: float, priority: bool) -> float:
+        """Взять токен; 0 при успехе, иначе сколько ждать до следующей попытки"""
+        burst = self.burst_for(rate)
+        floor = 0.0 if priority else min(burst * self.reserve, burst - 1)
+        with self._locked_state() as state:
+            tokens, now = self._refill(state, key, rate)
+            if tokens - 1 >= floor:
+                state[key] = [tokens - 1, now]
+                return 0.0
+            state[key] = [tokens, now]
+        return (floor + 1 - tokens) / rate
+
+    @contextmanager
+    def _locked_state(self):
+        with self._lock:
+            if fcntl is None:
+                yield self._state
+                return
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                raw = os.read(self._fd, 1 << 20)
+                try:
+                    state = json.loads(raw) if raw else {}
+                except ValueError:
+                    state = {}
+                yield state
+                data = json.dumps(state).encode("utf-8")
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                os.ftruncate(self._fd, 0)
+                os.write(self._fd, data)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        """Закрыть файл состояния"""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def make_rate_limiter() -> Optional[RateLimiter]:
+    """Создать ограничитель по LITRES_API_RATE_LIMIT(S) (None если лимиты не заданы)"""
+    if RATE_LIMIT <= 0 and not parse_limits(RATE_LIMITS):
+        return None
+    return RateLimiter()
@@ -0,0 +1,188 @@
+import os
+import re
+import time
+import random
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from api.clients.cassette import CassetteMiss
+
+logger = logging.getLogger(__name__)
+
+# Таймауты (connect, read) в секундах: по умолчанию и для отдельных эндпоинтов
+CONNECT_TIMEOUT = float(os.getenv("LITRES_API_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("LITRES_API_TIMEOUT", "15"))
+ENDPOINT_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    "/search": (CONNECT_TIMEOUT, READ_TIMEOUT * 2),
+}
+
+# Повторы: число попыток, базовая и максимальная пауза (сек)
+RETRY_ATTEMPTS = int(os.getenv("LITRES_API_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("LITRES_API_BACKOFF", "0.5"))
+RETRY_MAX_BACKOFF = float(os.getenv("LITRES_API_MAX_BACKOFF", "8"))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Повторяются только безопасные методы: повтор PUT корзины после обрыва
+# соединения может применить изменение дважды
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Circuit breaker: сколько неудач подряд открывают цепь и через сколько секунд пробовать снова
+BREAKER_THRESHOLD = int(os.getenv("LITRES_API_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.getenv("LITRES_API_BREAKER_RESET", "30"))
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Эндпоинт недоступен: circuit breaker открыт, запрос не отправлялся"""
+
+
+def endpoint_key(method: str, endpoint: str) -> str:
+    """Ключ эндпоинта без конкретных ID: GET /arts/{id}"""
+    return f"{method} {_ID_SEGMENT.sub('/{id}', endpoint)}"
+
+
+class RetryPolicy:
+    """Повторы идемпотентных запросов с экспоненциальной паузой и jitter"""
+
+    def __init__(self, attempts: int = RETRY_ATTEMPTS, backoff: float = RETRY_BACKOFF,
+                 max_backoff: float = RETRY_MAX_BACKOFF, statuses=RETRY_STATUSES, methods=IDEMPOTENT_METHODS):
+        self.attempts = max(attempts, 1)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = set(statuses)
+        self.methods = set(methods)
+
+    def should_retry(self, method: str, response: Optional[requests.Response], error: Optional[Exception]) -> bool:
+        if method not in self.methods:
+            return False
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout)) \
+                and not isinstance(error, (CircuitOpenError, CassetteMiss))
+        return response.status_code in self.statuses
+
+    def delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Пауза перед повтором: Retry-After сервера или full jitter"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Circuit breaker одного эндпоинта
+
+    После threshold неудач подряд цепь открывается и запросы сразу
+    получают CircuitOpenError. Через reset_timeout секунд пропускается
+    один пробный запрос: успех закрывает цепь, неудача открывает снова.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_timeout: float = BREAKER_RESET,
+                 clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.clock() - self.opened_at >= self.reset_timeout else "open"
+
+    def before_call(self, key: str):
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half-open" and self._probe_in_flight):
+                raise CircuitOpenError(f"Circuit breaker open for {key} after {self.failures} failures")
+            if state == "half-open":
+                self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def end_probe(self):
+        """Снять отметку пробного запроса (в том числе если он завершился неожиданной ошибкой)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self, key: str):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    logger.error("Circuit breaker opened for %s after %d failures", key, self.failures)
+                self.opened_at = self.clock()
+
+
+class Resilience:
+    """Таймауты, повторы и circuit breaker для запросов API клиента"""
+
+    def __init__(self, retry: RetryPolicy = None, timeouts: Dict[str, Tuple[float, float]] = None,
+                 default_timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+                 breaker_threshold: int = BREAKER_THRESHOLD, breaker_reset: float = BREAKER_RESET,
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.monotonic):
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.timeouts = timeouts if timeouts is not None else ENDPOINT_TIMEOUTS
+        self.default_timeout = default_timeout
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.sleep = sleep
+        self.clock = clock
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def timeout_for(self, endpoint: str) -> Tuple[float, float]:
+        """Таймаут (connect, read) для эндпоинта"""
+        return self.timeouts.get(endpoint, self.default_timeout)
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        with self._lock:
+            if key not in self.breakers:
+                self.breakers[key] = CircuitBreaker(self.breaker_threshold, self.breaker_reset, self.clock)
+            return self.breakers[key]
+
+    def call(self, method: str, endpoint: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """Выполнить send() с повторами и учетом circuit breaker эндпоинта"""
+        key = endpoint_key(method, endpoint)
+        breaker = self.breaker(key)
+        attempt = 0
+        while True:
+            breaker.before_call(key)
+            response, error = None, None
+            try:
+                try:
+                    response = send()
+                except CassetteMiss:
+                    # Нет записи в кассете - не сбой эндпоинта: без повторов и без учета в breaker
+                    raise
+                except requests.RequestException as e:
+                    error = e
+
+                if error is not None or response.status_code >= 500:
+                    breaker.record_failure(key)
+                else:
+                    breaker.record_success()
+            finally:
+                breaker.end_probe()
+
+            attempt += 1
+            if attempt >= self.retry.attempts or not self.retry.should_retry(method, response, error):
+                if error is not None:
+                    raise error
+                return response
+
+            delay = self.retry.delay(attempt - 1, response)
+            logger.warning("%s failed (%s), retry %d/%d in %.2fs", key,
+                           error or f"HTTP {response.status_code}", attempt, self.retry.attempts - 1, delay)
+            self.sleep(delay)
@@ -0,0 +1,81 @@
+import os
+import logging
+from functools import lru_cache
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Бэкенд разбора JSON: "json" (стандартный) или "orjson" (если установлен)
+JSON_BACKEND = os.getenv("LITRES_JSON_BACKEND", "json")
+
+_NOT_PARSED = object()
+
+
+@lru_cache(maxsize=None)
+def _orjson_loads():
+    """Функция разбора orjson или None, если пакет не установлен"""
+    try:
+        import orjson
+    except ImportError:
+        logger.warning("orjson не установлен, используется стандартный json")
+        return None
+    return orjson.loads
+
+
+class LitresResponse:
+    """Ответ API с однократным разбором JSON
+
+    Оборачивает requests.Response: тело разбирается при первом обращении
+    к json()/parsed, дальше логирование, Allure и тест читают одно и то же
+    дерево. Остальные атрибуты (status_code, headers, text...) берутся из
+    исходного ответа.
+    """
+
+    def __init__(self, response: requests.Response, json_backend: str = JSON_BACKEND):
+        self.raw = response
+        self._loads = _orjson_loads() if json_backend == "orjson" else None
+        self._json = _NOT_PARSED
+        self._json_error = None
+
+    def __getattr__(self, name):
+        if name == "raw":
+            raise AttributeError(name)
+        return getattr(self.raw, name)
+
+    def __repr__(self):
+        return f"<LitresResponse [{self.raw.status_code}]>"
+
+    def __bool__(self):
+        return self.raw.ok
+
+    def json(self, **kwargs):
+        """Разобранное тело ответа (разбирается один раз)
+
+        Возвращается общий объект: не изменяйте его, если ответ еще
+        используется в других местах. Как и requests, бросает
+        requests.exceptions.JSONDecodeError, если тело не JSON.
+        """
+        if self._json is _NOT_PARSED and self._json_error is None:
+            try:
+                if self._loads is not None:
+                    self._json = self._loads(self.raw.content)
+                else:
+                    self._json = self.raw.json(**kwargs)
+            except ValueError as e:
+                self._json_error = e
+        if self._json_error is not None:
+            if isinstance(self._json_error, requests.exceptions.JSONDecodeError):
+                raise self._json_error
+            raise requests.exceptions.JSONDecodeError(
+                self._json_error.msg, self._json_error.doc, self._json_error.pos
+            )
+        return self._json
+
+    @property
+    def parsed(self):
+        """Разобранное тело ответа или None, если тело не JSON"""
+        try:
+            return self.json()
+        except ValueError:
+            return None
@@ -0,0 +1,203 @@
+"""Нагрузочный прогон Litres API на LitresAPIClient
+
+Открытая модель нагрузки: запросы поступают с заданной частотой
+независимо от того, успевает ли сервер отвечать. Частота линейно
+растет от 0 до --rate за --ramp-up секунд. Задержка считается от
+запланированного момента запроса, поэтому ожидание в очереди при
+перегрузке попадает в перцентили (без coordinated omission).
+
+Запуск из корня проекта:
+    python -m api.load.runner --scenario search --rate 50 --duration 30 --ramp-up 5
+    python -m api.load.runner --stub --stub-latency 0.02 --scenario cart --rate 200 --duration 10
+"""
+import sys
+import json
+import math
+import time
+import random
+import logging
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
+
+import requests
+
+from api.clients.litres_client import BASE_URL, LitresAPIClient
+from api.clients.metrics import LatencyHistogram, LatencyRecorder
+from api.clients.resilience import Resilience, RetryPolicy
+from api.load.scenarios import SCENARIOS, Operation, seed_art_ids
+from api.stub.server import LitresStubServer
+from utils.allure_sink import AttachmentSink
+
+logger = logging.getLogger(__name__)
+
+
+def arrival_times(rate: float, duration: float, ramp_up: float = 0.0, poisson: bool = True,
+                  rnd: random.Random = None) -> Iterator[float]:
+    """Моменты запросов (сек от начала) при частоте rate с линейным разгоном
+
+    Ожидаемое число запросов к моменту t - N(t); k-й запрос приходится на
+    N^-1(s_k), где s_k - целые числа (равномерно) или суммы
+    экспоненциальных интервалов (пуассоновский поток).
+    """
+    rnd = rnd or random.Random()
+    ramp_up = min(ramp_up, duration)
+    ramp_arrivals = rate * ramp_up / 2
+    arrivals = 0.0
+    while True:
+        arrivals += rnd.expovariate(1.0) if poisson else 1.0
+        if arrivals < ramp_arrivals:
+            moment = math.sqrt(2 * arrivals * ramp_up / rate)
+        else:
+            moment = ramp_up + (arrivals - ramp_arrivals) / rate
+        if moment >= duration:
+            return
+        yield moment
+
+
+class LoadResult:
+    """Задержки и ошибки операций прогона"""
+
+    def __init__(self):
+        self.latency = {}
+        self.errors = Counter()
+        self.error_kinds = Counter()
+        self.requests = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, seconds: float, error: str = None):
+        with self._lock:
+            self.requests += 1
+            self.latency.setdefault(operation, LatencyHistogram()).record(seconds)
+            if error is not None:
+                self.errors[operation] += 1
+                self.error_kinds[error] += 1
+
+    def report(self) -> dict:
+        total = LatencyHistogram()
+        operations = {}
+        for name, histogram in sorted(self.latency.items()):
+            total.merge(histogram)
+            operations[name] = dict(histogram.summary(), errors=self.errors[name])
+        return {
+            "requests": self.requests,
+            "errors": sum(self.errors.values()),
+            "error_kinds": dict(self.error_kinds),
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_rps": round(self.requests / self.elapsed, 1) if self.elapsed else 0.0,
+            "latency": total.summary(),
+            "operations": operations,
+        }
+
+
+def run_load(base_url: str, scenario: str = "search", rate: float = 10.0, duration: float = 10.0,
+             ramp_up: float = 0.0, concurrency: int = 32, poisson: bool = True, retries: int = 1,
+             seed: int = None) -> dict:
+    """Прогнать сценарий и вернуть отчет: пропускная способность и перцентили
+
+    Повторы по умолчанию выключены, а circuit breaker не срабатывает:
+    ошибки сервера под нагрузкой должны попасть в отчет как есть.
+    """
+    operations: List[Operation] = SCENARIOS[scenario]
+    weights = [operation.weight for operation in operations]
+    rnd = random.Random(seed)
+    metrics = LatencyRecorder()
+    base = LitresAPIClient(base_url, pool_maxsize=concurrency, attachments=AttachmentSink("never", deferred=False),
+                           resilience=Resilience(RetryPolicy(attempts=retries), breaker_threshold=sys.maxsize),
+                           metrics=metrics)
+    art_ids = seed_art_ids(base)
+    # Свой клиент (cookies и корзина) на каждый поток - как отдельный пользователь
+    local = threading.local()
+    result = LoadResult()
+
+    def execute(operation: Operation, scheduled: float, op_seed: int):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = base.fork(attachments=AttachmentSink("never", deferred=False))
+        error = None
+        try:
+            response = operation.call(client, random.Random(op_seed), art_ids)
+            if not response.ok:
+                error = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            error = type(e).__name__
+        result.record(operation.name, time.perf_counter() - scheduled, error)
+
+    logger.info("Load %s: %.1f rps for %.0fs (ramp-up %.0fs), concurrency %d",
+                scenario, rate, duration, ramp_up, concurrency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="litres-load") as executor:
+        for moment in arrival_times(rate, duration, ramp_up, poisson, rnd):
+            scheduled = start + moment
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            operation = rnd.choices(operations, weights)[0]
+            executor.submit(execute, operation, scheduled, rnd.getrandbits(32))
+    result.elapsed = time.perf_counter() - start
+    base.session.close()
+
+    report = {"scenario": scenario, "rate": rate, "duration": duration, "ramp_up": ramp_up,
+              "concurrency": concurrency}
+    report.update(result.report())
+    report["endpoints"] = metrics.summary()
+    return report
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"scenario={report['scenario']} rate={report['rate']} rps duration={report['duration']}s "
+        f"ramp-up={report['ramp_up']}s concurrency={report['concurrency']}",
+        f"requests={report['requests']} errors={report['errors']} "
+        f"throughput={report['throughput_rps']} rps elapsed={report['elapsed_s']}s",
+        f"{'operation':<14}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    rows = list(report["operations"].items()) + [("total", dict(report["latency"], errors=report["errors"]))]
+    for name, stats in rows:
+        lines.append(f"{name:<14}{stats['count']:>8}{stats['errors']:>8}{stats['p50_ms']:>10.1f}"
+                     f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}")
+    if report["error_kinds"]:
+        lines.append("errors: " + ", ".join(f"{kind}={count}" for kind, count in report["error_kinds"].items()))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="search")
+    parser.add_argument("--rate", type=float, default=10.0, help="запросов в секунду после разгона")
+    parser.add_argument("--duration", type=float, default=10.0, help="длительность прогона, сек")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="время разгона до --rate, сек")
+    parser.add_argument("--concurrency", type=int, default=32, help="максимум одновременных запросов")
+    parser.add_argument("--uniform", action="store_true", help="равномерные интервалы вместо пуассоновских")
+    parser.add_argument("--retries", type=int, default=1, help="попыток на запрос (1 - без повторов)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--stub", action="store_true", help="нагружать локальную заглушку API")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="задержка заглушки, сек")
+    parser.add_argument("--report", default="", help="записать отчет в JSON файл")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    logging.getLogger("api.clients.litres_client").setLevel(logging.WARNING)
+
+    def run(base_url: str) -> dict:
+        return run_load(base_url, args.scenario, args.rate, args.duration, args.ramp_up, args.concurrency,
+                        not args.uniform, args.retries, args.seed)
+
+    if args.stub:
+        with LitresStubServer(latency=args.stub_latency) as server:
+            report = run(server.base_url)
+    else:
+        report = run(args.base_url)
+
+    print(format_report(report))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Сценарии нагрузки: взвешенные наборы операций LitresAPIClient
+
+Каждая операция - один вызов метода клиента. Книги для деталей и
+корзины находятся одним поиском при подготовке сценария, поэтому
+сценарии работают и на живом API, и на заглушке.
+"""
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from api.clients.litres_client import LitresAPIClient
+from api.clients.response import LitresResponse
+from api.models.search_model import SearchHit
+
+QUERIES = ["Толстой", "Достоевский", "Булгаков", "Пелевин", "детектив", "фантастика", "python", "история"]
+SEED_QUERY = "Толстой"
+
+
+@dataclass(slots=True, frozen=True)
+class Operation:
+    """Операция сценария: имя в отчете, вес в смеси и вызов клиента"""
+
+    name: str
+    weight: float
+    call: Callable[[LitresAPIClient, random.Random, List[int]], LitresResponse]
+
+
+def _search(client: LitresAPIClient, rnd: random.Random, art_ids: List[int]) -> LitresResponse:
+    return client.search_books(rnd.choice(QUERIES), limit=24, offset=rnd.choice((0, 24, 48)))
+
+
+def _book_details(client: LitresAPIClient, rnd: random.Random, art_ids: List[int]) -> LitresResponse:
+    return client.get_book_details(rnd.choice(art_ids))
+
+
+def _cart(client: LitresAPIClient, rnd: random.Random, art_ids: List[int]) -> LitresResponse:
+    return client.get_cart()
+
+
+def _cart_add(client: LitresAPIClient, rnd: random.Random, art_ids: List[int]) -> LitresResponse:
+    return client.add_to_cart(rnd.sample(art_ids, min(3, len(art_ids))))
+
+
+def _cart_remove(client: LitresAPIClient, rnd: random.Random, art_ids: List[int]) -> LitresResponse:
+    return client.remove_from_cart(rnd.sample(art_ids, min(3, len(art_ids))))
+
+
+SCENARIOS: Dict[str, List[Operation]] = {
+    # Каталог: в основном поиск, иногда детали книги и корзина
+    "search": [
+        Operation("search", 70, _search),
+        Operation("book_details", 25, _book_details),
+        Operation("cart", 5, _cart),
+    ],
+    # Корзина: добавление, просмотр и удаление книг
+    "cart": [
+        Operation("cart_add", 40, _cart_add),
+        Operation("cart", 30, _cart),
+        Operation("cart_remove", 30, _cart_remove),
+    ],
+}
+
+
+def seed_art_ids(client: LitresAPIClient, query: str = SEED_QUERY, limit: int = 48) -> List[int]:
+    """ID книг для операций сценария"""
+    response = client.search_books(query, limit=limit)
+    response.raise_for_status()
+    art_ids = [hit.id for hit in SearchHit.from_search_payload(response.json())]
+    if not art_ids:
+        raise RuntimeError(f"Поиск '{query}' не нашел книг для сценария")
+    return art_ids
@@ -0,0 +1,44 @@
+"""Модели корзины"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass(slots=True, frozen=True)
+class CartEntry:
+    """Книга в корзине"""
+
+    id: int
+    title: str = ""
+    price: Optional[float] = None
+    quantity: int = 1
+
+    @classmethod
+    def from_cart_payload(cls, response_json: dict) -> List["CartEntry"]:
+        """Все позиции корзины (разобранный ответ /wishlist/arts)"""
+        return [
+            cls(item["id"], item.get("title", ""), item.get("price"), item.get("quantity", 1))
+            for item in (response_json.get("payload") or {}).get("data") or ()
+        ]
+
+
+@dataclass
+class BulkCartResult:
+    """Итог массовой операции с корзиной по частям (chunks)
+
+    succeeded - ID из успешно отправленных частей, failed - ID частей с
+    ошибкой и причина (статус или исключение).
+    """
+
+    succeeded: List[int] = field(default_factory=list)
+    failed: Dict[int, str] = field(default_factory=dict)
+    responses: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def raise_for_failures(self):
+        """Бросить AssertionError, если часть ID не обработана"""
+        if self.failed:
+            reasons = sorted(set(self.failed.values()))
+            raise AssertionError(f"Не обработаны {len(self.failed)} книг: {list(self.failed)}; причины: {reasons}")
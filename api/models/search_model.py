@@ -0,0 +1,83 @@
+"""Модели результатов поиска и деталей книги"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+def _instance(item: dict) -> dict:
+    # Элемент поиска приходит как {"type": ..., "instance": {...}}
+    return item.get("instance", item)
+
+
+def _authors(art: dict) -> Tuple[str, ...]:
+    return tuple(person.get("full_name", "") for person in art.get("persons") or ()
+                 if person.get("role", "author") == "author")
+
+
+@dataclass(slots=True, frozen=True)
+class SearchHit:
+    """Книга из результатов поиска"""
+
+    id: int
+    title: str
+    art_type: Optional[str] = None
+    author: str = ""
+    price: Optional[float] = None
+    currency: Optional[str] = None
+    rating: Optional[float] = None
+    url: Optional[str] = None
+
+    @classmethod
+    def from_item(cls, item: dict) -> "SearchHit":
+        """Модель из одного элемента payload.data"""
+        art = _instance(item)
+        authors = _authors(art)
+        prices = art.get("prices") or {}
+        rating = art.get("rating")
+        return cls(
+            art["id"],
+            art.get("title", ""),
+            art.get("art_type") or item.get("type"),
+            authors[0] if authors else "",
+            prices.get("final_price"),
+            prices.get("currency"),
+            rating.get("rated_avg") if isinstance(rating, dict) else rating,
+            art.get("url"),
+        )
+
+    @classmethod
+    def from_search_payload(cls, response_json: dict) -> List["SearchHit"]:
+        """Все книги страницы поиска (разобранный ответ /search)"""
+        from_item = cls.from_item
+        return [from_item(item) for item in (response_json.get("payload") or {}).get("data") or ()]
+
+
+@dataclass(slots=True, frozen=True)
+class BookDetails:
+    """Детальная информация о книге"""
+
+    id: int
+    title: str
+    authors: Tuple[str, ...] = ()
+    price: Optional[float] = None
+    currency: Optional[str] = None
+    annotation: str = ""
+    isbn: Optional[str] = None
+
+    @property
+    def author(self) -> str:
+        return self.authors[0] if self.authors else ""
+
+    @classmethod
+    def from_payload(cls, response_json: dict) -> "BookDetails":
+        """Модель из ответа /arts/{id}"""
+        art = (response_json.get("payload") or {}).get("data") or response_json
+        prices = art.get("prices") or {}
+        return cls(
+            art["id"],
+            art.get("title", ""),
+            _authors(art),
+            prices.get("final_price"),
+            prices.get("currency"),
+            art.get("annotation") or "",
+            art.get("isbn"),
+        )
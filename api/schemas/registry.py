@@ -0,0 +1,174 @@
+"""Реестр JSON схем с однократно скомпилированными валидаторами
+
+Каждая схема проверяется по мета-схеме и компилируется в валидатор один
+раз. Для схем из поддерживаемого подмножества ключевых слов дополнительно
+генерируется быстрая Python функция: она только отвечает "валидно или
+нет", а при ошибке полный список ошибок собирает jsonschema.
+
+    from api.schemas.registry import validate
+    validate("search_response", response.json())
+"""
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from jsonschema import ValidationError
+from jsonschema.validators import validator_for
+
+from api.schemas.cart_schema import CART_SCHEMA, EMPTY_CART_SCHEMA
+from api.schemas.search_schema import BOOK_DETAILS_SCHEMA, SEARCH_RESPONSE_SCHEMA
+
+SCHEMAS: Dict[str, dict] = {
+    "search_response": SEARCH_RESPONSE_SCHEMA,
+    "book_details": BOOK_DETAILS_SCHEMA,
+    "cart": CART_SCHEMA,
+    "empty_cart": EMPTY_CART_SCHEMA,
+}
+
+# Ключевые слова, для которых умеет генерировать код compile_schema
+SUPPORTED_KEYWORDS = {
+    "type", "properties", "required", "items", "minItems", "maxItems",
+    "minimum", "maximum", "$schema", "title", "description",
+}
+
+_TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": "((isinstance({v}, int) and not isinstance({v}, bool))"
+               " or (isinstance({v}, float) and {v}.is_integer()))",
+}
+_NUMBER = _TYPE_CHECKS["number"]
+
+
+class SchemaValidationError(ValidationError):
+    """Ответ не соответствует схеме; errors - все найденные ошибки"""
+
+    def __init__(self, name: str, errors: List[ValidationError]):
+        self.schema_name = name
+        self.errors = errors
+        lines = [f"{'/'.join(map(str, error.absolute_path)) or '<root>'}: {error.message}" for error in errors]
+        super().__init__(f"Ответ не соответствует схеме '{name}' ({len(errors)} ошибок):\n" + "\n".join(lines))
+
+
+def register(name: str, schema: dict):
+    """Добавить схему в реестр (или заменить существующую)"""
+    SCHEMAS[name] = schema
+    get_validator.cache_clear()
+    get_fast_validator.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def get_validator(name: str):
+    """Валидатор jsonschema для схемы (мета-схема проверяется один раз)"""
+    schema = SCHEMAS[name]
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+@lru_cache(maxsize=None)
+def get_fast_validator(name: str) -> Optional[Callable[[object], bool]]:
+    """Сгенерированная функция проверки или None, если схема не поддерживается"""
+    return compile_schema(SCHEMAS[name])
+
+
+def validate(name: str, payload, fast: bool = True):
+    """Проверить payload по схеме name
+
+    Бросает SchemaValidationError со всеми ошибками сразу.
+    """
+    if fast:
+        fast_validator = get_fast_validator(name)
+        if fast_validator is not None and fast_validator(payload):
+            return
+    errors = sorted(get_validator(name).iter_errors(payload), key=lambda error: list(error.absolute_path))
+    if errors:
+        raise SchemaValidationError(name, errors)
+
+
+def is_valid(name: str, payload) -> bool:
+    """Соответствует ли payload схеме name"""
+    fast_validator = get_fast_validator(name)
+    if fast_validator is not None:
+        return fast_validator(payload)
+    return get_validator(name).is_valid(payload)
+
+
+def compile_schema(schema: dict) -> Optional[Callable[[object], bool]]:
+    """Сгенерировать Python функцию, проверяющую схему
+
+    Поддерживается подмножество SUPPORTED_KEYWORDS; для остальных схем
+    (и если код не удалось сгенерировать) возвращается None, и проверку
+    выполняет jsonschema.
+    """
+    try:
+        if not _is_supported(schema):
+            return None
+        lines = ["def _validate(v0):"]
+        _generate(schema, "v0", lines, 1, [0])
+        lines.append("    return True")
+        namespace = {}
+        exec(compile("\n".join(lines), "<schema>", "exec"), namespace)
+    except (SyntaxError, TypeError, ValueError, AttributeError):
+        return None
+    return namespace["_validate"]
+
+
+def _is_supported(schema) -> bool:
+    if not isinstance(schema, dict) or not set(schema) <= SUPPORTED_KEYWORDS:
+        return False
+    # Список типов ("type": ["string", "null"]) проверяет jsonschema
+    if "type" in schema and (not isinstance(schema["type"], str) or schema["type"] not in _TYPE_CHECKS):
+        return False
+    if not all(_is_supported(sub) for sub in schema.get("properties", {}).values()):
+        return False
+    return "items" not in schema or _is_supported(schema["items"])
+
+
+def _generate(schema: dict, var: str, lines: List[str], depth: int, counter: List[int]):
+    pad = "    " * depth
+
+    def emit(line: str):
+        lines.append(pad + line)
+
+    if "type" in schema:
+        emit(f"if not {_TYPE_CHECKS[schema['type']].format(v=var)}: return False")
+
+    if schema.get("required"):
+        keys = ", ".join(repr(key) for key in schema["required"])
+        emit(f"if isinstance({var}, dict) and not all(k in {var} for k in ({keys},)): return False")
+
+    if "minimum" in schema:
+        emit(f"if {_NUMBER.format(v=var)} and {var} < {schema['minimum']!r}: return False")
+    if "maximum" in schema:
+        emit(f"if {_NUMBER.format(v=var)} and {var} > {schema['maximum']!r}: return False")
+
+    if "minItems" in schema:
+        emit(f"if isinstance({var}, list) and len({var}) < {schema['minItems']}: return False")
+    if "maxItems" in schema:
+        emit(f"if isinstance({var}, list) and len({var}) > {schema['maxItems']}: return False")
+
+    if schema.get("properties"):
+        emit(f"if isinstance({var}, dict):")
+        for key, subschema in schema["properties"].items():
+            counter[0] += 1
+            child = f"v{counter[0]}"
+            emit(f"    if {key!r} in {var}:")
+            emit(f"        {child} = {var}[{key!r}]")
+            before = len(lines)
+            _generate(subschema, child, lines, depth + 2, counter)
+            if len(lines) == before:
+                emit("        pass")
+
+    if schema.get("items"):
+        counter[0] += 1
+        child = f"v{counter[0]}"
+        emit(f"if isinstance({var}, list):")
+        emit(f"    for {child} in {var}:")
+        before = len(lines)
+        _generate(schema["items"], child, lines, depth + 2, counter)
+        if len(lines) == before:
+            emit("        pass")
@@ -0,0 +1,307 @@
+"""Локальная заглушка Litres API на asyncio
+
+Реализует эндпоинты, которые использует LitresAPIClient:
+    GET  /search, /arts/{id}, /wishlist/arts
+    PUT  /cart/arts/add, /cart/arts/remove
+Корзина хранится в памяти для каждой сессии (cookie SID).
+
+Запуск из корня проекта:
+    python -m api.stub.server --port 8080 --latency 0.01
+    LITRES_API_BASE_URL=http://127.0.0.1:8080/foundation/api pytest -m api
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import threading
+import uuid
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/foundation/api"
+SESSION_COOKIE = "SID"
+
+AUTHORS = ["Лев Толстой", "Федор Достоевский", "Михаил Булгаков", "Виктор Пелевин", "Агата Кристи"]
+ART_TYPES = ["text_book", "audiobook", "podcast"]
+
+
+def _art_id(query: str, position: int) -> int:
+    digest = hashlib.md5(f"{query}:{position}".encode("utf-8")).digest()
+    return 10_000_000 + int.from_bytes(digest[:4], "big") % 90_000_000
+
+
+@lru_cache(maxsize=65536)
+def make_art(art_id: int, query: str = "") -> dict:
+    """Книга каталога заглушки (детерминирована по art_id, не изменяйте результат)"""
+    rnd = random.Random(art_id)
+    title = f"{query.capitalize()} - книга {art_id}" if query else f"Книга {art_id}"
+    return {
+        "id": art_id,
+        "title": title,
+        "art_type": rnd.choice(ART_TYPES),
+        "url": f"/book/{art_id}/",
+        "cover_url": f"/pub/c/cover/{art_id}.jpg",
+        "persons": [{"id": art_id % 100_000, "full_name": rnd.choice(AUTHORS), "role": "author"}],
+        "prices": {"final_price": float(rnd.randint(99, 999)), "currency": "RUB"},
+        "rating": {"rated_avg": round(rnd.uniform(3, 5), 1), "rated_total_count": rnd.randint(0, 5000)},
+    }
+
+
+def make_art_details(art_id: int) -> dict:
+    """Детальная информация о книге"""
+    art = dict(make_art(art_id))
+    art.update({
+        "annotation": f"Аннотация к книге {art_id}. " * 5,
+        "isbn": f"978-5-{art_id % 100_000:05d}-{art_id % 1000:03d}-0",
+        "language_code": "ru",
+    })
+    return art
+
+
+class LitresStubServer:
+    """Заглушка Litres API
+
+    latency - задержка каждого ответа (сек), jitter - случайная добавка
+    к ней, catalogue_size - сколько книг находит любой поисковый запрос.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, catalogue_size: int = 240):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.catalogue_size = catalogue_size
+        self.carts: Dict[str, List[int]] = {}
+        self.requests_served = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connections = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}{API_PREFIX}"
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self):
+        """Запустить сервер в текущем event loop"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Litres stub server listening on %s", self.base_url)
+
+    async def stop(self):
+        """Остановить сервер"""
+        if self._server is not None:
+            self._server.close()
+            # keep-alive соединения клиентов ждут следующий запрос - прерываем их
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    def start_in_thread(self) -> str:
+        """Запустить сервер в фоновом потоке, вернуть base_url"""
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="litres-stub", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.base_url
+
+    def stop_thread(self):
+        """Остановить сервер, запущенный через start_in_thread"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def __enter__(self):
+        self.start_in_thread()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop_thread()
+
+    # ==================== HTTP ====================
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, version = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+                if delay:
+                    await asyncio.sleep(delay)
+
+                status, payload, cookies = self.dispatch(method, target, headers, body)
+                self.requests_served += 1
+                content = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                response_headers = [
+                    f"HTTP/1.1 {status.value} {status.phrase}",
+                    "Content-Type: application/json; charset=utf-8",
+                    f"Content-Length: {len(content)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                ]
+                response_headers += [f"Set-Cookie: {name}={value}; Path=/" for name, value in cookies.items()]
+                writer.write(("\r\n".join(response_headers) + "\r\n\r\n").encode("latin-1"))
+                if method != "HEAD":
+                    writer.write(content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    def dispatch(self, method: str, target: str, headers: dict, body: bytes) -> Tuple[HTTPStatus, Optional[dict], dict]:
+        """Обработать запрос: (статус, JSON ответа, новые cookies)"""
+        parts = urlsplit(target)
+        path = parts.path[len(API_PREFIX):] if parts.path.startswith(API_PREFIX) else parts.path
+        params = parse_qs(parts.query)
+        session_id, cookies = self._session(headers)
+
+        if method == "HEAD":
+            return HTTPStatus.OK, None, cookies
+        if method == "GET" and path == "/search":
+            return HTTPStatus.OK, self._search(params), cookies
+        if method == "GET" and path.startswith("/arts/"):
+            return self._art_details(path[len("/arts/"):]) + (cookies,)
+        if method == "GET" and path == "/wishlist/arts":
+            return HTTPStatus.OK, self._cart(session_id, params), cookies
+        if method == "PUT" and path in ("/cart/arts/add", "/cart/arts/remove"):
+            return self._update_cart(session_id, path.rsplit("/", 1)[1], body) + (cookies,)
+        return HTTPStatus.NOT_FOUND, self._error(HTTPStatus.NOT_FOUND, f"Unknown endpoint {method} {path}"), cookies
+
+    def _session(self, headers: dict) -> Tuple[str, dict]:
+        for item in headers.get("cookie", "").split(";"):
+            name, _, value = item.strip().partition("=")
+            if name == SESSION_COOKIE and value:
+                return value, {}
+        session_id = uuid.uuid4().hex
+        return session_id, {SESSION_COOKIE: session_id}
+
+    # ==================== ENDPOINTS ====================
+
+    @staticmethod
+    def _ok(payload: dict) -> dict:
+        return {"status": 200, "error": None, "payload": payload}
+
+    @staticmethod
+    def _error(status: HTTPStatus, message: str) -> dict:
+        return {"status": status.value, "error": {"title": status.phrase, "message": message}, "payload": None}
+
+    @staticmethod
+    def _int_param(params: dict, name: str, default: int) -> int:
+        try:
+            return int(params.get(name, [default])[0])
+        except ValueError:
+            return default
+
+    def _search(self, params: dict) -> dict:
+        query = params.get("q", [""])[0]
+        limit = max(self._int_param(params, "limit", 24), 0)
+        offset = max(self._int_param(params, "offset", 0), 0)
+        end = min(offset + limit, self.catalogue_size)
+        data = [
+            {"type": "art", "instance": make_art(_art_id(query, position), query)}
+            for position in range(offset, end)
+        ]
+        next_offset = end if end < self.catalogue_size else None
+        return self._ok({
+            "pagination": {
+                "next_page": f"/search?q={query}&limit={limit}&offset={next_offset}" if next_offset else None,
+                "previous_page": f"/search?q={query}&limit={limit}&offset={max(offset - limit, 0)}"
+                if offset else None,
+            },
+            "data": data,
+        })
+
+    def _art_details(self, raw_id: str) -> Tuple[HTTPStatus, dict]:
+        if not raw_id.isdigit() or int(raw_id) == 0:
+            return HTTPStatus.NOT_FOUND, self._error(HTTPStatus.NOT_FOUND, f"Art {raw_id} not found")
+        return HTTPStatus.OK, self._ok({"data": make_art_details(int(raw_id))})
+
+    def _cart(self, session_id: str, params: dict) -> dict:
+        limit = self._int_param(params, "limit", 10)
+        art_ids = self.carts.get(session_id, [])
+        items = []
+        for art_id in art_ids[:limit]:
+            art = make_art(art_id)
+            items.append({"id": art_id, "title": art["title"],
+                          "price": art["prices"]["final_price"], "quantity": 1})
+        total = sum(make_art(art_id)["prices"]["final_price"] for art_id in art_ids)
+        return self._ok({"data": items, "total": total})
+
+    def _update_cart(self, session_id: str, action: str, body: bytes) -> Tuple[HTTPStatus, dict]:
+        try:
+            art_ids = json.loads(body or b"{}")["art_ids"]
+            if not isinstance(art_ids, list) or not all(isinstance(art_id, int) for art_id in art_ids):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            return HTTPStatus.BAD_REQUEST, self._error(HTTPStatus.BAD_REQUEST, "Body must be {\"art_ids\": [int]}")
+        cart = self.carts.setdefault(session_id, [])
+        if action == "add":
+            cart.extend(art_id for art_id in art_ids if art_id not in cart)
+        else:
+            cart[:] = [art_id for art_id in cart if art_id not in art_ids]
+        return HTTPStatus.OK, self._ok({"data": {"art_ids": list(cart), "count": len(cart)}})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="задержка ответа, сек")
+    parser.add_argument("--jitter", type=float, default=0.0, help="случайная добавка к задержке, сек")
+    parser.add_argument("--catalogue-size", type=int, default=240)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = LitresStubServer(args.host, args.port, args.latency, args.jitter, args.catalogue_size)
+
+    async def serve():
+        await server.start()
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
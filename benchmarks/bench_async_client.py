@@ -0,0 +1,55 @@
+"""Бенчмарк: синхронный LitresAPIClient против AsyncLitresAPIClient на локальной заглушке
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_async_client --queries 1000 --latency 0.02 --concurrency 50
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from api.clients.async_litres_client import AsyncLitresAPIClient
+from api.clients.litres_client import LitresAPIClient
+from api.stub.server import LitresStubServer
+
+
+def bench_sync(base_url: str, queries: list) -> float:
+    client = LitresAPIClient(base_url)
+    start = time.perf_counter()
+    for query in queries:
+        client.search_books(query)
+    return time.perf_counter() - start
+
+
+def bench_async(base_url: str, queries: list, concurrency: int) -> float:
+    async def sweep():
+        async with AsyncLitresAPIClient(base_url, concurrency=concurrency) as client:
+            await client.search_many(queries)
+
+    start = time.perf_counter()
+    asyncio.run(sweep())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02, help="задержка заглушки, сек")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.getLogger("api.clients.litres_client").setLevel(logging.WARNING)
+    queries = [f"запрос {i}" for i in range(args.queries)]
+
+    with LitresStubServer(latency=args.latency) as server:
+        sync_time = bench_sync(server.base_url, queries)
+        async_time = bench_async(server.base_url, queries, args.concurrency)
+
+    print(f"queries={args.queries} latency={args.latency}s concurrency={args.concurrency}")
+    print(f"sync:  {sync_time:.2f}s ({args.queries / sync_time:.0f} req/s)")
+    print(f"async: {async_time:.2f}s ({args.queries / async_time:.0f} req/s)")
+    print(f"speedup: x{sync_time / async_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Микробенчмарк: накладные расходы логирования ответа на один запрос
+
+Сравнивает прежнее логирование (json() + json.dumps на уровне INFO) с
+ленивым логированием тела по уровню body_log_level. Оба варианта
+начинают с сырого response.content и включают разбор JSON, который
+нужен Allure attachment: прежний код разбирал тело для лога и еще раз
+для Allure, новый - один раз (LitresResponse создается на каждый запрос).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_logging --items 500 --repeat 200
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import timeit
+
+import requests
+
+from api.clients.litres_client import LitresAPIClient, logger
+from api.clients.response import LitresResponse
+
+
+def make_response(items: int) -> requests.Response:
+    """Собрать ответ поиска с заданным числом книг"""
+    payload = {
+        "payload": {
+            "data": [
+                {
+                    "type": "text_book",
+                    "instance": {
+                        "id": 70000000 + i,
+                        "title": f"Книга номер {i}",
+                        "persons": [{"full_name": "Лев Толстой", "role": "author"}],
+                        "prices": {"final_price": 299.0, "currency": "RUB"},
+                        "annotation": "Описание книги " * 20,
+                    },
+                }
+                for i in range(items)
+            ]
+        }
+    }
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    response.encoding = "utf-8"
+    response.elapsed = datetime.timedelta(milliseconds=120)
+    return response
+
+
+def log_response_before(response: requests.Response):
+    """Прежняя реализация _log_response и разбор тела в _attach_to_allure"""
+    logger.info(f"Status code: {response.status_code}")
+    logger.info(f"Response time: {response.elapsed.total_seconds()}s")
+    try:
+        logger.info(f"Response body: {json.dumps(response.json(), ensure_ascii=False)}")
+    except:
+        logger.info(f"Response body: {response.text}")
+    try:
+        response.json()
+    except ValueError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    # Вывод в /dev/null: измеряем форматирование, а не скорость терминала
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    response = make_response(args.items)
+    client = LitresAPIClient()
+
+    def after():
+        # Как в get(): новый ответ, лог, затем дерево для Allure
+        wrapped = LitresResponse(response, client.json_backend)
+        client._log_response(wrapped)
+        wrapped.parsed
+
+    def after_body_enabled():
+        client.body_log_level = logging.INFO
+        after()
+        client.body_log_level = logging.DEBUG
+
+    print(f"body size: {len(response.content)} bytes, json backend: {client.json_backend}, repeat={args.repeat}")
+    for name, func in (
+        ("before (INFO, json x2+dumps)", lambda: log_response_before(response)),
+        ("after (body gated off)", after),
+        ("after (body on, truncated)", after_body_enabled),
+    ):
+        per_call = timeit.timeit(func, number=args.repeat) / args.repeat
+        print(f"{name:30s} {per_call * 1e6:10.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Бенчмарк памяти: модели SearchHit против словарей на большом обходе поиска
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_models --items 100000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from api.models.search_model import SearchHit
+from api.stub.server import make_art
+
+
+def make_search_json(items: int) -> str:
+    data = [{"type": "art", "instance": make_art(10_000_000 + i, "роман")} for i in range(items)]
+    return json.dumps({"payload": {"data": data}}, ensure_ascii=False)
+
+
+def measure(build):
+    """Время построения и память, которую удерживает результат"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100_000)
+    args = parser.parse_args()
+
+    raw = make_search_json(args.items)
+    make_art.cache_clear()
+
+    dicts, dict_time, dict_size = measure(lambda: json.loads(raw)["payload"]["data"])
+    hits, model_time, model_size = measure(lambda: SearchHit.from_search_payload(json.loads(raw)))
+
+    start = time.perf_counter()
+    for item in dicts:
+        item["instance"]["persons"][0]["full_name"]
+    dict_access = time.perf_counter() - start
+    start = time.perf_counter()
+    for hit in hits:
+        hit.author
+    model_access = time.perf_counter() - start
+
+    print(f"items={args.items}")
+    print(f"dicts:  {dict_size / 2**20:8.1f} MiB  {dict_size / args.items:6.0f} B/item  "
+          f"build {dict_time:.2f}s  access {dict_access * 1e3:.1f}ms")
+    print(f"models: {model_size / 2**20:8.1f} MiB  {model_size / args.items:6.0f} B/item  "
+          f"build {model_time:.2f}s  access {model_access * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
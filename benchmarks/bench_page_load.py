@@ -0,0 +1,64 @@
+"""Бенчмарк: загрузка страниц Литрес с профилями блокировки запросов
+
+Каждая страница открывается по --rounds раз с каждым профилем
+(utils.request_blocking.PROFILES); время до document.readyState == complete
+и объем переданных данных берутся из Performance API. Нужен Chrome:
+локальный (по умолчанию) или Selenoid/Grid через --remote, и доступ к сети.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_page_load --rounds 5
+    python -m benchmarks.bench_page_load --remote http://localhost:4444/wd/hub
+"""
+import argparse
+import time
+
+from selenium import webdriver
+
+from utils.request_blocking import PROFILES, PageLoadStats, apply_profile, measure_page_load
+
+PAGES = {
+    "MainPage": "https://www.litres.ru/",
+    "SearchPage": "https://www.litres.ru/search/?q=%D1%82%D0%BE%D0%BB%D1%81%D1%82%D0%BE%D0%B9",
+    "CartPage": "https://www.litres.ru/my-books/cart/",
+}
+
+
+def make_driver(remote: str):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    if remote:
+        return webdriver.Remote(command_executor=remote, options=options)
+    return webdriver.Chrome(options=options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--remote", default="", help="адрес WebDriver (Selenoid/Grid)")
+    args = parser.parse_args()
+
+    stats = PageLoadStats()
+    driver = make_driver(args.remote)
+    try:
+        for profile in PROFILES:
+            if not apply_profile(driver, profile):
+                raise SystemExit("CDP недоступен: блокировка запросов работает только в Chrome")
+            for _ in range(args.rounds):
+                for page, url in PAGES.items():
+                    # Без кэша браузера: иначе повторные загрузки почти ничего не передают
+                    driver.execute("executeCdpCommand", {"cmd": "Network.clearBrowserCache", "params": {}})
+                    driver.get(url)
+                    while driver.execute_script("return document.readyState") != "complete":
+                        time.sleep(0.05)
+                    stats.record(page, profile, measure_page_load(driver))
+    finally:
+        driver.quit()
+
+    for row in stats.report():
+        saved = f" saved={row['saved_ms']:.0f}ms {row['saved_kb']:.0f}KB" if "saved_ms" in row else ""
+        print(f"{row['page']:<11} {row['profile']:<9} load={row['mean_load_ms']:.0f}ms "
+              f"size={row['mean_kb']:.0f}KB requests={row['mean_requests']:.0f}{saved}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Бенчмарк: валидация пачки ответов поиска по SEARCH_RESPONSE_SCHEMA
+
+Сравнивает jsonschema.validate (пересоздает валидатор и проверяет
+мета-схему на каждый вызов), валидатор из реестра и сгенерированную
+функцию.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_schemas --payloads 2000 --books 24
+"""
+import argparse
+import time
+
+import jsonschema
+
+from api.schemas import registry
+from api.schemas.search_schema import SEARCH_RESPONSE_SCHEMA
+
+
+def make_payloads(count: int, books: int) -> list:
+    return [
+        {
+            "books": [
+                {"id": n * books + i, "title": f"Книга {i}", "author": "Лев Толстой",
+                 "price": 299.0, "rating": 4.5}
+                for i in range(books)
+            ],
+            "total": books,
+        }
+        for n in range(count)
+    ]
+
+
+def measure(func, payloads: list) -> float:
+    start = time.perf_counter()
+    for payload in payloads:
+        func(payload)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payloads", type=int, default=2000)
+    parser.add_argument("--books", type=int, default=24)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.payloads, args.books)
+    cases = (
+        ("jsonschema.validate", lambda p: jsonschema.validate(instance=p, schema=SEARCH_RESPONSE_SCHEMA)),
+        ("registry (jsonschema)", lambda p: registry.validate("search_response", p, fast=False)),
+        ("registry (generated)", lambda p: registry.validate("search_response", p)),
+    )
+
+    print(f"payloads={args.payloads} books/payload={args.books}")
+    baseline = None
+    for name, func in cases:
+        elapsed = measure(func, payloads)
+        baseline = baseline or elapsed
+        print(f"{name:24s} {elapsed:8.3f}s {elapsed / args.payloads * 1e6:10.1f} us/payload  x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Бенчмарк: ожидания опросом WebDriverWait против ожиданий в странице (utils.dom_wait)
+
+Страница-заглушка показывает элемент через случайную задержку (как
+ответ API на странице поиска); измеряется суммарное время ожиданий.
+Нужен браузер: локальный Chrome (по умолчанию) или Selenoid/Grid через --remote.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_waits --rounds 50
+    python -m benchmarks.bench_waits --remote http://localhost:4444/wd/hub
+"""
+import argparse
+import random
+import time
+from urllib.parse import quote
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.dom_wait import wait_in_page
+
+LOCATOR = (By.CSS_SELECTOR, "[data-testid='art__wrapper']")
+
+PAGE = """<html><body><div id="root"></div><script>
+setTimeout(function () {
+    var card = document.createElement('div');
+    card.setAttribute('data-testid', 'art__wrapper');
+    card.textContent = 'Книга';
+    document.getElementById('root').appendChild(card);
+}, %d);
+</script></body></html>"""
+
+
+def make_driver(remote: str):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    if remote:
+        return webdriver.Remote(command_executor=remote, options=options)
+    return webdriver.Chrome(options=options)
+
+
+def bench(driver, delays, wait) -> float:
+    total = 0.0
+    for delay in delays:
+        driver.get("data:text/html;charset=utf-8," + quote(PAGE % delay))
+        start = time.perf_counter()
+        wait(driver)
+        total += time.perf_counter() - start
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--max-delay", type=int, default=400, help="максимальная задержка появления элемента, мс")
+    parser.add_argument("--remote", default="", help="адрес WebDriver (Selenoid/Grid)")
+    args = parser.parse_args()
+
+    rnd = random.Random(21)
+    delays = [rnd.randint(0, args.max_delay) for _ in range(args.rounds)]
+    driver = make_driver(args.remote)
+    driver.implicitly_wait(0)
+    try:
+        polling = bench(driver, delays, lambda d: WebDriverWait(d, 10).until(EC.visibility_of_element_located(LOCATOR)))
+        event = bench(driver, delays, lambda d: wait_in_page(d, "visible", LOCATOR, 10,
+                                                             EC.visibility_of_element_located(LOCATOR)))
+    finally:
+        driver.quit()
+
+    ideal = sum(delays) / 1000
+    print(f"rounds={args.rounds} mean element delay={ideal / args.rounds * 1000:.0f}ms")
+    print(f"polling (WebDriverWait 0.5s): {polling:.2f}s ({polling / args.rounds * 1000:.0f}ms per wait)")
+    print(f"in-page (MutationObserver):   {event:.2f}s ({event / args.rounds * 1000:.0f}ms per wait)")
+    print(f"saved: {polling - event:.2f}s (x{polling / event:.1f})")
+
+
+if __name__ == "__main__":
+    main()
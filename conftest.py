@@ -2,21 +2,35 @@ import os
 import pytest
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.events import EventFiringWebDriver
 from dotenv import load_dotenv
-from api.clients.litres_client import LitresAPIClient
+from api.clients.litres_client import BASE_URL, LitresAPIClient, pool_size_for_workers
+from api.stub.server import LitresStubServer
+from api.clients.async_litres_client import AsyncLitresAPIClient
+from api.clients.cache import make_cache
+from api.clients.cassette import CASSETTE_PATH, Cassette, use_cassette
+from api.clients.metrics import LatencyRecorder
+from api.clients.rate_limit import make_rate_limiter
 from pages.main_page import MainPage
 from pages.search_page import SearchPage
 from pages.cart_page import CartPage
 from pages.book_page import BookPage
 from utils import attach
+from utils.allure_sink import AttachmentSink, flush_sinks, install_background_writer
+from utils.browser_pool import BrowserPool
+from utils.locator_cache import LocatorCache, locator_cache
+from utils.page_history import PageHistory
+from utils.request_blocking import BLOCK_PROFILE, PageLoadStats, apply_profile, page_loads
+
+# Гистограммы задержек API: у воркера - свои, у контроллера xdist - собранные с воркеров
+LATENCY_KEY = pytest.StashKey[LatencyRecorder]()
 
 # Загружаем переменные окружения из .env файла
 load_dotenv()
 
 
-@pytest.fixture(scope='function')
-def browser():
-    """Фикстура для настройки браузера через Selenoid"""
+def create_driver():
+    """Новая сессия браузера в Selenoid"""
     options = Options()
     selenoid_capabilities = {
         "browserName": "chrome",
@@ -34,27 +48,135 @@ def browser():
     selenoid_pass = os.getenv("SELENOID_PASS")
     selenoid_url = os.getenv("SELENOID_URL")
 
-    driver = webdriver.Remote(
+    return webdriver.Remote(
         command_executor=f"https://{selenoid_login}:{selenoid_pass}@{selenoid_url}/wd/hub",
         options=options
     )
-    driver.implicitly_wait(10)
 
-    yield driver
 
-    # Добавляем attachments в Allure
-    attach.add_screenshot(driver)
-    attach.add_logs(driver)
-    attach.add_html(driver)
-    attach.add_video(driver)
+@pytest.fixture(scope='session')
+def browser_pool():
+    """Пул прогретых сессий браузера на воркер"""
+    pool = BrowserPool(create_driver)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope='function')
+def browser(request, browser_pool):
+    """Фикстура браузера: сессия из пула, очищается после теста
+
+    Профиль блокировки запросов - из маркера block_requests или
+    UI_BLOCK_PROFILE. Последние состояния страницы копятся в
+    request.node.page_history; артефакты упавшего теста собирает
+    pytest_runtest_makereport в момент падения, а здесь - только
+    артефакты успешного теста. Видео Selenoid пишется на всю сессию,
+    поэтому ссылка на него прикрепляется, только если сессия
+    обслуживает один тест (BROWSER_MAX_USES=1).
+    """
+    driver = browser_pool.acquire()
+    marker = request.node.get_closest_marker("block_requests")
+    apply_profile(driver, marker.args[0] if marker else BLOCK_PROFILE)
+    history = PageHistory()
+    request.node.page_history = history
+
+    yield EventFiringWebDriver(driver, history)
+
+    if not getattr(request.node, "artifacts_captured", False):
+        # Добавляем attachments в Allure (ALLURE_UI_ARTIFACTS)
+        attach.add_artifacts(driver, failed=False, video=browser_pool.max_uses == 1)
+    browser_pool.release(driver, failed=getattr(request.node, "artifacts_captured", False))
+
+
+@pytest.fixture(scope="session")
+def api_response_cache():
+    """Кэш ответов поиска и деталей книги на весь прогон (LITRES_API_CACHE)"""
+    return make_cache()
+
+
+def _is_smoke(request) -> bool:
+    """Smoke тесты получают приоритет в общем лимите запросов"""
+    return request.node.get_closest_marker("smoke") is not None
+
+
+@pytest.fixture(scope="session")
+def api_rate_limiter():
+    """Общий для воркеров xdist лимит запросов к API (LITRES_API_RATE_LIMIT)"""
+    limiter = make_rate_limiter()
+    yield limiter
+    if limiter is not None:
+        limiter.close()
+
+
+@pytest.fixture(scope="session")
+def api_latency(request):
+    """Гистограммы задержек запросов к API на весь прогон воркера
+
+    К Allure прикрепляется сводка воркера с его id в имени; общая сводка
+    всех воркеров - в отчете LITRES_API_LATENCY_REPORT.
+    """
+    recorder = request.config.stash.setdefault(LATENCY_KEY, LatencyRecorder())
+    yield recorder
+    if recorder:
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        recorder.attach_to_allure(f"API latency ({worker})" if worker else "API latency")
 
-    driver.quit()
+
+@pytest.fixture(scope="session")
+def litres_api_base_url():
+    """Адрес API: локальная заглушка при LITRES_API_STUB=1, иначе BASE_URL"""
+    if os.getenv("LITRES_API_STUB") != "1":
+        yield BASE_URL
+        return
+    with LitresStubServer(latency=float(os.getenv("LITRES_API_STUB_LATENCY", "0"))) as server:
+        yield server.base_url
+
+
+@pytest.fixture(scope="session")
+def api_cassette():
+    """Кассета обменов с API (LITRES_API_CASSETTE), общая для клиентов воркера
+
+    Воркеры xdist сохраняют ее в один файл: save() объединяет записи под блокировкой.
+    """
+    if not CASSETTE_PATH:
+        yield None
+        return
+    cassette = Cassette(CASSETTE_PATH)
+    yield cassette
+    if cassette.dirty:
+        cassette.save()
+
+
+@pytest.fixture(scope="session")
+def litres_base_client(litres_api_base_url, api_response_cache, api_rate_limiter, api_latency, api_cassette):
+    """Общий API клиент воркера с прогретым пулом соединений"""
+    client = LitresAPIClient(litres_api_base_url, pool_maxsize=pool_size_for_workers(), cache=api_response_cache,
+                             rate_limiter=api_rate_limiter, metrics=api_latency)
+    if api_cassette is not None:
+        # Запись/воспроизведение из кассеты, прогрев не нужен
+        use_cassette(client.session, cassette=api_cassette)
+    else:
+        client.warm_up()
+    yield client
+    client.session.close()
+
+
+@pytest.fixture(scope="function")
+def litres_client(request, litres_base_client):
+    """Фикстура для API клиента (свои заголовки и cookies, общий пул соединений)"""
+    return litres_base_client.fork(attachments=AttachmentSink(), priority=_is_smoke(request))
 
 
 @pytest.fixture(scope="function")
-def litres_client():
-    """Фикстура для API клиента"""
-    return LitresAPIClient()
+def async_litres_client(request, litres_api_base_url, api_response_cache, api_rate_limiter, api_latency,
+                        api_cassette):
+    """Фикстура для асинхронного API клиента"""
+    client = AsyncLitresAPIClient(litres_api_base_url, attachments=AttachmentSink(), cache=api_response_cache,
+                                  rate_limiter=api_rate_limiter, priority=_is_smoke(request), metrics=api_latency)
+    if api_cassette is not None:
+        use_cassette(client.client.session, cassette=api_cassette)
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="function")
@@ -81,9 +203,67 @@ def book_page(browser):
     return BookPage(browser)
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Сохранение результата фазы теста и сброс отложенных attachments"""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+    # Артефакты UI теста - только для упавшей фазы, пока страница в состоянии на момент падения
+    driver = getattr(item, "funcargs", {}).get("browser")
+    if report.failed and report.when in ("setup", "call") and driver is not None \
+            and not getattr(item, "artifacts_captured", False):
+        item.artifacts_captured = True
+        pool = item.funcargs.get("browser_pool")
+        attach.add_artifacts(driver.wrapped_driver, failed=True, history=item.page_history.to_list(),
+                             video=pool is not None and pool.max_uses == 1)
+
+    if report.when in ("call", "teardown"):
+        failed = any(
+            getattr(item, f"rep_{when}", None) is not None and getattr(item, f"rep_{when}").failed
+            for when in ("setup", "call", "teardown")
+        )
+        flush_sinks(getattr(item, "funcargs", {}).values(), failed=failed)
+
+
+@pytest.hookimpl(trylast=True)
 def pytest_configure(config):
-    """Конфигурация pytest markers"""
+    """Конфигурация pytest markers и фоновой записи Allure attachments"""
     config.addinivalue_line("markers", "smoke: smoke tests")
     config.addinivalue_line("markers", "regression: regression tests")
     config.addinivalue_line("markers", "ui: UI tests")
-    config.addinivalue_line("markers", "api: API tests")
\ No newline at end of file
+    config.addinivalue_line("markers", "api: API tests")
+    config.addinivalue_line("markers", "block_requests(profile): request blocking profile for UI tests")
+    install_background_writer(config)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Контроллер xdist: забрать гистограммы задержек и статистику локаторов и загрузок воркера"""
+    workeroutput = getattr(node, "workeroutput", {})
+    data = workeroutput.get("litres_latency")
+    if data:
+        node.config.stash.setdefault(LATENCY_KEY, LatencyRecorder()).merge(LatencyRecorder.from_dict(data))
+    locators = workeroutput.get("litres_locators")
+    if locators:
+        locator_cache.merge(LocatorCache.from_dict(locators))
+    loads = workeroutput.get("litres_page_loads")
+    if loads:
+        page_loads.merge(PageLoadStats.from_dict(loads))
+
+
+def pytest_sessionfinish(session):
+    """Сводки задержек API, локаторов и загрузок страниц: воркер передает данные контроллеру, тот пишет отчеты"""
+    recorder = session.config.stash.get(LATENCY_KEY, None)
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        if recorder:
+            workeroutput["litres_latency"] = recorder.to_dict()
+        workeroutput["litres_locators"] = locator_cache.to_dict()
+        workeroutput["litres_page_loads"] = page_loads.to_dict()
+        return
+    if recorder:
+        recorder.write_report()
+    locator_cache.write_report()
+    page_loads.write_report()
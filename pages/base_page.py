@@ -1,12 +1,26 @@
 import allure
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException
+from utils.dom_extract import extract_all
+from utils.dom_wait import NEGATIVE_TIMEOUT, implicit_wait_disabled, wait_for_any, wait_in_page
+from utils.locator_cache import LOCATOR_LEARNING, locator_cache
+from utils.page_history import remember_locator
+from utils.request_blocking import active_profile, apply_profile, measure_page_load, page_loads
 
 
 class BasePage:
     """Базовый класс для всех страниц"""
 
+    # Поля карточки книги (главная, поиск) для extract
+    book_card_fields = {
+        "title": ("[data-testid='art__title']", "text"),
+        "href": ("[data-testid='art__title']", "href"),
+        "author": ("[data-testid*='authorName']", "text"),
+        "price": ("[data-testid*='finalPrice']", "text"),
+    }
+
     def __init__(self, browser, timeout=10):
         self.browser = browser
         self.timeout = timeout
@@ -17,39 +31,72 @@ class BasePage:
         """Открыть страницу"""
         self.browser.get(url)
         self.wait_for_page_load()
+        page_loads.record(type(self).__name__, active_profile(self.browser), measure_page_load(self.browser))
+
+    def block_requests(self, profile: str) -> bool:
+        """Включить профиль блокировки запросов (utils.request_blocking.PROFILES) для сессии"""
+        return apply_profile(self.browser, profile)
 
     def wait_for_page_load(self):
         """Ожидание загрузки страницы"""
-        self.wait.until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
+        wait_in_page(self.browser, "ready", None, self.timeout,
+                     lambda d: d.execute_script("return document.readyState") == "complete")
 
     def find_element(self, locator):
         """Найти элемент с ожиданием"""
-        return self.wait.until(EC.presence_of_element_located(locator))
+        return self.wait_for_element(locator)
 
-    def find_elements(self, locator):
-        """Найти все элементы"""
+    def find_elements(self, locator, timeout=None):
+        """Найти все элементы (ожидание появления первого не дольше timeout)"""
         try:
-            self.wait.until(EC.presence_of_element_located(locator))
+            self.wait_for_element(locator, timeout)
+        except TimeoutException:
+            return []
+        return self.find_elements_now(locator)
+
+    def find_elements_now(self, locator) -> list:
+        """Найти все элементы одним запросом к DOM, без неявного ожидания"""
+        with implicit_wait_disabled(self.browser):
             return self.browser.find_elements(*locator)
+
+    def extract(self, locator, fields: dict, timeout=None, limit=None) -> list:
+        """Прочитать поля всех совпадений локатора одним запросом к браузеру
+
+        fields - {имя: (CSS селектор внутри совпадения или None, "text" | атрибут)}.
+        Ждет появления первого совпадения не дольше timeout, иначе [].
+        """
+        try:
+            self.wait_for_element(locator, timeout)
         except TimeoutException:
             return []
+        return extract_all(self.browser, locator, fields, limit)
 
     def wait_for_element(self, locator, timeout=None):
         """Ожидание элемента"""
-        wait = WebDriverWait(self.browser, timeout or self.timeout)
-        return wait.until(EC.presence_of_element_located(locator))
+        return self._wait(locator, "present", timeout, EC.presence_of_element_located)
 
     def wait_for_element_visible(self, locator, timeout=None):
         """Ожидание видимости элемента"""
-        wait = WebDriverWait(self.browser, timeout or self.timeout)
-        return wait.until(EC.visibility_of_element_located(locator))
+        return self._wait(locator, "visible", timeout, EC.visibility_of_element_located)
 
     def wait_for_element_clickable(self, locator, timeout=None):
         """Ожидание кликабельности элемента"""
-        wait = WebDriverWait(self.browser, timeout or self.timeout)
-        return wait.until(EC.element_to_be_clickable(locator))
+        return self._wait(locator, "clickable", timeout, EC.element_to_be_clickable)
+
+    def _wait(self, locator, kind, timeout, condition):
+        """Ожидание в странице; альтернативы CSS списка - по отдельности, выученная первой"""
+        timeout = timeout or self.timeout
+        by, selector = locator
+        alternatives = locator_cache.order(type(self).__name__, selector) \
+            if LOCATOR_LEARNING and by == By.CSS_SELECTOR else None
+        if not alternatives:
+            result = wait_in_page(self.browser, kind, locator, timeout, condition(locator))
+            remember_locator(self.browser, locator)
+            return result
+        result, alternative = wait_for_any(self.browser, kind, alternatives, timeout, condition)
+        locator_cache.learn(type(self).__name__, selector, alternative)
+        remember_locator(self.browser, (by, alternative))
+        return result
 
     @allure.step("Клик по элементу")
     def click(self, locator):
@@ -60,8 +107,7 @@ class BasePage:
     def is_element_visible(self, locator, timeout=5) -> bool:
         """Проверка видимости элемента"""
         try:
-            wait = WebDriverWait(self.browser, timeout)
-            wait.until(EC.visibility_of_element_located(locator))
+            self.wait_for_element_visible(locator, timeout)
             return True
         except TimeoutException:
             return False
@@ -69,12 +115,22 @@ class BasePage:
     def is_element_present(self, locator, timeout=5) -> bool:
         """Проверка наличия элемента"""
         try:
-            wait = WebDriverWait(self.browser, timeout)
-            wait.until(EC.presence_of_element_located(locator))
+            self.wait_for_element(locator, timeout)
             return True
         except TimeoutException:
             return False
 
+    def is_element_absent(self, locator, timeout=None) -> bool:
+        """Быстрая проверка отсутствия элемента
+
+        Ждет появления не дольше UI_NEGATIVE_TIMEOUT (или timeout);
+        timeout=0 - один запрос к DOM без ожидания.
+        """
+        timeout = NEGATIVE_TIMEOUT if timeout is None else timeout
+        if timeout <= 0:
+            return not self.find_elements_now(locator)
+        return not self.is_element_present(locator, timeout)
+
     def get_text(self, locator) -> str:
         """Получить текст элемента"""
         return self.find_element(locator).text
@@ -91,5 +147,5 @@ class BasePage:
 
     def wait_for_element_invisible(self, locator, timeout=None):
         """Ожидание исчезновения элемента"""
-        wait = WebDriverWait(self.browser, timeout or self.timeout)
-        return wait.until(EC.invisibility_of_element_located(locator))
+        return wait_in_page(self.browser, "invisible", locator, timeout or self.timeout,
+                            EC.invisibility_of_element_located(locator))
@@ -64,7 +64,7 @@ class BookPage(BasePage):
             button = self.wait_for_element_clickable(self.add_to_cart_button)
             button.click()
         except TimeoutException:
-            buttons = self.find_elements(self.add_to_cart_button)
+            buttons = self.find_elements_now(self.add_to_cart_button)
             if buttons:
                 self.browser.execute_script("arguments[0].click();", buttons[0])
             else:
@@ -37,8 +37,7 @@ class CartPage(BasePage):
     @allure.step("Проверка что корзина пустая")
     def is_cart_empty(self) -> bool:
         """Проверить что корзина пустая"""
-        items = self.find_elements(self.cart_items)
-        return len(items) == 0
+        return self.is_element_absent(self.cart_items)
 
     @allure.step("Проверка видимости сообщения о пустой корзине")
     def is_empty_cart_visible(self) -> bool:
@@ -45,16 +45,21 @@ class MainPage(BasePage):
         """Получить количество книг на странице"""
         # Ждём загрузки любых книг
         if self.is_element_present(self.book_cards):
-            books = self.find_elements(self.book_cards)
+            books = self.get_books()
             if len(books) > 0:
                 return len(books)
 
         if self.is_element_present(self.any_book_image):
-            covers = self.find_elements(self.any_book_image)
+            covers = self.find_elements_now(self.any_book_image)
             return len(covers)
 
         return 0
 
+    @allure.step("Получение книг на странице")
+    def get_books(self, limit=None) -> list:
+        """Получить карточки книг (название, ссылка, автор, цена) одним запросом"""
+        return self.extract(self.book_cards, self.book_card_fields, limit=limit)
+
     @allure.step("Переход в корзину")
     def go_to_cart(self):
         """Перейти в корзину"""
@@ -1,5 +1,6 @@
 import allure
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from pages.base_page import BasePage
@@ -15,13 +16,17 @@ class SearchPage(BasePage):
     first_book_link = (By.CSS_SELECTOR, "[data-testid='art__wrapper'] [data-testid='art__title']")
     search_content = (By.CSS_SELECTOR, "[data-testid='search__content--wrapper']")
 
+    @allure.step("Получение результатов поиска")
+    def get_results(self, limit=None) -> list:
+        """Получить карточки книг (название, ссылка, автор, цена) одним запросом"""
+        return self.extract(self.search_results, self.book_card_fields, limit=limit)
+
     @allure.step("Получение количества результатов поиска")
     def get_results_count(self) -> int:
         """Получить количество результатов поиска"""
         # Ждём появления контента поиска
         if self.is_element_present(self.search_content):
-            results = self.find_elements(self.search_results)
-            return len(results)
+            return len(self.get_results())
         return 0
 
     @allure.step("Клик по первой книге в результатах")
@@ -45,8 +50,7 @@ class SearchPage(BasePage):
     @allure.step("Получение информации о первой книге")
     def get_first_book_info(self) -> dict:
         """Получить информацию о первой книге"""
-        title_element = self.find_element(self.book_title)
-        return {
-            "title": title_element.text,
-            "href": title_element.get_attribute("href")
-        }
+        books = self.get_results(limit=1)
+        if not books:
+            raise TimeoutException(f"Результаты поиска {self.search_results} не найдены")
+        return books[0]
@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+import allure
+
+
+@allure.epic("API тестирование")
+@allure.feature("Асинхронный клиент API")
+class TestAsyncAPI:
+    """API тесты для асинхронного клиента"""
+
+    @allure.story("GET /search")
+    @allure.title("Параллельный поиск по нескольким запросам")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_search_many(self, async_litres_client):
+        """Тест: Параллельный поиск книг по списку запросов"""
+        queries = ["детективы", "Python", "Толстой"]
+
+        with allure.step(f"Параллельный поиск по запросам: {queries}"):
+            responses = asyncio.run(async_litres_client.search_many(queries, limit=5))
+
+        with allure.step("Проверка статус кодов"):
+            assert len(responses) == len(queries)
+            for query, response in zip(queries, responses):
+                assert response.status_code == 200, \
+                    f"Запрос '{query}': ожидался статус 200, получен {response.status_code}"
+
+    @allure.story("Полный цикл")
+    @allure.title("Параллельное получение корзины и деталей книги")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_gather_mixed_requests(self, async_litres_client):
+        """Тест: Пачка разных запросов через gather"""
+        async def scenario():
+            return await async_litres_client.gather(
+                async_litres_client.get_cart(),
+                async_litres_client.get_book_details(72456610),
+            )
+
+        with allure.step("Получение корзины и деталей книги одной пачкой"):
+            cart_response, book_response = asyncio.run(scenario())
+
+        with allure.step("Проверка статус кодов"):
+            assert cart_response.status_code == 200, \
+                f"Ожидался статус 200, получен {cart_response.status_code}"
+            assert book_response.status_code == 200, \
+                f"Ожидался статус 200, получен {book_response.status_code}"
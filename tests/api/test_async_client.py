@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+import pytest
+import allure
+
+from api.clients.async_litres_client import AsyncLitresAPIClient
+from api.stub.server import LitresStubServer
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with LitresStubServer(catalogue_size=30) as server:
+        yield server
+
+
+@allure.epic("API тестирование")
+@allure.feature("Параллельность асинхронного клиента")
+class TestAsyncClient:
+    """Тесты семафора асинхронного клиента (локальная заглушка)"""
+
+    @allure.story("Несколько event loop")
+    @allure.title("Асинхронный клиент работает в нескольких event loop")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_async_client_across_loops(self, stub_server):
+        """Тест: Один клиент в двух asyncio.run, параллельность ограничена в каждом"""
+        client = AsyncLitresAPIClient(stub_server.base_url, concurrency=2)
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+        get_book_details = client.client.get_book_details
+
+        def counting_details(art_id):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            try:
+                return get_book_details(art_id)
+            finally:
+                with lock:
+                    active["now"] -= 1
+
+        client.client.get_book_details = counting_details
+
+        async def batch():
+            responses = await client.gather(*(client.get_book_details(art_id) for art_id in range(1, 7)))
+            return [response.status_code for response in responses]
+
+        try:
+            for _ in range(2):
+                assert asyncio.run(batch()) == [200] * 6
+        finally:
+            client.close()
+        assert active["max"] <= 2
@@ -0,0 +1,45 @@
+import pytest
+import allure
+
+from api.clients.litres_client import LitresAPIClient
+from api.stub.server import LitresStubServer
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with LitresStubServer(catalogue_size=30) as server:
+        yield server
+
+
+@allure.epic("API тестирование")
+@allure.feature("Массовые операции с корзиной")
+class TestCartBulk:
+    """Тесты добавления и удаления книг частями (локальная заглушка)"""
+
+    @allure.story("Добавление и удаление частями")
+    @allure.title("Массовое добавление и удаление книг частями")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_cart_bulk(self, stub_server):
+        """Тест: 120 книг частями по 50 попадают в одну корзину, ошибка части видна в итоге"""
+        client = LitresAPIClient(stub_server.base_url)
+        art_ids = list(range(1, 121))
+
+        with allure.step("Добавление 120 книг"):
+            result = client.add_to_cart_bulk(art_ids, chunk_size=50)
+            assert result.ok, result.failed
+            assert sorted(result.succeeded) == art_ids
+            assert len(result.responses) == 3
+            cart = client.get_cart(limit=200).json()["payload"]["data"]
+            assert sorted(item["id"] for item in cart) == art_ids
+
+        with allure.step("Удаление с одной неверной частью"):
+            result = client.remove_from_cart_bulk(art_ids + ["bad"], chunk_size=50)
+            assert not result.ok
+            assert set(result.failed) == {101, 102, 103, 104, 105, 106, 107, 108, 109, 110,
+                                          111, 112, 113, 114, 115, 116, 117, 118, 119, 120, "bad"}
+            assert result.failed["bad"] == "HTTP 400"
+            with pytest.raises(AssertionError):
+                result.raise_for_failures()
@@ -0,0 +1,163 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import allure
+
+from api.clients.cassette import CassetteMiss, MatchRule, use_cassette
+from api.clients.litres_client import LitresAPIClient
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """Локальный сервер: отвечает номером запроса, чтобы отличать ответы"""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+    counter = 0
+
+    def _reply(self):
+        CountingHandler.counter += 1
+        body = json.dumps({"payload": {"n": CountingHandler.counter, "path": self.path}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply()
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@allure.epic("API тестирование")
+@allure.feature("Кассеты API")
+class TestCassette:
+    """Тесты записи и воспроизведения обменов с API без сети"""
+
+    @allure.story("Запись и воспроизведение")
+    @allure.title("Воспроизведение записанных ответов при остановленном сервере")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_record_then_replay_offline(self, local_server, tmp_path):
+        """Тест: Ответы из кассеты совпадают с записанными, сеть не нужна"""
+        path = str(tmp_path / "litres.jsonl.gz")
+        base_url = f"http://127.0.0.1:{local_server.server_address[1]}"
+
+        with allure.step("Запись обменов с локальным сервером"):
+            recorder = LitresAPIClient(base_url)
+            adapter = use_cassette(recorder.session, path, mode="record")
+            recorded = [
+                recorder.search_books("Python", limit=5).json(),
+                recorder.add_to_cart([1]).json(),
+                recorder.add_to_cart([2]).json(),
+            ]
+            adapter.cassette.save()
+
+        with allure.step("Остановка сервера"):
+            local_server.shutdown()
+            local_server.server_close()
+
+        with allure.step("Воспроизведение без сети"):
+            player = LitresAPIClient(base_url)
+            use_cassette(player.session, path, mode="replay")
+            replayed = [
+                player.search_books("Python", limit=5).json(),
+                player.add_to_cart([1]).json(),
+                player.add_to_cart([2]).json(),
+            ]
+            assert replayed == recorded
+
+        with allure.step("Незаписанный запрос не уходит в сеть"):
+            with pytest.raises(CassetteMiss):
+                player.search_books("Толстой")
+
+    @allure.story("Правила сопоставления")
+    @allure.title("Игнорирование параметров для эндпоинта")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_match_rule_ignores_params(self, local_server, tmp_path):
+        """Тест: Правило эндпоинта исключает offset из ключа"""
+        path = str(tmp_path / "litres.jsonl.gz")
+        base_url = f"http://127.0.0.1:{local_server.server_address[1]}"
+        rules = [MatchRule(r"/search$", ignore_params=["offset"]), MatchRule(r".*")]
+
+        with allure.step("Запись первой страницы поиска"):
+            recorder = LitresAPIClient(base_url)
+            adapter = use_cassette(recorder.session, path, mode="record", rules=rules)
+            recorder.search_books("роман", limit=10, offset=0)
+            adapter.cassette.save()
+
+        with allure.step("Другой offset воспроизводится той же записью"):
+            player = LitresAPIClient(base_url)
+            use_cassette(player.session, path, mode="replay", rules=rules)
+            response = player.search_books("роман", limit=10, offset=10)
+            assert response.status_code == 200
+
+        with allure.step("Другой limit в кассете не найден"):
+            with pytest.raises(CassetteMiss):
+                player.search_books("роман", limit=20)
+
+    @allure.story("Запись и воспроизведение")
+    @allure.title("Перезапись заменяет устаревшие ответы")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_rerecord_replaces_entries(self, local_server, tmp_path):
+        """Тест: Повторная запись ключа в новой сессии не дописывается к старой"""
+        path = str(tmp_path / "litres.jsonl.gz")
+        base_url = f"http://127.0.0.1:{local_server.server_address[1]}"
+
+        for _ in range(2):
+            recorder = LitresAPIClient(base_url)
+            adapter = use_cassette(recorder.session, path, mode="record")
+            latest = recorder.get("/wishlist/arts").json()
+            adapter.cassette.save()
+
+        player = LitresAPIClient(base_url)
+        adapter = use_cassette(player.session, path, mode="replay")
+        assert len(adapter.cassette) == 1
+        assert player.get("/wishlist/arts").json() == latest
+
+    @allure.story("Запись и воспроизведение")
+    @allure.title("Кассеты воркеров объединяются при сохранении")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_workers_merge_on_save(self, local_server, tmp_path):
+        """Тест: Сохранение одного воркера не затирает записи другого"""
+        path = str(tmp_path / "litres.jsonl.gz")
+        base_url = f"http://127.0.0.1:{local_server.server_address[1]}"
+        workers = [LitresAPIClient(base_url), LitresAPIClient(base_url)]
+        adapters = [use_cassette(worker.session, path, mode="record") for worker in workers]
+
+        workers[0].search_books("Python")
+        workers[1].search_books("Толстой")
+        for adapter in adapters:
+            adapter.cassette.save()
+
+        player = LitresAPIClient(base_url)
+        use_cassette(player.session, path, mode="replay")
+        assert player.search_books("Python").status_code == 200
+        assert player.search_books("Толстой").status_code == 200
@@ -0,0 +1,43 @@
+import pytest
+import allure
+
+from api.clients.litres_client import LitresAPIClient
+from api.stub.server import LitresStubServer
+
+
+@allure.epic("API тестирование")
+@allure.feature("Пул соединений API клиента")
+class TestClientPool:
+    """Тесты общего пула соединений и прогрева клиента (локальная заглушка)"""
+
+    @allure.story("Копии и прогрев")
+    @allure.title("Копии клиента делят пул соединений, но не cookies и корзины")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_fork_and_warm_up(self):
+        """Тест: Прогрев открывает соединения без изменения корзины, копии используют их"""
+        with LitresStubServer(catalogue_size=30) as server:
+            base = LitresAPIClient(server.base_url)
+
+            with allure.step("Прогрев"):
+                base.warm_up(connections=2)
+                pools = base.session.get_adapter(server.base_url).poolmanager.pools
+                opened = sum(pools[key].num_connections for key in pools.keys())
+                assert opened >= 1
+                assert server.requests_served == 2
+                assert server.carts == {}
+
+            with allure.step("Копии со своими cookies и корзинами"):
+                first, second = base.fork(), base.fork()
+                assert first.session.get_adapter(server.base_url) is base.session.get_adapter(server.base_url)
+                assert first.add_to_cart([1]).status_code == 200
+                assert second.add_to_cart([2]).status_code == 200
+                assert [item["id"] for item in first.get_cart().json()["payload"]["data"]] == [1]
+                assert [item["id"] for item in second.get_cart().json()["payload"]["data"]] == [2]
+                assert first.session.cookies.get_dict() != second.session.cookies.get_dict()
+                assert base.get_cart().json()["payload"]["data"] == []
+
+            with allure.step("Новых соединений не открыто"):
+                assert sum(pools[key].num_connections for key in pools.keys()) == opened
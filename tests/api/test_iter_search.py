@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+import allure
+
+from api.clients.litres_client import LitresAPIClient
+from api.stub.server import LitresStubServer
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with LitresStubServer(catalogue_size=30) as server:
+        yield server
+
+
+@allure.epic("API тестирование")
+@allure.feature("Обход результатов поиска")
+class TestIterSearch:
+    """Тесты ленивого обхода страниц поиска (локальная заглушка)"""
+
+    @allure.story("Ленивый обход")
+    @allure.title("Ленивый обход страниц поиска с предзагрузкой")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    @pytest.mark.parametrize("page_size, max_items, expected_calls, expected_items", [
+        (10, 25, [(10, 0), (10, 10), (5, 20)], 25),
+        (20, None, [(20, 0), (20, 20)], 30),
+        (15, None, [(15, 0), (15, 15)], 30),
+    ], ids=["max-items", "short-last-page", "no-next-page"])
+    def test_iter_search(self, stub_server, page_size, max_items, expected_calls, expected_items):
+        """Тест: max_items обрезает последний запрос, обход останавливается на последней странице"""
+        client = LitresAPIClient(stub_server.base_url)
+        calls = []
+        search_books = client.search_books
+
+        def recording_search(query, limit, offset):
+            calls.append((limit, offset))
+            return search_books(query, limit, offset)
+
+        client.search_books = recording_search
+        items = list(client.iter_search("роман", page_size=page_size, max_items=max_items))
+
+        assert calls == expected_calls
+        assert len(items) == expected_items
+        ids = [item["instance"]["id"] for item in items]
+        assert len(set(ids)) == len(ids)
+
+    @allure.story("Ленивый обход")
+    @allure.title("Следующая страница запрашивается до обработки текущей")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_iter_search_prefetch(self, stub_server):
+        """Тест: После первого элемента вторая страница уже запрошена"""
+        client = LitresAPIClient(stub_server.base_url)
+        second_page = threading.Event()
+        search_books = client.search_books
+
+        def recording_search(query, limit, offset):
+            if offset:
+                second_page.set()
+            return search_books(query, limit, offset)
+
+        client.search_books = recording_search
+        results = client.iter_search("роман", page_size=10)
+        next(results)
+        assert second_page.wait(timeout=5), "Вторая страница не запрошена заранее"
+        assert len(list(results)) == 29
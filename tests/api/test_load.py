@@ -0,0 +1,52 @@
+import random
+
+import pytest
+import allure
+
+from api.load.runner import arrival_times, run_load
+from api.stub.server import LitresStubServer
+
+
+@allure.epic("API тестирование")
+@allure.feature("Нагрузочный режим")
+class TestLoad:
+    """Тесты нагрузочного прогона на локальной заглушке"""
+
+    @allure.story("Профиль нагрузки")
+    @allure.title("Разгон и постоянная частота запросов")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_arrival_times(self):
+        """Тест: Число запросов соответствует частоте с учетом разгона"""
+        uniform = list(arrival_times(rate=100, duration=10, ramp_up=4, poisson=False))
+        # 100 * 4 / 2 за разгон + 100 * 6 после него
+        assert len(uniform) == 799
+        assert uniform == sorted(uniform) and uniform[-1] < 10
+        assert sum(1 for moment in uniform if moment < 2) == pytest.approx(50, abs=1)
+
+        poisson = list(arrival_times(rate=100, duration=10, ramp_up=4, rnd=random.Random(16)))
+        assert len(poisson) == pytest.approx(800, rel=0.1)
+
+    @allure.story("Прогон")
+    @allure.title("Сценарий поиска на заглушке")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    @pytest.mark.parametrize("scenario", ["search", "cart"])
+    def test_run_against_stub(self, scenario):
+        """Тест: Отчет содержит все запросы, перцентили и задержки эндпоинтов"""
+        with LitresStubServer(latency=0.005, catalogue_size=60) as server:
+            report = run_load(server.base_url, scenario, rate=100, duration=1.0, ramp_up=0.5,
+                              concurrency=16, poisson=False, seed=16)
+
+        with allure.step("Проверить отчет"):
+            assert report["requests"] == 74
+            assert report["errors"] == 0, report["error_kinds"]
+            assert report["throughput_rps"] > 0
+            latency = report["latency"]
+            assert 5 <= latency["p50_ms"] <= latency["p95_ms"] <= latency["p99_ms"] <= latency["max_ms"]
+            assert sum(stats["count"] for stats in report["operations"].values()) == report["requests"]
+            assert report["endpoints"]
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+import allure
+
+from api.clients.cassette import use_cassette
+from api.clients.litres_client import LitresAPIClient
+from api.clients.metrics import LatencyHistogram, LatencyRecorder, time_to_first_byte
+from api.stub.server import LitresStubServer
+
+
+@allure.epic("API тестирование")
+@allure.feature("Метрики задержек")
+class TestLatencyMetrics:
+    """Тесты гистограмм задержек API клиента"""
+
+    @allure.story("Гистограмма")
+    @allure.title("Перцентили с погрешностью меньше 1%")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_histogram_percentiles(self):
+        """Тест: Перцентили гистограммы совпадают с точными в пределах корзины"""
+        rnd = random.Random(15)
+        values = sorted(rnd.lognormvariate(-3, 1) for _ in range(5000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for percent in (50, 95, 99):
+            exact = values[int(percent / 100 * len(values)) - 1] * 1_000_000
+            assert histogram.percentile(percent) == pytest.approx(exact, rel=0.01)
+        assert histogram.percentile(100) == histogram.max
+
+    @allure.story("Сбор между воркерами")
+    @allure.title("Гистограммы воркеров складываются без потерь")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_merge_workers(self):
+        """Тест: Сумма сериализованных гистограмм равна общей"""
+        everything, workers = LatencyRecorder(), [LatencyRecorder(), LatencyRecorder()]
+        for i in range(1000):
+            seconds = 0.001 * (i % 97 + 1)
+            everything.record("GET /search", ttfb=seconds)
+            workers[i % 2].record("GET /search", ttfb=seconds, connect=None)
+
+        merged = LatencyRecorder.merged(LatencyRecorder.from_dict(worker.to_dict()) for worker in workers)
+
+        assert merged.summary() == everything.summary()
+        assert set(merged.summary()["GET /search"]) == {"ttfb"}
+
+    @allure.story("Клиент")
+    @allure.title("Клиент записывает фазы запросов по эндпоинтам")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_client_records_phases(self):
+        """Тест: connect только для нового соединения, ttfb и total - для каждого запроса"""
+        recorder = LatencyRecorder()
+        with LitresStubServer(catalogue_size=10) as server:
+            client = LitresAPIClient(server.base_url, metrics=recorder)
+            for art_id in (1, 2, 3):
+                assert client.get_book_details(art_id).status_code == 200
+            client.session.close()
+
+        phases = recorder.summary()["GET /arts/{id}"]
+        assert phases["connect"]["count"] == 1
+        assert "tls" not in phases
+        assert phases["ttfb"]["count"] == phases["total"]["count"] == 3
+        assert phases["total"]["p50_ms"] >= phases["ttfb"]["p50_ms"] > 0
+
+    @allure.story("Клиент")
+    @allure.title("TTFB не включает установку соединения")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_ttfb_without_connect(self):
+        """Тест: connect и TLS нового соединения вычитаются из response.elapsed"""
+        assert time_to_first_byte(0.1, 0.03, 0.02) == pytest.approx(0.05)
+        assert time_to_first_byte(0.1, None, None) == 0.1
+        assert time_to_first_byte(0.01, 0.02, None) == 0.0
+
+    @allure.story("Клиент")
+    @allure.title("Фазы соединения записываются и с кассетой")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_cassette_keeps_phases(self, tmp_path):
+        """Тест: Адаптер кассеты в режиме записи замеряет connect, как исходный адаптер клиента"""
+        recorder = LatencyRecorder()
+        with LitresStubServer(catalogue_size=10) as server:
+            client = LitresAPIClient(server.base_url, metrics=recorder)
+            use_cassette(client.session, str(tmp_path / "api.jsonl.gz"), mode="record")
+            for art_id in (1, 2):
+                assert client.get_book_details(art_id).status_code == 200
+            client.session.close()
+
+        assert recorder.summary()["GET /arts/{id}"]["connect"]["count"] == 1
@@ -0,0 +1,64 @@
+import pytest
+import allure
+
+from api.models.cart_model import CartEntry
+from api.models.search_model import BookDetails, SearchHit
+
+SEARCH_JSON = {
+    "payload": {
+        "data": [
+            {
+                "type": "art",
+                "instance": {
+                    "id": 72456610,
+                    "title": "Левый путь",
+                    "art_type": "text_book",
+                    "url": "/book/72456610/",
+                    "persons": [{"full_name": "Виктор Пелевин", "role": "author"},
+                                {"full_name": "Чтец", "role": "reader"}],
+                    "prices": {"final_price": 499.0, "currency": "RUB"},
+                    "rating": {"rated_avg": 4.2, "rated_total_count": 10},
+                },
+            },
+            {"type": "podcast", "instance": {"id": 1, "title": "Подкаст"}},
+        ]
+    }
+}
+
+
+@allure.epic("API тестирование")
+@allure.feature("Модели ответов API")
+class TestModels:
+    """Тесты моделей ответов API"""
+
+    @allure.story("Поиск")
+    @allure.title("Модели из ответа поиска")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_search_hits(self):
+        """Тест: Поля книги и значения по умолчанию для неполного элемента"""
+        hits = SearchHit.from_search_payload(SEARCH_JSON)
+
+        assert hits[0] == SearchHit(72456610, "Левый путь", "text_book", "Виктор Пелевин",
+                                    499.0, "RUB", 4.2, "/book/72456610/")
+        assert hits[1].art_type == "podcast"
+        assert hits[1].price is None
+        assert not hasattr(hits[0], "__dict__"), "Модель должна использовать __slots__"
+
+    @allure.story("Детали книги и корзина")
+    @allure.title("Модели деталей книги и корзины")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_book_details_and_cart(self):
+        """Тест: Детали книги и позиции корзины"""
+        details = BookDetails.from_payload({"payload": {"data": SEARCH_JSON["payload"]["data"][0]["instance"]}})
+        assert details.author == "Виктор Пелевин"
+        assert details.authors == ("Виктор Пелевин",)
+
+        cart = CartEntry.from_cart_payload({"payload": {"data": [{"id": 1, "title": "Книга", "price": 100.0}]}})
+        assert cart == [CartEntry(1, "Книга", 100.0, 1)]
+        assert CartEntry.from_cart_payload({"payload": {"data": []}}) == []
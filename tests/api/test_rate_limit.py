@@ -0,0 +1,90 @@
+import pytest
+import allure
+
+from api.clients.rate_limit import RateLimiter, parse_limits
+
+
+class FakeClock:
+    """Часы, которые двигает sleep()"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def make_limiter(path, clock: FakeClock, **kwargs) -> RateLimiter:
+    return RateLimiter(path=str(path), clock=clock, sleep=clock.sleep, **kwargs)
+
+
+@allure.epic("API тестирование")
+@allure.feature("Ограничение частоты запросов")
+class TestRateLimit:
+    """Тесты общего token bucket (без сети)"""
+
+    @allure.story("Лимит эндпоинта")
+    @allure.title("Запросы выравниваются по QPS эндпоинта")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_endpoint_qps(self, tmp_path):
+        """Тест: После исчерпания запаса запросы идут не чаще лимита"""
+        clock = FakeClock()
+        limits = parse_limits("GET /search=2, GET /arts/{id}=0")
+        limiter = make_limiter(tmp_path / "rate.json", clock, limits=limits, default_rate=100, reserve=0)
+
+        start = clock.now
+        for _ in range(6):
+            limiter.acquire("GET", "/search")
+        # 2 токена запаса, затем 4 запроса по 0.5 сек
+        assert clock.now - start == pytest.approx(2.0)
+
+        with allure.step("Эндпоинт с лимитом 0 не ограничивается"):
+            assert all(limiter.acquire("GET", f"/arts/{art_id}") == 0 for art_id in range(1, 50))
+
+    @allure.story("Общее состояние")
+    @allure.title("Воркеры делят один бюджет через файл")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_shared_between_workers(self, tmp_path):
+        """Тест: Два ограничителя на одном файле расходуют общие токены"""
+        clock = FakeClock()
+        path = tmp_path / "rate.json"
+        first = make_limiter(path, clock, limits={}, default_rate=1, burst=2, reserve=0)
+        second = make_limiter(path, clock, limits={}, default_rate=1, burst=2, reserve=0)
+
+        assert first.acquire("PUT", "/cart/arts/add") == 0
+        assert second.acquire("PUT", "/cart/arts/add") == 0
+        assert second.acquire("PUT", "/cart/arts/add") == pytest.approx(1.0)
+
+        with allure.step("Пауза после 429 действует на всех"):
+            first.penalize("PUT", "/cart/arts/add", 5)
+            assert second.acquire("PUT", "/cart/arts/add") == pytest.approx(6.0)
+        first.close()
+        second.close()
+
+    @allure.story("Приоритет")
+    @allure.title("Smoke запросы используют резерв бюджета")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_priority_reserve(self, tmp_path):
+        """Тест: Обычные запросы оставляют резерв, приоритетные - нет"""
+        clock = FakeClock()
+        limiter = make_limiter(tmp_path / "rate.json", clock, limits={}, default_rate=1, burst=5, reserve=0.4)
+
+        waits = [limiter.acquire("GET", "/search") for _ in range(3)]
+        assert waits == [0, 0, 0]
+        assert limiter.acquire("GET", "/search") > 0
+
+        clock.now += 10
+        waits = [limiter.acquire("GET", "/search", priority=True) for _ in range(5)]
+        assert waits == [0] * 5
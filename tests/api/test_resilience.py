@@ -0,0 +1,159 @@
+import pytest
+import allure
+import requests
+
+from api.clients.cassette import CassetteMiss, use_cassette
+from api.clients.litres_client import LitresAPIClient
+from api.clients.resilience import CircuitOpenError, Resilience, RetryPolicy, endpoint_key
+
+
+def make_response(status_code: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"{}"
+    return response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Sequence:
+    """send() возвращает ответы/исключения по порядку и считает вызовы"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return make_response(outcome)
+
+
+@allure.epic("API тестирование")
+@allure.feature("Устойчивость API клиента")
+class TestResilience:
+    """Тесты повторов и circuit breaker (без сети)"""
+
+    @allure.story("Повторы")
+    @allure.title("Повтор GET после 503 и ошибки соединения")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_retry_until_success(self):
+        """Тест: Идемпотентный запрос повторяется с паузами до успеха"""
+        delays = []
+        resilience = Resilience(RetryPolicy(attempts=3), sleep=delays.append)
+        send = Sequence(503, requests.ConnectionError("reset"), 200)
+
+        response = resilience.call("GET", "/search", send)
+
+        assert response.status_code == 200
+        assert send.calls == 3
+        assert len(delays) == 2 and all(delay >= 0 for delay in delays)
+
+    @allure.story("Повторы")
+    @allure.title("Без повторов для 4xx и неидемпотентных методов")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_no_retry(self):
+        """Тест: 404 и POST не повторяются"""
+        resilience = Resilience(RetryPolicy(attempts=3), sleep=lambda delay: None)
+
+        not_found = Sequence(404, 200)
+        assert resilience.call("GET", "/arts/1", not_found).status_code == 404
+        assert not_found.calls == 1
+
+        post = Sequence(503, 200)
+        assert resilience.call("POST", "/cart", post).status_code == 503
+        assert post.calls == 1
+
+    @allure.story("Circuit breaker")
+    @allure.title("Circuit breaker открывается и пропускает пробный запрос")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_circuit_breaker(self):
+        """Тест: После порога неудач запросы не отправляются до истечения reset"""
+        clock = FakeClock()
+        resilience = Resilience(RetryPolicy(attempts=1), breaker_threshold=2, breaker_reset=30,
+                                sleep=lambda delay: None, clock=clock)
+        down = Sequence(requests.Timeout("read timeout"))
+
+        with allure.step("Две неудачи открывают цепь"):
+            for _ in range(2):
+                with pytest.raises(requests.Timeout):
+                    resilience.call("GET", "/arts/1", down)
+            with pytest.raises(CircuitOpenError):
+                resilience.call("GET", "/arts/2", down)
+            assert down.calls == 2
+
+        with allure.step("Другой эндпоинт не затронут"):
+            assert resilience.call("GET", "/search", Sequence(200)).status_code == 200
+
+        with allure.step("После reset пробный запрос закрывает цепь"):
+            clock.now += 31
+            assert resilience.call("GET", "/arts/3", Sequence(200)).status_code == 200
+            assert resilience.breaker(endpoint_key("GET", "/arts/3")).state == "closed"
+
+    @allure.story("Повторы")
+    @allure.title("PUT не повторяется")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_put_not_retried(self):
+        """Тест: PUT корзины после 503 не отправляется повторно"""
+        resilience = Resilience(RetryPolicy(attempts=3), sleep=lambda delay: None)
+        put = Sequence(503, 200)
+        assert resilience.call("PUT", "/cart/arts/1", put).status_code == 503
+        assert put.calls == 1
+
+    @allure.story("Circuit breaker")
+    @allure.title("Неожиданная ошибка пробного запроса не блокирует цепь")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_probe_cleared_on_unexpected_error(self):
+        """Тест: После исключения не из requests в пробном запросе следующий запрос отправляется"""
+        clock = FakeClock()
+        resilience = Resilience(RetryPolicy(attempts=1), breaker_threshold=1, breaker_reset=30,
+                                sleep=lambda delay: None, clock=clock)
+        with pytest.raises(requests.Timeout):
+            resilience.call("GET", "/arts/1", Sequence(requests.Timeout("read timeout")))
+
+        clock.now += 31
+        with pytest.raises(RuntimeError):
+            resilience.call("GET", "/arts/1", Sequence(RuntimeError("decode failed")))
+        assert resilience.call("GET", "/arts/1", Sequence(200)).status_code == 200
+
+    @allure.story("Кассеты")
+    @allure.title("Промах кассеты не повторяется и не открывает circuit breaker")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_cassette_miss(self, tmp_path):
+        """Тест: Незаписанный запрос в режиме replay сразу бросает CassetteMiss"""
+        sleeps = []
+        resilience = Resilience(RetryPolicy(attempts=3), breaker_threshold=1, sleep=sleeps.append)
+        client = LitresAPIClient("http://127.0.0.1:9", resilience=resilience)
+        use_cassette(client.session, str(tmp_path / "empty.jsonl.gz"), mode="replay")
+
+        for _ in range(3):
+            with pytest.raises(CassetteMiss):
+                client.get_book_details(1)
+        assert sleeps == []
+        assert resilience.breaker(endpoint_key("GET", "/arts/1")).state == "closed"
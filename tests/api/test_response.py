@@ -0,0 +1,104 @@
+import pytest
+import allure
+import requests
+
+from api.clients.response import LitresResponse
+
+BODY = '{"payload": {"data": [{"id": 1, "title": "Война и мир", "price": 599.5}], "total": 1}}'.encode("utf-8")
+
+
+def make_response(body: bytes, status_code: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.encoding = "utf-8"
+    response.url = "https://api.litres.ru/foundation/api/search"
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+class CountingResponse(requests.Response):
+    """Ответ, который считает разборы JSON"""
+
+    def __init__(self, body: bytes):
+        super().__init__()
+        self.status_code = 200
+        self._content = body
+        self.encoding = "utf-8"
+        self.parses = 0
+
+    def json(self, **kwargs):
+        self.parses += 1
+        return super().json(**kwargs)
+
+
+@allure.epic("API тестирование")
+@allure.feature("Ответы API")
+class TestLitresResponse:
+    """Тесты обертки ответа с однократным разбором JSON (без сети)"""
+
+    @allure.story("Разбор JSON")
+    @allure.title("Тело разбирается один раз")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_json_memoized(self):
+        """Тест: Повторные json() и parsed возвращают тот же объект без повторного разбора"""
+        raw = CountingResponse(BODY)
+        response = LitresResponse(raw, json_backend="json")
+
+        first = response.json()
+        assert response.json() is first
+        assert response.parsed is first
+        assert raw.parses == 1
+
+    @allure.story("Разбор JSON")
+    @allure.title("orjson и стандартный json дают одинаковый результат")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_backends_match(self):
+        """Тест: Результат не зависит от бэкенда разбора"""
+        pytest.importorskip("orjson")
+        assert LitresResponse(make_response(BODY), json_backend="orjson").json() == \
+            LitresResponse(make_response(BODY), json_backend="json").json()
+
+    @allure.story("Разбор JSON")
+    @allure.title("Не JSON тело - JSONDecodeError, как у requests")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    @pytest.mark.parametrize("backend", ["json", "orjson"])
+    def test_non_json_body(self, backend):
+        """Тест: Ошибка разбора бросается при каждом обращении, parsed - None"""
+        if backend == "orjson":
+            pytest.importorskip("orjson")
+        response = LitresResponse(make_response(b"<html>502 Bad Gateway</html>", 502), json_backend=backend)
+
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.JSONDecodeError):
+                response.json()
+        assert response.parsed is None
+
+    @allure.story("Делегирование")
+    @allure.title("Атрибуты ответа берутся из requests.Response")
+    @allure.severity(allure.severity_level.MINOR)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_attribute_delegation(self):
+        """Тест: status_code, headers, text и ok читаются из исходного ответа"""
+        raw = make_response(BODY, status_code=404)
+        response = LitresResponse(raw)
+
+        assert response.status_code == 404
+        assert response.headers["Content-Type"] == "application/json"
+        assert response.text == BODY.decode("utf-8")
+        assert response.raw is raw
+        assert not response
+        assert repr(response) == "<LitresResponse [404]>"
+        with pytest.raises(AttributeError):
+            response.no_such_attribute
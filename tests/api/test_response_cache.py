@@ -0,0 +1,81 @@
+import time
+import pytest
+import allure
+import requests
+from api.clients.cache import DiskResponseCache, ResponseCache, make_cache_key
+
+
+def make_response(body: bytes, status_code: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.url = "https://api.litres.ru/foundation/api/search"
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+@allure.epic("API тестирование")
+@allure.feature("Кэш ответов API")
+class TestResponseCache:
+    """Тесты кэша ответов GET запросов (без сети)"""
+
+    @allure.story("Ключ кэша")
+    @allure.title("Ключ не зависит от порядка параметров")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_key_sorted_params(self):
+        """Тест: Одинаковые параметры в разном порядке дают один ключ"""
+        key1 = make_cache_key("get", "/search", {"q": "Python", "limit": 5})
+        key2 = make_cache_key("GET", "/search", {"limit": 5, "q": "Python"})
+        assert key1 == key2
+        assert key1 != make_cache_key("GET", "/search", {"limit": 10, "q": "Python"})
+
+    @allure.story("Кэш в памяти")
+    @allure.title("Вытеснение LRU и истечение TTL")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_memory_lru_and_ttl(self):
+        """Тест: Старые записи вытесняются, устаревшие не возвращаются"""
+        cache = ResponseCache(ttl=60, max_entries=2)
+        cache.set("a", make_response(b'{"a": 1}'))
+        cache.set("b", make_response(b'{"b": 1}'))
+        assert cache.get("a").json() == {"a": 1}
+        cache.set("c", make_response(b'{"c": 1}'))
+
+        with allure.step("Вытеснена самая давно использованная запись"):
+            assert cache.get("b") is None
+            assert cache.get("a") is not None
+            assert cache.get("c") is not None
+
+        with allure.step("Запись с истекшим TTL не возвращается"):
+            expired = ResponseCache(ttl=-1)
+            expired.set("a", make_response(b"{}"))
+            assert expired.get("a") is None
+
+    @allure.story("Кэш на диске")
+    @allure.title("Общий кэш в файле SQLite")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_disk_cache_shared(self, tmp_path):
+        """Тест: Запись из одного экземпляра видна другому"""
+        path = str(tmp_path / "cache.sqlite")
+        DiskResponseCache(path, ttl=60).set("key", make_response('{"q": "книга"}'.encode("utf-8")))
+
+        cached = DiskResponseCache(path, ttl=60).get("key")
+        assert cached is not None
+        assert cached.status_code == 200
+        assert cached.headers["content-type"] == "application/json"
+        assert cached.json() == {"q": "книга"}
+
+        with allure.step("Вытеснение по max_entries"):
+            cache = DiskResponseCache(path, ttl=60, max_entries=1)
+            time.sleep(0.01)
+            cache.set("other", make_response(b"{}"))
+            assert len(cache) == 1
+            assert cache.get("key") is None
@@ -0,0 +1,108 @@
+import pytest
+import allure
+
+from api.schemas import registry
+from api.schemas.registry import SchemaValidationError, compile_schema, validate
+
+VALID_SEARCH = {
+    "books": [
+        {"id": 1, "title": "Война и мир", "author": "Лев Толстой", "price": 599.0, "rating": 4.8},
+        {"id": 2, "title": "Мастер и Маргарита"},
+    ],
+    "total": 2,
+}
+
+PAYLOADS = [
+    VALID_SEARCH,
+    {"books": [], "total": 0},
+    {"books": [{"id": 1.0, "title": "Книга"}], "total": 1},
+    {"books": [{"id": True, "title": "Книга"}], "total": 1},
+    {"books": [{"id": "1", "title": 2}], "total": -1},
+    {"books": [{"title": "Без id"}], "total": 1},
+    {"books": {}, "total": 1},
+    {"total": 1},
+    [],
+    None,
+    {"payload": {"data": []}},
+    {"payload": {"data": [{"id": 1}]}},
+    {"payload": {"data": [{"id": 1, "title": "Книга", "price": "100", "quantity": 1}], "total": 100}},
+    {"payload": {}},
+    {"id": 1, "title": "Книга", "author": "Автор", "isbn": 978},
+]
+
+
+@allure.epic("API тестирование")
+@allure.feature("Реестр JSON схем")
+class TestSchemaRegistry:
+    """Тесты реестра схем и сгенерированных валидаторов"""
+
+    @allure.story("Валидация")
+    @allure.title("Корректный ответ поиска проходит валидацию")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_valid_payload(self):
+        """Тест: validate не бросает исключение для корректного ответа"""
+        validate("search_response", VALID_SEARCH)
+
+    @allure.story("Валидация")
+    @allure.title("Все ошибки схемы собираются сразу")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_collects_all_errors(self):
+        """Тест: В исключении перечислены все ошибки ответа"""
+        with pytest.raises(SchemaValidationError) as error:
+            validate("search_response", {"books": [{"id": "1", "title": 2}], "total": -1})
+
+        assert len(error.value.errors) == 3
+        assert "books/0/id" in str(error.value)
+        assert "total" in str(error.value)
+
+    @allure.story("Генерация кода")
+    @allure.title("Сгенерированный валидатор совпадает с jsonschema для схемы '{name}'")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    @pytest.mark.parametrize("name", sorted(registry.SCHEMAS))
+    def test_generated_matches_jsonschema(self, name):
+        """Тест: Быстрый валидатор и jsonschema дают одинаковый результат"""
+        fast_validator = registry.get_fast_validator(name)
+        assert fast_validator is not None, f"Схема '{name}' не скомпилирована"
+        for payload in PAYLOADS:
+            assert fast_validator(payload) == registry.get_validator(name).is_valid(payload), payload
+
+    @allure.story("Генерация кода")
+    @allure.title("Неподдерживаемые ключевые слова оставляют только jsonschema")
+    @allure.severity(allure.severity_level.MINOR)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_unsupported_schema_falls_back(self):
+        """Тест: Для схемы с pattern код не генерируется"""
+        assert compile_schema({"type": "string", "pattern": "^a"}) is None
+
+    @allure.story("Генерация кода")
+    @allure.title("Список типов и пустой required не ломают быстрый путь")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_edge_schemas(self, monkeypatch):
+        """Тест: Список типов проверяет jsonschema, пустой required не генерирует проверку"""
+        monkeypatch.setattr(registry, "SCHEMAS", dict(registry.SCHEMAS))
+        assert compile_schema({"type": ["string", "null"]}) is None
+        registry.register("nullable", {"type": ["string", "null"]})
+        validate("nullable", None)
+        with pytest.raises(SchemaValidationError):
+            validate("nullable", 1)
+
+        empty_required = compile_schema({"type": "object", "required": []})
+        assert empty_required is not None and empty_required({}) and not empty_required([])
+        registry.register("empty_required", {"type": "object", "required": []})
+        validate("empty_required", {"any": 1})
+        registry.get_validator.cache_clear()
+        registry.get_fast_validator.cache_clear()
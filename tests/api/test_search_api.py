@@ -63,4 +63,20 @@ class TestSearchAPI:
 
         with allure.step("Поиск второй страницы"):
             response_page2 = litres_client.search_books("роман", limit=10, offset=10)
-            assert response_page2.status_code == 200
\ No newline at end of file
+            assert response_page2.status_code == 200
+
+    @allure.story("GET /search")
+    @allure.title("Потоковый обход результатов поиска")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_iter_search(self, litres_client):
+        """Тест: iter_search обходит несколько страниц и останавливается на max_items"""
+        with allure.step("Обход трех страниц по 10 результатов"):
+            items = list(litres_client.iter_search("роман", page_size=10, max_items=30))
+
+        with allure.step("Проверка количества и уникальности результатов"):
+            assert len(items) == 30, f"Ожидалось 30 результатов, получено {len(items)}"
+            ids = [item.get('instance', item).get('id') for item in items]
+            assert len(set(ids)) == len(ids), "Результаты на страницах повторяются"
@@ -0,0 +1,70 @@
+import pytest
+import allure
+
+from api.clients.litres_client import LitresAPIClient
+from api.stub.server import LitresStubServer
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with LitresStubServer(catalogue_size=30) as server:
+        yield server
+
+
+@allure.epic("API тестирование")
+@allure.feature("Заглушка Litres API")
+class TestStubServer:
+    """Тесты локальной заглушки API"""
+
+    @allure.story("Корзина")
+    @allure.title("Корзина хранится отдельно для каждой сессии")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_cart_per_session(self, stub_server):
+        """Тест: Добавление и удаление в одной сессии не видно в другой"""
+        first = LitresAPIClient(stub_server.base_url)
+        second = LitresAPIClient(stub_server.base_url)
+
+        with allure.step("Добавление двух книг и удаление одной в первой сессии"):
+            assert first.add_to_cart([1, 2]).status_code == 200
+            assert first.remove_from_cart([1]).status_code == 200
+
+        with allure.step("Проверка корзин"):
+            assert [item["id"] for item in first.get_cart().json()["payload"]["data"]] == [2]
+            assert second.get_cart().json()["payload"]["data"] == []
+
+    @allure.story("Поиск")
+    @allure.title("Пагинация поиска заканчивается на размере каталога")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_search_pagination(self, stub_server):
+        """Тест: Последняя страница неполная и без ссылки на следующую"""
+        client = LitresAPIClient(stub_server.base_url)
+
+        first_page = client.search_books("роман", limit=20, offset=0).json()["payload"]
+        last_page = client.search_books("роман", limit=20, offset=20).json()["payload"]
+
+        assert len(first_page["data"]) == 20
+        assert first_page["pagination"]["next_page"] is not None
+        assert len(last_page["data"]) == 10
+        assert last_page["pagination"]["next_page"] is None
+        first_ids = {item["instance"]["id"] for item in first_page["data"]}
+        assert first_ids.isdisjoint(item["instance"]["id"] for item in last_page["data"])
+
+    @allure.story("Ошибки")
+    @allure.title("Ошибки заглушки: неизвестная книга и неверное тело")
+    @allure.severity(allure.severity_level.MINOR)
+    @allure.tag("api", "regression")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_errors(self, stub_server):
+        """Тест: 404 для несуществующей книги и 400 для неверного тела"""
+        client = LitresAPIClient(stub_server.base_url)
+
+        assert client.get_book_details(0).status_code == 404
+        assert client.put("/cart/arts/add", json={"art_ids": "1"}).status_code == 400
+        assert client.get_book_details(72456610).json()["payload"]["data"]["id"] == 72456610
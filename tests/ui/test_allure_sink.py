@@ -0,0 +1,160 @@
+import os
+
+import pytest
+import allure
+import allure_commons
+from allure_commons.logger import AllureFileLogger
+
+from utils import allure_sink
+from utils.allure_sink import WRITER_BATCH_SIZE, AttachmentSink, BackgroundFileLogger, flush_sinks, \
+    install_background_writer
+
+
+@pytest.fixture
+def attached(monkeypatch):
+    """Перехват allure.attach: список (name, body)"""
+    calls = []
+    monkeypatch.setattr(allure_sink.allure, "attach",
+                        lambda body, name=None, attachment_type=None: calls.append((name, body)))
+    return calls
+
+
+class Owner:
+    """Объект с буфером attachments, как API клиент в funcargs"""
+
+    def __init__(self, sink: AttachmentSink):
+        self.attachments = sink
+
+
+class FakeConfig:
+    def __init__(self):
+        self.cleanups = []
+
+    def add_cleanup(self, func):
+        self.cleanups.append(func)
+
+
+@allure.epic("Тестирование работы с файлами")
+@allure.feature("Буфер Allure attachments")
+class TestAllureSink:
+    """Тесты отложенных attachments и фоновой записи (без браузера)"""
+
+    @allure.story("Правила прикрепления")
+    @allure.title("always, on_failure с выборкой и never")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("files", "regression")
+    @pytest.mark.regression
+    def test_policy_and_sampling(self, attached, monkeypatch):
+        """Тест: Артефакты прикрепляются по правилу и доле выборки"""
+        always = AttachmentSink(policy="always")
+        always.add("Response", {"id": 1})
+        always.flush(failed=False)
+        assert attached == [("Response", '{\n  "id": 1\n}')]
+
+        on_failure = AttachmentSink(policy="on_failure", sample_rate=0.5)
+        monkeypatch.setattr(allure_sink.random, "random", lambda: 0.7)
+        on_failure.add("Response", "{}")
+        on_failure.flush(failed=False)
+        assert len(attached) == 1 and len(on_failure) == 0
+
+        with allure.step("Прошедший тест попал в выборку"):
+            monkeypatch.setattr(allure_sink.random, "random", lambda: 0.3)
+            on_failure.add("Response", "{}")
+            on_failure.flush(failed=False)
+            assert len(attached) == 2
+
+        with allure.step("Упавший тест прикрепляется всегда, never - никогда"):
+            monkeypatch.setattr(allure_sink.random, "random", lambda: 0.99)
+            on_failure.add("Response", "{}")
+            on_failure.flush(failed=True)
+            never = AttachmentSink(policy="never")
+            never.add("Response", "{}")
+            never.flush(failed=True)
+            assert len(attached) == 3 and len(never) == 0
+
+    @allure.story("Размер")
+    @allure.title("Большие артефакты обрезаются до max_bytes")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("files", "regression")
+    @pytest.mark.regression
+    def test_max_bytes(self, monkeypatch):
+        """Тест: Лимит считается в байтах, обрезанный JSON прикрепляется как TEXT с пометкой"""
+        attached = []
+        monkeypatch.setattr(allure_sink.allure, "attach", lambda body, name=None, attachment_type=None:
+                            attached.append((name, body, attachment_type)))
+        sink = AttachmentSink(policy="always", max_bytes=11, deferred=False)
+        sink.add("Text", "а" * 50, allure.attachment_type.TEXT)
+        sink.add("Bytes", b"x" * 50, allure.attachment_type.TEXT)
+        sink.add("Json", {"title": "Война и мир"})
+        sink.add("Short", "ok", allure.attachment_type.TEXT)
+        sink.add("Short JSON", [1])
+
+        assert attached[0][1] == ("а" * 5).encode("utf-8") + "\n... [обрезано: 10 из 100 байт]".encode("utf-8")
+        assert attached[1][1] == b"x" * 11 + "\n... [обрезано: 11 из 50 байт]".encode("utf-8")
+        assert attached[2][1].startswith(b'{\n  "title')
+        assert attached[2][2] == allure.attachment_type.TEXT
+        assert attached[3][1:] == ("ok", allure.attachment_type.TEXT)
+        assert attached[4][1:] == ("[\n  1\n]", allure.attachment_type.JSON)
+
+    @allure.story("Отложенная запись")
+    @allure.title("Буферы фикстур сбрасываются по результату теста")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("files", "regression")
+    @pytest.mark.regression
+    def test_deferred_flush(self, attached):
+        """Тест: До flush_sinks ничего не прикрепляется, результат теста передается в правило"""
+        sink = AttachmentSink(policy="on_failure", sample_rate=0)
+        sink.add("Request", {"q": "Python"})
+        sink.add("Response", {"total": 1})
+        assert attached == []
+
+        flush_sinks([Owner(sink), object(), "browser"], failed=True)
+        assert [name for name, _ in attached] == ["Request", "Response"]
+        assert len(sink) == 0
+
+    @allure.story("Фоновая запись")
+    @allure.title("Все файлы из очереди записываются, повторы - один раз")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("files", "regression")
+    @pytest.mark.regression
+    @pytest.mark.parametrize("dedup", [False, True])
+    def test_background_writer(self, tmp_path, dedup):
+        """Тест: После flush на диске все attachments из нескольких пачек"""
+        writer = BackgroundFileLogger(AllureFileLogger(str(tmp_path)), dedup=dedup)
+        count = WRITER_BATCH_SIZE * 3 + 1
+        for i in range(count):
+            writer.report_attached_data(f"ответ {i}", f"{i}-attachment.json")
+        writer.report_attached_data("ответ 0", "copy-attachment.json")
+        writer.flush()
+
+        files = [name for name in os.listdir(tmp_path) if name.endswith("-attachment.json")]
+        assert len(files) == (count if dedup else count + 1)
+        assert writer.duplicates == (1 if dedup else 0)
+
+    @allure.story("Фоновая запись")
+    @allure.title("Исходный AllureFileLogger возвращается при очистке")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("files", "regression")
+    @pytest.mark.regression
+    def test_install_restores_logger(self, tmp_path):
+        """Тест: install_background_writer подменяет логгер, очистка возвращает его под тем же именем"""
+        file_logger = AllureFileLogger(str(tmp_path))
+        allure_commons.plugin_manager.register(file_logger, name="test-file-logger")
+        config = FakeConfig()
+        try:
+            install_background_writer(config)
+            plugins = allure_commons.plugin_manager.get_plugins()
+            assert file_logger not in plugins
+            assert any(isinstance(plugin, BackgroundFileLogger) and plugin.file_logger is file_logger
+                       for plugin in plugins)
+
+            for cleanup in config.cleanups:
+                cleanup()
+            plugins = allure_commons.plugin_manager.get_plugins()
+            assert file_logger in plugins
+            assert not any(isinstance(plugin, BackgroundFileLogger) and plugin.file_logger is file_logger
+                           for plugin in plugins)
+            assert allure_commons.plugin_manager.get_name(file_logger) == "test-file-logger"
+        finally:
+            if allure_commons.plugin_manager.is_registered(file_logger):
+                allure_commons.plugin_manager.unregister(file_logger)
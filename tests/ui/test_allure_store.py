@@ -0,0 +1,73 @@
+import os
+import json
+
+import pytest
+import allure
+from allure_commons.logger import AllureFileLogger
+from allure_commons import model2
+
+from utils.allure_archive import pack, unpack
+from utils.allure_sink import BackgroundFileLogger
+
+
+def attachment(name: str, source: str) -> model2.Attachment:
+    return model2.Attachment(name=name, source=source, type="text/html")
+
+
+@allure.epic("Тестирование работы с файлами")
+@allure.feature("Хранилище Allure attachments")
+class TestAllureStore:
+    """Тесты хранения attachments по содержимому (без браузера)"""
+
+    @allure.story("Дедупликация")
+    @allure.title("Одинаковые attachments пишутся одним файлом")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("files", "regression")
+    @pytest.mark.regression
+    def test_content_addressed_attachments(self, tmp_path):
+        """Тест: Повтор содержимого не пишется, ссылки в результате ведут на общий файл"""
+        writer = BackgroundFileLogger(AllureFileLogger(str(tmp_path)), dedup=True)
+        page = "<html><body>Корзина пуста</body></html>"
+
+        writer.report_attached_data(page, "first-attachment.html")
+        writer.report_attached_data(page.encode("utf-8"), "second-attachment.html")
+        writer.report_attached_data("<html>другая</html>", "third-attachment.html")
+        result = model2.TestResult(
+            uuid="test", name="test", attachments=[attachment("Page", "first-attachment.html")],
+            steps=[model2.TestStepResult(name="step", attachments=[attachment("Page", "second-attachment.html"),
+                                                                  attachment("Other", "third-attachment.html")])],
+        )
+        writer.report_result(result)
+        writer.flush()
+
+        attachments = sorted(name for name in os.listdir(tmp_path) if "-attachment" in name)
+        assert len(attachments) == 2 and writer.duplicates == 1
+        with open(next(tmp_path.glob("*-result.json")), encoding="utf-8") as file:
+            saved = json.load(file)
+        first, second, third = (saved["attachments"][0]["source"], saved["steps"][0]["attachments"][0]["source"],
+                                saved["steps"][0]["attachments"][1]["source"])
+        assert first == second != third
+        assert {first, third} == set(attachments)
+        assert (tmp_path / first).read_text(encoding="utf-8") == page
+
+    @allure.story("Архив")
+    @allure.title("Сжатый архив результатов хранит повторы один раз")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("files", "regression")
+    @pytest.mark.regression
+    def test_archive_roundtrip(self, tmp_path):
+        """Тест: Архив меньше исходных файлов и распаковывается без потерь"""
+        results = tmp_path / "allure-results"
+        results.mkdir()
+        page = "<html>" + "<div class='book'>Книга</div>" * 500 + "</html>"
+        for i in range(10):
+            (results / f"{i}-attachment.html").write_text(page, encoding="utf-8")
+        (results / "unique-attachment.txt").write_text("уникальный", encoding="utf-8")
+
+        stats = pack(str(results), str(tmp_path / "results.tar.xz"))
+        unpack(str(tmp_path / "results.tar.xz"), str(tmp_path / "restored"))
+
+        assert stats["files"] == 11 and stats["duplicates"] == 9
+        assert stats["archive_bytes"] < len(page.encode("utf-8"))
+        for path in results.iterdir():
+            assert (tmp_path / "restored" / path.name).read_bytes() == path.read_bytes()
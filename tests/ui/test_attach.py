@@ -0,0 +1,104 @@
+import time
+
+import pytest
+import allure
+
+from utils import attach
+
+
+class SlowDriver:
+    """WebDriver, у которого каждый запрос идет delay секунд"""
+
+    session_id = "session-1"
+
+    def __init__(self, delay: float = 0.2, broken_screenshot: bool = False):
+        self.delay = delay
+        self.broken_screenshot = broken_screenshot
+
+    def get_screenshot_as_png(self):
+        time.sleep(self.delay)
+        if self.broken_screenshot:
+            raise RuntimeError("session deleted")
+        return b"\x89PNG"
+
+    def get_log(self, kind):
+        time.sleep(self.delay)
+        return [{"level": "SEVERE", "message": "boom"}]
+
+    @property
+    def page_source(self):
+        time.sleep(self.delay)
+        return "<html></html>"
+
+
+@allure.epic("UI тестирование")
+@allure.feature("Артефакты UI тестов")
+class TestAttach:
+    """Тесты сбора артефактов после UI теста (без Selenoid)"""
+
+    @allure.story("Правило прикрепления")
+    @allure.title("Полный набор при падении, скриншот при успехе")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_policy(self):
+        """Тест: Набор артефактов зависит от правила и результата теста"""
+        assert attach.artifacts_for(failed=True, policy="on_failure") == ("screenshot", "logs", "html", "video")
+        assert attach.artifacts_for(failed=False, policy="on_failure") == ("screenshot",)
+        assert attach.artifacts_for(failed=False, policy="failed") == ()
+        assert attach.artifacts_for(failed=False, policy="always") == ("screenshot", "logs", "html", "video")
+        assert attach.artifacts_for(failed=True, policy="never") == ()
+        assert attach.artifacts_for(failed=True, policy="on_failure", video=False) == ("screenshot", "logs", "html")
+
+    @allure.story("Параллельный сбор")
+    @allure.title("Артефакты запрашиваются у браузера одновременно")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_parallel_collection(self, monkeypatch):
+        """Тест: Сбор занимает время одного запроса, ошибка одного артефакта не мешает остальным"""
+        attached = []
+        monkeypatch.setattr(attach.allure, "attach", lambda body, name, **kwargs: attached.append(name))
+
+        start = time.perf_counter()
+        attach.add_artifacts(SlowDriver(delay=0.2, broken_screenshot=True), failed=True, policy="on_failure")
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5
+        assert attached == ["screenshot error", "Browser Logs", "Page Source", "Video"]
+
+    @allure.story("История страницы")
+    @allure.title("История страницы прикрепляется только с полным набором артефактов")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_history_on_failure(self, monkeypatch):
+        """Тест: Успешный тест получает только скриншот, упавший - все артефакты и историю"""
+        attached = []
+        monkeypatch.setattr(attach.allure, "attach", lambda body, name, **kwargs: attached.append(name))
+        driver = SlowDriver(delay=0)
+        history = [{"t": 0.1, "event": "navigate", "url": "https://www.litres.ru/", "title": "Литрес"}]
+
+        attach.add_artifacts(driver, failed=False, history=history)
+        attach.add_artifacts(driver, failed=True, history=history)
+
+        assert attached == ["Screenshot", "Screenshot", "Browser Logs", "Page Source", "Video", "Page history"]
+
+    @allure.story("Правило прикрепления")
+    @allure.title("Без ссылки на видео для сессии из пула")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_without_video(self, monkeypatch):
+        """Тест: video=False убирает только видео, история страницы прикрепляется"""
+        attached = []
+        monkeypatch.setattr(attach.allure, "attach", lambda body, name, **kwargs: attached.append(name))
+        history = [{"t": 0.1, "event": "navigate", "url": "https://www.litres.ru/", "title": "Литрес"}]
+
+        attach.add_artifacts(SlowDriver(delay=0), failed=True, history=history, video=False)
+
+        assert attached == ["Screenshot", "Browser Logs", "Page Source", "Page history"]
@@ -0,0 +1,168 @@
+import itertools
+
+import pytest
+import allure
+from selenium.common.exceptions import WebDriverException
+
+from utils.browser_pool import BrowserPool
+
+
+class CommandExecutor:
+    def __init__(self):
+        self._commands = {}
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+    """Минимальный WebDriver без CDP: вкладки, cookies, хранилище текущего сайта"""
+
+    _ids = itertools.count(1)
+    cdp_available = False
+
+    def __init__(self):
+        self.session_id = f"session-{next(self._ids)}"
+        self.window_handles = ["main"]
+        self.current = "main"
+        self.cookies = {}
+        self.storage = {}
+        self.url = "about:blank"
+        self.quit_called = False
+        self.broken = False
+        self.switch_to = FakeSwitchTo(self)
+        self.command_executor = CommandExecutor()
+        # История вкладок и команды CDP
+        self.history = {"main": []}
+        self.commands = []
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def delete_all_cookies(self):
+        if self.broken:
+            raise WebDriverException("session deleted")
+        self.cookies.clear()
+
+    def execute_script(self, script):
+        self.storage.clear()
+
+    def execute(self, command, params):
+        if self.broken or not self.cdp_available:
+            raise WebDriverException("unknown command: goog/cdp/execute")
+        self.commands.append((self.current, params["cmd"], params["params"]))
+        if params["cmd"] == "Page.getNavigationHistory":
+            return {"value": {"entries": [{"url": url} for url in self.history.get(self.current, [])]}}
+        return {"value": {}}
+
+    def get(self, url):
+        self.url = url
+
+    def quit(self):
+        self.quit_called = True
+
+
+class CdpFakeDriver(FakeDriver):
+    """Chrome: cookies и хранилища очищаются через CDP"""
+
+    cdp_available = True
+
+
+@allure.epic("UI тестирование")
+@allure.feature("Пул браузеров")
+class TestBrowserPool:
+    """Тесты пула сессий браузера (без Selenoid)"""
+
+    @allure.story("Переиспользование")
+    @allure.title("Сессия очищается и переиспользуется между тестами")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_reuse_and_reset(self):
+        """Тест: После теста закрыты вкладки, удалены cookies и хранилище"""
+        pool = BrowserPool(FakeDriver, max_uses=5)
+
+        driver = pool.acquire()
+        driver.window_handles.append("popup")
+        driver.cookies["SID"] = "1"
+        driver.storage["cart"] = "[1]"
+        driver.url = "https://www.litres.ru/"
+        pool.release(driver)
+
+        assert pool.acquire() is driver
+        assert driver.window_handles == ["main"]
+        assert not driver.cookies and not driver.storage
+        assert driver.url == "about:blank"
+        assert pool.created == 1
+
+    @allure.story("Переиспользование")
+    @allure.title("Через CDP очищаются cookies всех доменов и хранилища посещенных сайтов")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_reset_via_cdp(self):
+        """Тест: Network.clearBrowserCookies и Storage.clearDataForOrigin для origin из истории всех вкладок"""
+        pool = BrowserPool(CdpFakeDriver, max_uses=5)
+
+        driver = pool.acquire()
+        driver.window_handles.append("popup")
+        driver.history = {
+            "main": ["https://www.litres.ru/", "https://www.litres.ru/search/?q=1", "about:blank"],
+            "popup": ["https://id.litres.ru/login/"],
+        }
+        pool.release(driver)
+
+        assert pool.acquire() is driver
+        assert driver.window_handles == ["main"]
+        commands = [(cmd, params.get("origin")) for _, cmd, params in driver.commands
+                    if cmd != "Page.getNavigationHistory"]
+        assert commands == [
+            ("Network.clearBrowserCookies", None),
+            ("Storage.clearDataForOrigin", "https://id.litres.ru"),
+            ("Storage.clearDataForOrigin", "https://www.litres.ru"),
+        ]
+        assert driver.current == "main" and driver.url == "about:blank"
+
+    @allure.story("Пересоздание")
+    @allure.title("Сессия пересоздается после N тестов, падения или ошибки сброса")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_recycle(self):
+        """Тест: max_uses, упавший тест и сломанная сессия закрывают драйвер"""
+        pool = BrowserPool(FakeDriver, max_uses=2)
+
+        with allure.step("Лимит использований"):
+            first = pool.acquire()
+            pool.release(first)
+            assert pool.acquire() is first
+            pool.release(first)
+            assert first.quit_called
+
+        with allure.step("Упавший тест"):
+            second = pool.acquire()
+            assert second is not first
+            pool.release(second, failed=True)
+            assert second.quit_called
+
+        with allure.step("Сессия, которую не удалось сбросить"):
+            third = pool.acquire()
+            third.broken = True
+            pool.release(third)
+            assert third.quit_called
+
+        fourth = pool.acquire()
+        pool.release(fourth)
+        pool.close()
+        assert fourth.quit_called and pool.created == 4
@@ -5,6 +5,7 @@ from pages.main_page import MainPage
 
 @allure.epic("UI тестирование")
 @allure.feature("Корзина")
+@pytest.mark.block_requests("lite")
 class TestCart:
     """Тесты функционала корзины"""
 
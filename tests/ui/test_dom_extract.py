@@ -0,0 +1,107 @@
+import pytest
+import allure
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from pages.search_page import SearchPage
+from utils.dom_extract import extract_all
+
+CARDS = [
+    {"title": "Война и мир", "href": "https://www.litres.ru/book/lev-tolstoy/voyna-i-mir/",
+     "author": "Лев Толстой", "price": "99 ₽"},
+    {"title": "Анна Каренина", "href": "https://www.litres.ru/book/lev-tolstoy/anna-karenina/",
+     "author": "Лев Толстой", "price": None},
+]
+
+
+class ExtractDriver:
+    """Драйвер, у которого скрипты возвращают готовые карточки и считаются вызовы"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.async_scripts = []
+        self.scripts = []
+
+    def execute_async_script(self, script, *args):
+        self.async_scripts.append(args)
+        return ["element", 0]
+
+    def execute_script(self, script, *args):
+        self.scripts.append(args)
+        return self.rows[:args[3]] if args[3] else self.rows
+
+
+class FakeElement:
+    """Элемент с текстом, атрибутами и вложенными элементами по CSS"""
+
+    def __init__(self, text="", attributes=None, children=None):
+        self.text = text
+        self.attributes = attributes or {}
+        self.children = children or {}
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+    def find_element(self, by, value):
+        if value not in self.children:
+            raise NoSuchElementException(value)
+        return self.children[value]
+
+
+class ElementsDriver:
+    """Драйвер без выполнения скриптов: только find_elements"""
+
+    def __init__(self, elements):
+        self.elements = elements
+        self.implicit_waits = []
+
+    def implicitly_wait(self, seconds):
+        self.implicit_waits.append(seconds)
+
+    def find_elements(self, by, value):
+        return self.elements
+
+
+@allure.epic("UI тестирование")
+@allure.feature("Извлечение данных со страницы")
+class TestDomExtract:
+    """Тесты чтения карточек одним запросом (без браузера)"""
+
+    @allure.story("Один запрос")
+    @allure.title("Карточки результатов поиска читаются одним execute_script")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_search_results_in_one_call(self):
+        """Тест: Ожидание и чтение всех полей карточек - два запроса к браузеру"""
+        driver = ExtractDriver(CARDS)
+        search_page = SearchPage(driver)
+
+        assert search_page.get_results() == CARDS
+        assert len(driver.async_scripts) == 1 and len(driver.scripts) == 1
+        using, value, fields, limit = driver.scripts[0]
+        assert (using, value, limit) == ("css", SearchPage.search_results[1], 0)
+        assert [field[0] for field in fields] == ["title", "href", "author", "price"]
+
+        with allure.step("Первая книга - с limit=1"):
+            assert search_page.get_first_book_info() == CARDS[0]
+            assert driver.scripts[-1][3] == 1
+
+    @allure.story("Запасной вариант")
+    @allure.title("Локатор без CSS/XPath читается по элементам")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_element_fallback(self):
+        """Тест: Ненайденное поле - None, неявное ожидание отключено на время чтения"""
+        title = FakeElement(" Война и мир ", {"href": CARDS[0]["href"]})
+        driver = ElementsDriver([FakeElement(children={".title": title}), FakeElement()])
+        fields = {"title": (".title", "text"), "href": (".title", "href"), "id": (None, "id")}
+
+        rows = extract_all(driver, (By.LINK_TEXT, "Книга"), fields)
+
+        assert rows == [{"title": "Война и мир", "href": CARDS[0]["href"], "id": None},
+                        {"title": None, "href": None, "id": None}]
+        assert driver.implicit_waits == [0, 10]
@@ -0,0 +1,79 @@
+import pytest
+import allure
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from utils.dom_wait import wait_in_page
+
+
+class ScriptDriver:
+    """Драйвер, у которого execute_async_script возвращает result или бросает error"""
+
+    def __init__(self, result=None, error: Exception = None):
+        self.result = result
+        self.error = error
+        self.scripts = []
+        self.implicit_waits = []
+
+    def implicitly_wait(self, seconds):
+        self.implicit_waits.append(seconds)
+
+    def execute_async_script(self, script, *args):
+        self.scripts.append(args)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class Condition:
+    """Условие для WebDriverWait, которое считает вызовы"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self, driver):
+        self.calls += 1
+        return self.value
+
+
+@allure.epic("UI тестирование")
+@allure.feature("Ожидания в странице")
+class TestDomWait:
+    """Тесты ожиданий через execute_async_script (без браузера)"""
+
+    @allure.story("Ожидание в странице")
+    @allure.title("Результат скрипта возвращается без опроса")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_in_page_result(self):
+        """Тест: Один вызов скрипта, локатор приводится к CSS, таймаут - в мс"""
+        driver, fallback = ScriptDriver(result=["element", 0]), Condition("polled")
+
+        assert wait_in_page(driver, "visible", (By.ID, "pageTitle"), 2, fallback) == "element"
+        assert driver.scripts == [("visible", "css", ['[id="pageTitle"]'], 2000, 100)]
+        assert fallback.calls == 0
+
+        with allure.step("Таймаут в странице - TimeoutException без опроса"):
+            with pytest.raises(TimeoutException):
+                wait_in_page(ScriptDriver(result=None), "present", (By.XPATH, "//h1"), 1, fallback)
+            assert fallback.calls == 0
+
+    @allure.story("Запасной вариант")
+    @allure.title("Опрос WebDriverWait, если ожидание в странице недоступно")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_polling_fallback(self):
+        """Тест: Ошибка скрипта и неподдерживаемый локатор переключают на опрос без неявного ожидания"""
+        broken = ScriptDriver(error=JavascriptException("document unloaded while waiting for result"))
+        fallback = Condition("polled")
+        assert wait_in_page(broken, "present", (By.CSS_SELECTOR, "h1"), 1, fallback) == "polled"
+        assert broken.implicit_waits == [0, 10]
+
+        unsupported = ScriptDriver(result=["element", 0])
+        assert wait_in_page(unsupported, "present", (By.LINK_TEXT, "Корзина"), 1, fallback) == "polled"
+        assert unsupported.scripts == []
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+import allure
+from selenium.common.exceptions import JavascriptException, NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from pages.cart_page import CartPage
+
+
+class CartDriver:
+    """Драйвер корзины с неявным ожиданием 10 сек, как у сессии из пула"""
+
+    def __init__(self, items=(), script_error: Exception = None):
+        self.items = list(items)
+        self.script_error = script_error
+        self.implicit_wait = 10
+        self.implicit_waits = []
+        self.scripts = []
+        self.finds = []
+
+    def implicitly_wait(self, seconds):
+        self.implicit_wait = seconds
+        self.implicit_waits.append(seconds)
+
+    def execute_async_script(self, script, *args):
+        self.scripts.append(args)
+        if self.script_error is not None:
+            raise self.script_error
+        return [self.items[0], 0] if self.items else None
+
+    def find_element(self, by, value):
+        items = self.find_elements(by, value)
+        if not items:
+            raise NoSuchElementException(value)
+        return items[0]
+
+    def find_elements(self, by, value):
+        self.finds.append((by, value, self.implicit_wait))
+        if not self.items and self.implicit_wait:
+            raise AssertionError("поиск с неявным ожиданием ждал бы implicit_wait сек")
+        return list(self.items)
+
+
+@allure.epic("UI тестирование")
+@allure.feature("Быстрые проверки отсутствия")
+class TestFastAbsence:
+    """Тесты проверок отсутствия элементов в page objects (без браузера)"""
+
+    @allure.story("Пустая корзина")
+    @allure.title("Пустая корзина определяется за короткий негативный таймаут")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_empty_cart(self):
+        """Тест: Отсутствие товаров проверяется в странице с таймаутом UI_NEGATIVE_TIMEOUT"""
+        driver = CartDriver()
+        cart = CartPage(driver)
+
+        assert cart.is_cart_empty()
+        assert driver.scripts[0][:3] == ("present", "css", [CartPage.cart_items[1]])
+        assert driver.scripts[0][3] == 1000
+        assert driver.finds == []
+
+        with allure.step("Количество товаров ждет обычный таймаут"):
+            full = CartDriver(items=["book", "audiobook"])
+            assert CartPage(full).get_items_count() == 2
+            assert full.scripts[0][3] == 10000
+            assert full.finds == [(By.CSS_SELECTOR, CartPage.cart_items[1], 0)]
+            assert full.implicit_wait == 10
+
+    @allure.story("Без ожидания")
+    @allure.title("Нулевой таймаут - один запрос к DOM без неявного ожидания")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_single_query_and_fallback(self):
+        """Тест: Неявное ожидание отключается на время запроса и возвращается обратно"""
+        driver = CartDriver()
+        cart = CartPage(driver)
+
+        assert cart.is_element_absent(cart.remove_button, timeout=0)
+        assert driver.scripts == [] and driver.implicit_waits == [0, 10]
+
+        with allure.step("Опрос WebDriverWait не складывается с неявным ожиданием"):
+            broken = CartDriver(script_error=JavascriptException("document unloaded while waiting for result"))
+            start = time.monotonic()
+            assert CartPage(broken).is_element_absent(CartPage.cart_items, timeout=0.2)
+            assert time.monotonic() - start < 2
+            assert broken.finds and all(implicit == 0 for _, _, implicit in broken.finds)
+            assert broken.implicit_wait == 10
@@ -0,0 +1,110 @@
+import pytest
+import allure
+from selenium.common.exceptions import JavascriptException, NoSuchElementException
+
+from pages import base_page
+from pages.book_page import BookPage
+from utils.locator_cache import LocatorCache, split_selector
+
+BUY, ADD, BUY_CLASS, CART_CLASS = split_selector(BookPage.add_to_cart_button[1])
+
+
+class AlternativesDriver:
+    """Драйвер, на странице которого кликабельна только одна альтернатива"""
+
+    def __init__(self, clickable: str, script_error: Exception = None):
+        self.clickable = clickable
+        self.script_error = script_error
+        self.scripts = []
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute_async_script(self, script, kind, using, values, timeout, recheck):
+        self.scripts.append(list(values))
+        if self.script_error is not None:
+            raise self.script_error
+        return ["button", values.index(self.clickable)] if self.clickable in values else None
+
+    def find_element(self, by, value):
+        if value != self.clickable:
+            raise NoSuchElementException(value)
+        return FakeButton()
+
+
+class FakeButton:
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Отдельный кэш локаторов для теста"""
+    fresh = LocatorCache()
+    monkeypatch.setattr(base_page, "locator_cache", fresh)
+    return fresh
+
+
+@allure.epic("UI тестирование")
+@allure.feature("Выученные локаторы")
+class TestLocatorCache:
+    """Тесты выбора альтернатив CSS локаторов (без браузера)"""
+
+    @allure.story("Разбор локатора")
+    @allure.title("Список селекторов делится по запятым верхнего уровня")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_split_selector(self):
+        """Тест: Запятые в кавычках и скобках не делят альтернативы"""
+        assert split_selector("#pageTitle, h1") == ["#pageTitle", "h1"]
+        assert split_selector("button[aria-label='купить, сейчас'], :is(a, b) span") == \
+            ["button[aria-label='купить, сейчас']", ":is(a, b) span"]
+        assert len(split_selector(BookPage.add_to_cart_button[1])) == 4
+
+    @allure.story("Обучение")
+    @allure.title("Сработавшая альтернатива проверяется первой")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_learned_alternative_first(self, cache):
+        """Тест: После первого срабатывания порядок меняется, отчет показывает неиспользованные"""
+        driver = AlternativesDriver(clickable=BUY_CLASS)
+        book_page = BookPage(driver)
+
+        assert book_page.wait_for_element_clickable(book_page.add_to_cart_button) == "button"
+        assert driver.scripts[0] == [BUY, ADD, BUY_CLASS, CART_CLASS]
+        book_page.wait_for_element_clickable(book_page.add_to_cart_button)
+        assert driver.scripts[1] == [BUY_CLASS, BUY, ADD, CART_CLASS]
+
+        report = cache.report()
+        assert report == [{
+            "page": "BookPage",
+            "locator": BookPage.add_to_cart_button[1],
+            "hits": {BUY: 0, ADD: 0, BUY_CLASS: 2, CART_CLASS: 0},
+            "unused": [BUY, ADD, CART_CLASS],
+        }]
+
+        with allure.step("Статистика воркеров складывается"):
+            merged = LocatorCache.from_dict(cache.to_dict())
+            merged.merge(cache)
+            assert merged.report()[0]["hits"][BUY_CLASS] == 4
+
+    @allure.story("Запасной вариант")
+    @allure.title("Опрос проверяет альтернативы по отдельности")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_polling_learns(self, cache):
+        """Тест: Без ожидания в странице альтернатива тоже запоминается"""
+        driver = AlternativesDriver(clickable=CART_CLASS,
+                                    script_error=JavascriptException("document unloaded while waiting for result"))
+
+        assert isinstance(BookPage(driver).wait_for_element_clickable(BookPage.add_to_cart_button, 1), FakeButton)
+        assert cache.report()[0]["hits"][CART_CLASS] == 1
@@ -0,0 +1,94 @@
+import pytest
+import allure
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.events import EventFiringWebDriver
+
+from pages.base_page import BasePage
+from utils.page_history import PageHistory
+
+
+class FakeDriver:
+    def __init__(self):
+        self.url = "about:blank"
+
+    def execute_script(self, script):
+        return [self.url, f"Title of {self.url}"]
+
+
+class FakeElement(WebElement):
+    def click(self):
+        pass
+
+    def send_keys(self, *value):
+        pass
+
+
+class InPageDriver(WebDriver):
+    """WebDriver без сессии: ожидания в странице сразу находят элемент"""
+
+    def __init__(self):
+        self.element = FakeElement(self, "element-1")
+
+    def implicitly_wait(self, time_to_wait):
+        pass
+
+    def execute_async_script(self, script, *args):
+        return [self.element, 0]
+
+    def execute_script(self, script, *args):
+        return ["https://www.litres.ru/", "Литрес"]
+
+
+@allure.epic("UI тестирование")
+@allure.feature("Артефакты UI тестов")
+class TestPageHistory:
+    """Тесты буфера состояний страницы (без Selenoid)"""
+
+    @allure.story("История страницы")
+    @allure.title("Буфер хранит последние события с локаторами")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_ring_buffer(self):
+        """Тест: Переходы с URL и заголовком, клики по локатору, старые события вытесняются"""
+        history = PageHistory(size=3)
+        driver = FakeDriver()
+
+        driver.url = "https://www.litres.ru/"
+        history.after_navigate_to(driver.url, driver)
+        history.before_find("css selector", "input[name='q']", driver)
+        history.after_change_value_of(None, driver)
+        history.before_find("css selector", "button[type='submit']", driver)
+        history.after_click(None, driver)
+        driver.url = "https://www.litres.ru/search/?q=python"
+        history.after_navigate_to(driver.url, driver)
+
+        states = history.to_list()
+        assert len(history) == 3
+        assert [state["event"] for state in states] == ["input", "click", "navigate"]
+        assert states[1]["locator"] == "css selector=button[type='submit']"
+        assert states[2]["url"] == driver.url and states[2]["title"] == f"Title of {driver.url}"
+
+    @allure.story("История страницы")
+    @allure.title("Клик и ввод через BasePage записываются с локатором")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_base_page_actions(self):
+        """Тест: Ожидание в странице без find_element все равно передает локатор истории"""
+        history = PageHistory()
+        page = BasePage(EventFiringWebDriver(InPageDriver(), history))
+        button = (By.CSS_SELECTOR, "button[type='submit']")
+        search = (By.CSS_SELECTOR, "input[name='q'], input[type='search']")
+
+        page.click(button)
+        page.wait_for_element_clickable(search).send_keys("python")
+
+        assert [(state["event"], state["locator"]) for state in history.to_list()] == [
+            ("click", "css selector=button[type='submit']"),
+            ("input", "css selector=input[name='q']"),
+        ]
@@ -0,0 +1,105 @@
+import pytest
+import allure
+from selenium.common.exceptions import WebDriverException
+
+from pages.main_page import MainPage
+from pages import base_page
+from utils.request_blocking import PROFILES, PageLoadStats, active_profile, apply_profile, patterns_for
+
+
+class CommandExecutor:
+    def __init__(self):
+        self._commands = {}
+
+
+class CdpDriver:
+    """Драйвер, который запоминает команды CDP и отдает тайминги Performance API"""
+
+    def __init__(self, cdp_available=True, load=None):
+        self.command_executor = CommandExecutor()
+        self.cdp_available = cdp_available
+        self.load = load
+        self.commands = []
+        self.urls = []
+
+    def execute(self, command, params):
+        if not self.cdp_available:
+            raise WebDriverException("unknown command: goog/cdp/execute")
+        self.commands.append((command, params["cmd"], params["params"]))
+        return {"value": {}}
+
+    def get(self, url):
+        self.urls.append(url)
+
+    def execute_async_script(self, script, *args):
+        return [True, 0]
+
+    def execute_script(self, script, *args):
+        return self.load
+
+
+@allure.epic("UI тестирование")
+@allure.feature("Блокировка запросов")
+class TestRequestBlocking:
+    """Тесты профилей блокировки запросов и статистики загрузки (без браузера)"""
+
+    @allure.story("Профили")
+    @allure.title("Профиль применяется командой CDP только при изменении")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_apply_profile(self):
+        """Тест: Network.enable один раз, setBlockedURLs - при смене шаблонов"""
+        driver = CdpDriver()
+
+        assert apply_profile(driver, "none") and driver.commands == []
+        assert apply_profile(driver, "lite")
+        assert apply_profile(driver, "lite")
+        assert apply_profile(driver, "none")
+        assert driver.commands == [
+            ("executeCdpCommand", "Network.enable", {}),
+            ("executeCdpCommand", "Network.setBlockedURLs", {"urls": PROFILES["lite"]}),
+            ("executeCdpCommand", "Network.setBlockedURLs", {"urls": []}),
+        ]
+        assert driver.command_executor._commands["executeCdpCommand"] == \
+            ("POST", "/session/$sessionId/goog/cdp/execute")
+        assert active_profile(driver) == "none"
+
+        with allure.step("Без CDP профиль не применяется, тест продолжается"):
+            other = CdpDriver(cdp_available=False)
+            assert not apply_profile(other, "analytics")
+            assert active_profile(other) == "none"
+
+        with allure.step("Неизвестный профиль - ошибка"):
+            with pytest.raises(ValueError):
+                patterns_for("everything")
+
+    @allure.story("Статистика загрузки")
+    @allure.title("Время загрузки и объем страниц сравниваются с профилем none")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.tag("ui", "regression")
+    @pytest.mark.ui
+    @pytest.mark.regression
+    def test_page_load_report(self, monkeypatch):
+        """Тест: BasePage.open записывает загрузку под активным профилем"""
+        stats = PageLoadStats()
+        monkeypatch.setattr(base_page, "page_loads", stats)
+
+        full = CdpDriver(load={"load_ms": 3000, "bytes": 4 * 1024 * 1024, "requests": 180})
+        MainPage(full).open_page()
+        lite = CdpDriver(load={"load_ms": 1200.5, "bytes": 1024 * 1024, "requests": 60})
+        page = MainPage(lite)
+        assert page.block_requests("lite")
+        page.open_page()
+        MainPage(CdpDriver(load=None)).open_page()
+
+        report = {row["profile"]: row for row in stats.report()}
+        assert report["none"]["loads"] == 1 and "saved_ms" not in report["none"]
+        assert report["lite"]["mean_requests"] == 60
+        assert report["lite"]["saved_ms"] == 1799.5 and report["lite"]["saved_kb"] == 3072.0
+
+        with allure.step("Статистика воркеров складывается"):
+            merged = PageLoadStats.from_dict(stats.to_dict())
+            merged.merge(stats)
+            assert {row["profile"]: row["loads"] for row in merged.report()} == {"lite": 2, "none": 2}
@@ -0,0 +1,80 @@
+"""Сжатый архив allure-results для CI
+
+Allure читает attachments только несжатыми, поэтому сжатие делается при
+упаковке результатов: tar.xz (или tar.gz), в котором файлы с
+одинаковым содержимым хранятся один раз (как жесткие ссылки).
+
+Запуск из корня проекта:
+    python -m utils.allure_archive pack allure-results allure-results.tar.xz
+    python -m utils.allure_archive unpack allure-results.tar.xz allure-results
+"""
+import os
+import sys
+import hashlib
+import argparse
+import tarfile
+from typing import Dict
+
+
+def _mode(archive_path: str, write: bool) -> str:
+    compression = "xz" if archive_path.endswith((".xz", ".txz")) else "gz"
+    return f"{'w' if write else 'r'}:{compression}"
+
+
+def pack(results_dir: str, archive_path: str) -> dict:
+    """Упаковать каталог результатов, вернуть статистику размеров"""
+    seen: Dict[str, str] = {}
+    stats = {"files": 0, "duplicates": 0, "bytes": 0}
+    with tarfile.open(archive_path, _mode(archive_path, write=True)) as archive:
+        for name in sorted(os.listdir(results_dir)):
+            path = os.path.join(results_dir, name)
+            if not os.path.isfile(path):
+                continue
+            with open(path, "rb") as file:
+                data = file.read()
+            stats["files"] += 1
+            stats["bytes"] += len(data)
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            info = archive.gettarinfo(path, arcname=name)
+            if digest in seen:
+                stats["duplicates"] += 1
+                info.type = tarfile.LNKTYPE
+                info.linkname = seen[digest]
+                info.size = 0
+                archive.addfile(info)
+            else:
+                seen[digest] = name
+                with open(path, "rb") as file:
+                    archive.addfile(info, file)
+    stats["archive_bytes"] = os.path.getsize(archive_path)
+    return stats
+
+
+def unpack(archive_path: str, results_dir: str):
+    """Распаковать архив в каталог результатов для allure generate/serve"""
+    os.makedirs(results_dir, exist_ok=True)
+    with tarfile.open(archive_path, _mode(archive_path, write=False)) as archive:
+        if hasattr(tarfile, "data_filter"):
+            archive.extractall(results_dir, filter="data")
+        else:
+            archive.extractall(results_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["pack", "unpack"])
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    args = parser.parse_args()
+
+    if args.command == "unpack":
+        unpack(args.source, args.destination)
+        return
+    stats = pack(args.source, args.destination)
+    ratio = stats["archive_bytes"] / stats["bytes"] if stats["bytes"] else 0
+    print(f"files={stats['files']} duplicates={stats['duplicates']} "
+          f"size={stats['bytes']} archive={stats['archive_bytes']} ({ratio:.1%})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
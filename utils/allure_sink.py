@@ -0,0 +1,235 @@
+import json
+import os
+import queue
+import hashlib
+import random
+import threading
+import logging
+
+import allure
+import allure_commons
+from allure_commons.logger import AllureFileLogger
+
+logger = logging.getLogger(__name__)
+
+# Правила прикрепления API артефактов:
+#   always     - всегда прикреплять тела запросов/ответов
+#   on_failure - только для упавших тестов (плюс доля ALLURE_API_SAMPLE_RATE прошедших)
+#   never      - не прикреплять
+ATTACHMENTS_POLICY = os.getenv("ALLURE_API_ATTACHMENTS", "always")
+ATTACHMENTS_SAMPLE_RATE = float(os.getenv("ALLURE_API_SAMPLE_RATE", "0"))
+ATTACHMENT_MAX_BYTES = int(os.getenv("ALLURE_ATTACHMENT_MAX_BYTES", str(512 * 1024)))
+
+# Сколько файлов фоновый поток пишет за один проход и размер очереди
+WRITER_BATCH_SIZE = 64
+WRITER_QUEUE_SIZE = 1024
+
+# Хранить одинаковые attachments (по хэшу содержимого) одним файлом
+ATTACHMENTS_DEDUP = os.getenv("ALLURE_DEDUP_ATTACHMENTS", "1") == "1"
+
+
+class AttachmentSink:
+    """Буфер Allure attachments одного теста
+
+    Артефакты копятся в памяти и прикрепляются пачкой в flush() по
+    окончании теста с учетом правила policy. JSON сериализуется только
+    для тех артефактов, которые действительно попадут в отчет. Без
+    deferred артефакт прикрепляется сразу, как раньше.
+    """
+
+    def __init__(self, policy: str = ATTACHMENTS_POLICY, sample_rate: float = ATTACHMENTS_SAMPLE_RATE,
+                 max_bytes: int = ATTACHMENT_MAX_BYTES, deferred: bool = True):
+        self.policy = policy
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.deferred = deferred
+        self._items = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, name: str, body, attachment_type=allure.attachment_type.JSON):
+        """Добавить артефакт (str, bytes или JSON-совместимый объект)"""
+        if self.policy == "never":
+            return
+        if not self.deferred:
+            self._attach(name, body, attachment_type)
+            return
+        with self._lock:
+            self._items.append((name, body, attachment_type))
+
+    def flush(self, failed: bool = False):
+        """Прикрепить накопленные артефакты к текущему тесту и очистить буфер"""
+        with self._lock:
+            items, self._items = self._items, []
+        if not items or not self._should_attach(failed):
+            return
+        for name, body, attachment_type in items:
+            self._attach(name, body, attachment_type)
+
+    def _should_attach(self, failed: bool) -> bool:
+        if self.policy == "always" or failed:
+            return True
+        if self.policy == "on_failure":
+            return random.random() < self.sample_rate
+        return False
+
+    def _attach(self, name: str, body, attachment_type):
+        body, attachment_type = self._render(body, attachment_type)
+        allure.attach(body, name=name, attachment_type=attachment_type)
+
+    def _render(self, body, attachment_type):
+        """Сериализовать артефакт и обрезать до max_bytes байт
+
+        Обрезанный JSON уже не разбирается, поэтому обрезанный артефакт
+        прикрепляется как TEXT с пометкой о размере.
+        """
+        if not isinstance(body, (str, bytes)):
+            if attachment_type == allure.attachment_type.JSON:
+                body = json.dumps(body, indent=2, ensure_ascii=False)
+            else:
+                body = str(body)
+        if not self.max_bytes:
+            return body, attachment_type
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        if len(data) <= self.max_bytes:
+            return body, attachment_type
+        kept = data[:self.max_bytes]
+        if isinstance(body, str):
+            # Не оставлять половину многобайтового символа
+            kept = kept.decode("utf-8", errors="ignore").encode("utf-8")
+        marker = f"\n... [обрезано: {len(kept)} из {len(data)} байт]".encode("utf-8")
+        return kept + marker, allure.attachment_type.TEXT
+
+
+class BackgroundFileLogger:
+    """Запись файлов Allure attachments в фоновом потоке
+
+    Подменяет AllureFileLogger из allure-pytest: результаты тестов
+    пишутся как раньше, а файлы attachments складываются в очередь и
+    записываются пачками, не задерживая тест.
+
+    С dedup файл attachment называется по хэшу содержимого и пишется
+    один раз: одинаковые страницы, скриншоты и JSON ответы разных тестов
+    (и воркеров xdist) ссылаются на один файл. Ссылки source в
+    результатах тестов переписываются перед их записью.
+    """
+
+    def __init__(self, file_logger: AllureFileLogger, dedup: bool = ATTACHMENTS_DEDUP):
+        self.file_logger = file_logger
+        self.dedup = dedup
+        self.stored = 0
+        self.duplicates = 0
+        self._names = set()
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=WRITER_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._worker, name="allure-writer", daemon=True)
+        self._thread.start()
+
+    @allure_commons.hookimpl
+    def report_result(self, result):
+        self._rewrite_sources(result)
+        self.file_logger.report_result(result)
+
+    @allure_commons.hookimpl
+    def report_container(self, container):
+        self._rewrite_sources(container)
+        self.file_logger.report_container(container)
+
+    @allure_commons.hookimpl
+    def report_attached_file(self, source, file_name):
+        if not self.dedup:
+            # Исходный файл может быть удален сразу после attach - копируем синхронно
+            self.file_logger.report_attached_file(source, file_name)
+            return
+        with open(source, "rb") as file:
+            self.report_attached_data(file.read(), file_name)
+
+    @allure_commons.hookimpl
+    def report_attached_data(self, body, file_name):
+        if self.dedup:
+            data = body.encode("utf-8") if isinstance(body, str) else body
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            content_name = f"{digest}-attachment{os.path.splitext(file_name)[1]}"
+            with self._lock:
+                self._sources[file_name] = content_name
+                if content_name in self._names:
+                    self.duplicates += 1
+                    return
+                self._names.add(content_name)
+            body, file_name = data, content_name
+        self._queue.put((body, file_name))
+
+    def _rewrite_sources(self, item):
+        """Заменить имена attachments на имена по содержимому (в шагах и фикстурах тоже)"""
+        if not self.dedup:
+            return
+        for attachment in getattr(item, "attachments", None) or ():
+            attachment.source = self._sources.get(attachment.source, attachment.source)
+        for name in ("steps", "befores", "afters"):
+            for child in getattr(item, name, None) or ():
+                self._rewrite_sources(child)
+
+    def _write(self, body, file_name):
+        if not self.dedup:
+            self.file_logger.report_attached_data(body, file_name)
+            return
+        destination = os.path.join(self.file_logger._report_dir, file_name)
+        if os.path.exists(destination):
+            # Такой же файл уже записал другой воркер или прошлый прогон
+            return
+        temporary = f"{destination}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(body)
+        os.replace(temporary, destination)
+        self.stored += 1
+
+    def _worker(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < WRITER_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for body, file_name in batch:
+                try:
+                    self._write(body, file_name)
+                except OSError as e:
+                    logger.error("Не удалось записать attachment %s: %s", file_name, e)
+                finally:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Дождаться записи всех файлов из очереди"""
+        self._queue.join()
+
+
+def install_background_writer(config):
+    """Заменить AllureFileLogger фоновым писателем (если включен --alluredir)"""
+    file_loggers = [plugin for plugin in allure_commons.plugin_manager.get_plugins()
+                    if isinstance(plugin, AllureFileLogger)]
+    for file_logger in file_loggers:
+        name = allure_commons.plugin_manager.get_name(file_logger)
+        allure_commons.plugin_manager.unregister(file_logger)
+        writer = BackgroundFileLogger(file_logger)
+        allure_commons.plugin_manager.register(writer)
+
+        def restore(writer=writer, file_logger=file_logger, name=name):
+            # Очистка allure-pytest снимает исходный логгер с регистрации,
+            # поэтому возвращаем его на место после записи очереди
+            writer.flush()
+            allure_commons.plugin_manager.unregister(writer)
+            allure_commons.plugin_manager.register(file_logger, name=name)
+
+        config.add_cleanup(restore)
+
+
+def flush_sinks(owners, failed: bool = False):
+    """Сбросить AttachmentSink всех объектов с атрибутом attachments"""
+    for owner in owners:
+        sink = getattr(owner, "attachments", None)
+        if isinstance(sink, AttachmentSink):
+            sink.flush(failed)
@@ -1,58 +1,120 @@
+import os
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
 import allure
 from allure_commons.types import AttachmentType
 
+logger = logging.getLogger(__name__)
 
-def add_screenshot(driver):
-    """Добавить скриншот в Allure отчет"""
-    png = driver.get_screenshot_as_png()
-    allure.attach(
-        body=png,
-        name="Screenshot",
-        attachment_type=AttachmentType.PNG,
-        extension=".png"
-    )
+# Какие артефакты UI теста прикреплять:
+#   always     - все артефакты после каждого теста
+#   on_failure - все артефакты после упавшего теста, после успешного только скриншот
+#   failed     - только после упавшего теста
+#   never      - ничего
+UI_ARTIFACTS_POLICY = os.getenv("ALLURE_UI_ARTIFACTS", "on_failure")
 
+# Артефакт: (body, name, attachment_type, extension)
+Artifact = Tuple[object, str, AttachmentType, str]
 
-def add_logs(driver):
-    """Добавить логи браузера в Allure отчет"""
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ui-artifacts")
+
+
+def _screenshot(driver) -> Artifact:
+    return driver.get_screenshot_as_png(), "Screenshot", AttachmentType.PNG, ".png"
+
+
+def _logs(driver) -> Artifact:
     try:
         logs = driver.get_log("browser")
         log_str = "\n".join([f"{log['level']}: {log['message']}" for log in logs])
-        allure.attach(
-            body=log_str,
-            name="Browser Logs",
-            attachment_type=AttachmentType.TEXT,
-            extension=".log"
-        )
+        return log_str, "Browser Logs", AttachmentType.TEXT, ".log"
     except Exception as e:
-        allure.attach(
-            body=f"Could not get browser logs: {str(e)}",
-            name="Browser Logs Error",
-            attachment_type=AttachmentType.TEXT,
-            extension=".log"
-        )
+        return f"Could not get browser logs: {str(e)}", "Browser Logs Error", AttachmentType.TEXT, ".log"
 
 
-def add_html(driver):
-    """Добавить HTML страницы в Allure отчет"""
-    html = driver.page_source
-    allure.attach(
-        body=html,
-        name="Page Source",
-        attachment_type=AttachmentType.HTML,
-        extension=".html"
-    )
+def _html(driver) -> Artifact:
+    return driver.page_source, "Page Source", AttachmentType.HTML, ".html"
 
 
-def add_video(driver):
-    """Добавить ссылку на видео в Allure отчет"""
+def _video(driver) -> Artifact:
     # Selenoid сохраняет видео по URL сессии
     video_url = f"https://selenoid.autotests.cloud/video/{driver.session_id}.mp4"
     html = f'<html><body><video width="100%" height="100%" controls autoplay>' \
            f'<source src="{video_url}" type="video/mp4"></video></body></html>'
-    allure.attach(
-        body=html,
-        name="Video",
-        attachment_type=AttachmentType.HTML,
-        extension=".html"
-    )
\ No newline at end of file
+    return html, "Video", AttachmentType.HTML, ".html"
+
+
+ARTIFACTS: Dict[str, Callable[..., Artifact]] = {
+    "screenshot": _screenshot,
+    "logs": _logs,
+    "html": _html,
+    "video": _video,
+}
+
+
+def _attach(artifact: Artifact):
+    body, name, attachment_type, extension = artifact
+    allure.attach(body=body, name=name, attachment_type=attachment_type, extension=extension)
+
+
+def add_screenshot(driver):
+    """Добавить скриншот в Allure отчет"""
+    _attach(_screenshot(driver))
+
+
+def add_logs(driver):
+    """Добавить логи браузера в Allure отчет"""
+    _attach(_logs(driver))
+
+
+def add_html(driver):
+    """Добавить HTML страницы в Allure отчет"""
+    _attach(_html(driver))
+
+
+def add_video(driver):
+    """Добавить ссылку на видео в Allure отчет"""
+    _attach(_video(driver))
+
+
+def artifacts_for(failed: bool, policy: str = UI_ARTIFACTS_POLICY, video: bool = True) -> Tuple[str, ...]:
+    """Имена артефактов, которые нужно собрать по правилу policy
+
+    video=False - без ссылки на видео: сессия из пула (utils.browser_pool)
+    обслуживает несколько тестов, и видео Selenoid пишется на всю сессию.
+    """
+    if policy == "always" or (failed and policy in ("on_failure", "failed")):
+        return tuple(name for name in ARTIFACTS if video or name != "video")
+    if policy == "on_failure":
+        return ("screenshot",)
+    return ()
+
+
+def add_artifacts(driver, failed: bool = False, policy: str = UI_ARTIFACTS_POLICY,
+                  history: List[dict] = None, video: bool = True):
+    """Собрать артефакты теста параллельно и прикрепить их к Allure
+
+    Каждый артефакт - отдельный запрос к WebDriver, поэтому они
+    запрашиваются одновременно. Файлы в allure-results пишет фоновый
+    поток (utils.allure_sink), тест ждет только ответов браузера.
+    history - последние состояния страницы (utils.page_history), они
+    прикрепляются вместе с полным набором артефактов. Одинаковые
+    скриншоты разных тестов хранятся одним файлом (utils.allure_sink).
+    video=False - не прикреплять ссылку на видео (см. artifacts_for).
+    """
+    names = artifacts_for(failed, policy, video)
+    futures = [(name, _executor.submit(ARTIFACTS[name], driver)) for name in names]
+    for name, future in futures:
+        try:
+            artifact = future.result()
+            _attach(artifact)
+        except Exception as e:
+            logger.warning("Could not collect %s: %s", name, e)
+            allure.attach(f"Could not collect {name}: {e}", name=f"{name} error",
+                          attachment_type=AttachmentType.TEXT, extension=".log")
+    if history and "html" in names:
+        allure.attach(json.dumps(history, ensure_ascii=False, indent=2), name="Page history",
+                      attachment_type=AttachmentType.JSON, extension=".json")
@@ -0,0 +1,150 @@
+"""Пул прогретых WebDriver сессий на воркер pytest
+
+Создание сессии в Selenoid (контейнер, Chrome, VNC, видео) занимает
+несколько секунд. Пул отдает тесту уже открытую сессию, а после теста
+сбрасывает ее: закрывает лишние вкладки, удаляет cookies всех доменов
+(CDP Network.clearBrowserCookies) и очищает хранилища всех посещенных
+во вкладках origin (CDP Storage.clearDataForOrigin). Без CDP (не Chrome)
+очищается только сайт, открытый в момент сброса. Сессия пересоздается после max_uses
+тестов, после упавшего теста или если сброс не удался.
+
+Тесты одного воркера xdist идут последовательно, поэтому на воркер
+нужна одна сессия, и всего их столько же, сколько воркеров.
+"""
+import os
+import logging
+import threading
+from typing import Callable, Dict, List, Set
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.request_blocking import cdp
+
+logger = logging.getLogger(__name__)
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+# Сколько тестов проходит в одной сессии (1 - новая сессия на каждый тест)
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "20"))
+IMPLICIT_WAIT = 10
+
+_CLEAR_STORAGE_JS = "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+# Хранилища, которые очищаются для каждого посещенного origin (cookies - отдельно, для всех доменов)
+CLEARED_STORAGE_TYPES = "local_storage,indexeddb,cache_storage,service_workers,websql,file_systems"
+
+
+class BrowserPool:
+    """Пул WebDriver сессий с очисткой между тестами"""
+
+    def __init__(self, factory: Callable[[], WebDriver], size: int = BROWSER_POOL_SIZE,
+                 max_uses: int = BROWSER_MAX_USES):
+        self.factory = factory
+        self.size = max(size, 1)
+        self.max_uses = max(max_uses, 1)
+        self.created = 0
+        self._idle: List[WebDriver] = []
+        self._uses: Dict[str, int] = {}
+        self._busy = 0
+        self._available = threading.Condition()
+
+    def acquire(self) -> WebDriver:
+        """Взять сессию из пула (или создать новую, если пул не заполнен)"""
+        with self._available:
+            while not self._idle and self._busy >= self.size:
+                self._available.wait()
+            self._busy += 1
+            if self._idle:
+                return self._idle.pop()
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._available:
+                self._busy -= 1
+                self._available.notify()
+            raise
+        driver.implicitly_wait(IMPLICIT_WAIT)
+        self.created += 1
+        self._uses[driver.session_id] = 0
+        logger.info("Browser session %s created", driver.session_id)
+        return driver
+
+    def release(self, driver: WebDriver, failed: bool = False):
+        """Вернуть сессию после теста: сбросить или закрыть"""
+        uses = self._uses.get(driver.session_id, 0) + 1
+        self._uses[driver.session_id] = uses
+        keep = not failed and uses < self.max_uses and self.reset(driver)
+        if not keep:
+            self._discard(driver, "test failed" if failed else f"{uses} uses")
+        with self._available:
+            self._busy -= 1
+            if keep:
+                self._idle.append(driver)
+            self._available.notify()
+
+    @staticmethod
+    def reset(driver: WebDriver) -> bool:
+        """Привести сессию в исходное состояние; False, если сессия сломана
+
+        Origin для очистки хранилищ собираются из истории каждой вкладки
+        до ее закрытия. sessionStorage CDP не очищает, поэтому оно
+        очищается скриптом до перехода на about:blank.
+        """
+        try:
+            handles = driver.window_handles
+            origins: Set[str] = set()
+            for handle in reversed(handles):
+                driver.switch_to.window(handle)
+                origins |= BrowserPool._visited_origins(driver)
+                if handle != handles[0]:
+                    driver.close()
+            if not BrowserPool._clear_browser_data(driver, origins):
+                driver.delete_all_cookies()
+            driver.execute_script(_CLEAR_STORAGE_JS)
+            driver.get("about:blank")
+            driver.implicitly_wait(IMPLICIT_WAIT)
+            return True
+        except WebDriverException as e:
+            logger.warning("Browser session %s reset failed: %s", driver.session_id, e)
+            return False
+
+    @staticmethod
+    def _visited_origins(driver: WebDriver) -> Set[str]:
+        """http(s) origin из истории текущей вкладки (пусто без CDP)"""
+        try:
+            entries = cdp(driver, "Page.getNavigationHistory")["entries"]
+        except WebDriverException:
+            return set()
+        origins = set()
+        for entry in entries:
+            url = urlsplit(entry.get("url", ""))
+            if url.scheme in ("http", "https") and url.netloc:
+                origins.add(f"{url.scheme}://{url.netloc}")
+        return origins
+
+    @staticmethod
+    def _clear_browser_data(driver: WebDriver, origins: Set[str]) -> bool:
+        """Удалить cookies всех доменов и хранилища origins через CDP; False - CDP недоступен"""
+        try:
+            cdp(driver, "Network.clearBrowserCookies")
+        except WebDriverException as e:
+            logger.debug("CDP is not available, clearing the current site only: %s", e.msg)
+            return False
+        for origin in sorted(origins):
+            cdp(driver, "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": CLEARED_STORAGE_TYPES})
+        return True
+
+    def _discard(self, driver: WebDriver, reason: str):
+        logger.info("Browser session %s recycled: %s", driver.session_id, reason)
+        self._uses.pop(driver.session_id, None)
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            logger.warning("Browser session %s quit failed: %s", driver.session_id, e)
+
+    def close(self):
+        """Закрыть все свободные сессии"""
+        with self._available:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver, "pool closed")
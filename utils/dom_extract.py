@@ -0,0 +1,85 @@
+"""Извлечение данных со страницы одним запросом к браузеру
+
+Чтение карточек по одной (find_elements, затем .text и get_attribute у
+каждого элемента) стоит отдельного запроса WebDriver на каждое поле
+каждой карточки: страница из 24 книг - это десятки запросов. Здесь один
+execute_script находит все совпадения локатора и возвращает для каждого
+словарь полей.
+
+Поле описывается парой (CSS селектор внутри совпадения, что читать):
+селектор "" или None - само совпадение; "text" - видимый текст
+(как WebElement.text), иначе - свойство DOM или атрибут (как
+get_attribute: для href - абсолютный URL). Ненайденное поле - None.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from utils.dom_wait import implicit_wait_disabled, script_locator
+
+logger = logging.getLogger(__name__)
+
+Field = Tuple[Optional[str], str]
+
+_EXTRACT_JS = """
+var using = arguments[0], value = arguments[1], fields = arguments[2], limit = arguments[3];
+var nodes = [];
+if (using === 'xpath') {
+    var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+} else {
+    nodes = Array.prototype.slice.call(document.querySelectorAll(value));
+}
+if (limit) nodes = nodes.slice(0, limit);
+
+function read(el, what) {
+    if (!el) return null;
+    if (what === 'text') return (el.innerText || el.textContent || '').trim();
+    var prop = el[what];
+    if (prop !== undefined && prop !== null && typeof prop !== 'object' && typeof prop !== 'function') {
+        return String(prop);
+    }
+    return el.getAttribute(what);
+}
+
+return nodes.map(function (node) {
+    var row = {};
+    fields.forEach(function (field) {
+        row[field[0]] = read(field[1] ? node.querySelector(field[1]) : node, field[2]);
+    });
+    return row;
+});
+"""
+
+
+def extract_all(driver, locator: Tuple[str, str], fields: Dict[str, Field],
+                limit: int = None) -> List[Dict[str, Optional[str]]]:
+    """Прочитать поля fields у всех (или первых limit) совпадений локатора"""
+    in_page = script_locator(locator)
+    if in_page is not None:
+        spec = [[name, selector or "", what] for name, (selector, what) in fields.items()]
+        try:
+            return driver.execute_script(_EXTRACT_JS, in_page[0], in_page[1], spec, limit or 0)
+        except WebDriverException as e:
+            logger.debug("In-page extraction %s failed, reading elements one by one: %s", locator, e.msg)
+    return _extract_elements(driver, locator, fields, limit)
+
+
+def _extract_elements(driver, locator, fields, limit) -> List[Dict[str, Optional[str]]]:
+    """Запасной вариант: по запросу WebDriver на каждое поле"""
+    rows = []
+    with implicit_wait_disabled(driver):
+        elements = driver.find_elements(*locator)
+        for element in elements[:limit] if limit else elements:
+            row = {}
+            for name, (selector, what) in fields.items():
+                try:
+                    target = element.find_element(By.CSS_SELECTOR, selector) if selector else element
+                except NoSuchElementException:
+                    row[name] = None
+                    continue
+                row[name] = target.text.strip() if what == "text" else target.get_attribute(what)
+            rows.append(row)
+    return rows
@@ -0,0 +1,189 @@
+"""Ожидания на стороне страницы вместо опроса через WebDriverWait
+
+WebDriverWait проверяет условие запросом к браузеру каждые 0.5 сек.
+Здесь условие проверяет сама страница: один execute_async_script
+подписывается на MutationObserver и readystatechange и возвращает
+результат, как только условие выполнено (или null по таймауту). Для
+изменений без мутаций DOM (CSS анимации) условие дополнительно
+проверяется внутри страницы раз в RECHECK_MS.
+
+Если скрипт не удалось выполнить (переход на другую страницу во время
+ожидания, локатор не CSS/XPath, таймаут больше таймаута скриптов
+сессии), ожидание продолжается обычным опросом WebDriverWait.
+
+wait_for_any ждет первую из нескольких альтернатив CSS локатора (в
+заданном порядке) и сообщает, какая сработала - см. utils.locator_cache. На время
+опроса неявное ожидание драйвера отключается: иначе каждая проверка
+find_element внутри условия сама ждет до IMPLICIT_WAIT сек, и короткий
+таймаут превращается в 10 сек и больше.
+"""
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.browser_pool import IMPLICIT_WAIT
+
+logger = logging.getLogger(__name__)
+
+# UI_EVENT_WAITS=0 возвращает ожидания опросом
+EVENT_WAITS = os.getenv("UI_EVENT_WAITS", "1") == "1"
+RECHECK_MS = 100
+# Таймаут execute_async_script в Selenium по умолчанию - 30 сек
+MAX_EVENT_TIMEOUT = 25
+# Таймаут проверок отсутствия элемента ("корзина пуста", "модалки нет")
+NEGATIVE_TIMEOUT = float(os.getenv("UI_NEGATIVE_TIMEOUT", "1"))
+
+KINDS = ("present", "visible", "clickable", "invisible", "ready")
+
+_WAIT_JS = """
+var kind = arguments[0], using = arguments[1], values = arguments[2], timeout = arguments[3],
+    recheck = arguments[4], done = arguments[arguments.length - 1];
+
+function find(value) {
+    if (using === 'xpath') {
+        return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(value);
+}
+function visible(el) {
+    if (!el || !el.isConnected) return false;
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') return false;
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+// [результат, номер сработавшей альтернативы] или null
+function check() {
+    if (kind === 'ready') return document.readyState === 'complete' ? [true, 0] : null;
+    if (kind === 'invisible') {
+        for (var i = 0; i < values.length; i++) if (visible(find(values[i]))) return null;
+        return [true, 0];
+    }
+    for (var j = 0; j < values.length; j++) {
+        var el = find(values[j]);
+        if (kind === 'present' ? el : visible(el) && (kind === 'visible' || !el.disabled)) return [el, j];
+    }
+    return null;
+}
+
+var result = check();
+if (result) { done(result); return; }
+
+var finished = false, observer = null, interval = null, timer = null;
+function finish(value) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    document.removeEventListener('readystatechange', onChange);
+    done(value);
+}
+function onChange() {
+    var value = check();
+    if (value) finish(value);
+}
+observer = new MutationObserver(onChange);
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+document.addEventListener('readystatechange', onChange);
+interval = setInterval(onChange, recheck);
+timer = setTimeout(function () { finish(null); }, timeout);
+"""
+
+# Локаторы, которые сводятся к CSS селектору
+_CSS = {
+    By.CSS_SELECTOR: "{}",
+    By.ID: '[id="{}"]',
+    By.NAME: '[name="{}"]',
+    By.CLASS_NAME: ".{}",
+    By.TAG_NAME: "{}",
+}
+
+
+def script_locator(locator: Optional[Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+    """Локатор Selenium -> ("css" | "xpath", выражение) для скриптов в странице или None"""
+    if locator is None:
+        return "css", ""
+    by, value = locator
+    if by == By.XPATH:
+        return "xpath", value
+    if by in _CSS:
+        return "css", _CSS[by].format(value)
+    return None
+
+
+@contextmanager
+def implicit_wait_disabled(driver, restore: float = IMPLICIT_WAIT):
+    """Временно отключить неявное ожидание драйвера (find_element без ожидания)"""
+    driver.implicitly_wait(0)
+    try:
+        yield driver
+    finally:
+        driver.implicitly_wait(restore)
+
+
+def _wait_script(driver, kind: str, using: str, values: List[str], timeout: float) -> Optional[list]:
+    """Ожидание в странице: [результат, номер альтернативы], None - скрипт недоступен"""
+    try:
+        result = driver.execute_async_script(_WAIT_JS, kind, using, values, int(timeout * 1000), RECHECK_MS)
+    except WebDriverException as e:
+        logger.debug("In-page wait %s %s failed, polling instead: %s", kind, values, e.msg)
+        return None
+    if not result:
+        raise TimeoutException(f"Ожидание '{kind}' для {values} не выполнено за {timeout} сек")
+    return result
+
+
+def _poll(driver, timeout: float, poll_frequency: float, condition: Callable):
+    with implicit_wait_disabled(driver):
+        return WebDriverWait(driver, max(timeout, 0), poll_frequency).until(condition)
+
+
+def wait_in_page(driver, kind: str, locator: Optional[Tuple[str, str]], timeout: float,
+                 fallback: Callable, poll_frequency: float = 0.5):
+    """Дождаться условия kind для локатора и вернуть результат (элемент или True)
+
+    fallback - условие для WebDriverWait (expected_conditions), по
+    которому ожидание продолжается опросом, если ожидание в странице
+    недоступно. По истечении timeout - TimeoutException, как у WebDriverWait.
+    """
+    deadline = time.monotonic() + timeout
+    in_page = script_locator(locator)
+    if EVENT_WAITS and in_page is not None and timeout <= MAX_EVENT_TIMEOUT:
+        result = _wait_script(driver, kind, in_page[0], [in_page[1]], timeout)
+        if result is not None:
+            return result[0]
+    return _poll(driver, deadline - time.monotonic(), poll_frequency, fallback)
+
+
+def wait_for_any(driver, kind: str, alternatives: List[str], timeout: float,
+                 condition: Callable, poll_frequency: float = 0.5) -> Tuple[object, str]:
+    """Дождаться условия kind для первой подходящей CSS альтернативы
+
+    Альтернативы проверяются в заданном порядке; вернуть (результат,
+    сработавшая альтернатива). condition - фабрика expected_conditions по
+    локатору (например, EC.visibility_of_element_located) для опроса.
+    """
+    deadline = time.monotonic() + timeout
+    if EVENT_WAITS and timeout <= MAX_EVENT_TIMEOUT:
+        result = _wait_script(driver, kind, "css", alternatives, timeout)
+        if result is not None:
+            return result[0], alternatives[result[1]]
+
+    def first_match(d):
+        for alternative in alternatives:
+            try:
+                result = condition((By.CSS_SELECTOR, alternative))(d)
+            except NoSuchElementException:
+                continue
+            if result:
+                return result, alternative
+        return False
+
+    return _poll(driver, deadline - time.monotonic(), poll_frequency, first_match)
@@ -0,0 +1,122 @@
+"""Выученные альтернативы CSS локаторов
+
+Многие локаторы - список альтернатив через запятую ("[data-testid*='buyButton'],
+button[class*='buy'], ..."), потому что разметка Литрес меняется. Браузер
+проверяет такой список целиком, а querySelector возвращает первое
+совпадение в порядке документа - не обязательно видимое или кликабельное,
+из-за чего ожидание истекает и тест уходит в медленный запасной вариант.
+
+BasePage проверяет альтернативы по отдельности, начиная с той, что уже
+сработала на этом типе страницы в текущем прогоне, и запоминает
+результат. В конце прогона пишется отчет: сколько раз сработала каждая
+альтернатива и какие не сработали ни разу - кандидаты на удаление.
+"""
+import os
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# UI_LOCATOR_LEARNING=0 - локаторы-списки проверяются целиком, как раньше
+LOCATOR_LEARNING = os.getenv("UI_LOCATOR_LEARNING", "1") == "1"
+LOCATOR_REPORT_PATH = os.getenv("UI_LOCATOR_REPORT", "locator-report.json")
+
+
+def split_selector(selector: str) -> List[str]:
+    """Разбить список CSS селекторов по запятым верхнего уровня
+
+    Запятые внутри кавычек, [атрибутов] и :is(...) не разделяют альтернативы.
+    """
+    parts, depth, quote, start = [], 0, None, 0
+    for i, char in enumerate(selector):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(selector[start:i].strip())
+            start = i + 1
+    parts.append(selector[start:].strip())
+    return [part for part in parts if part]
+
+
+class LocatorCache:
+    """Какая альтернатива локатора срабатывает на каком типе страницы (потокобезопасно)"""
+
+    def __init__(self):
+        # {(страница, селектор): {альтернатива: число срабатываний}}
+        self.hits: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def order(self, page: str, selector: str) -> Optional[List[str]]:
+        """Альтернативы в порядке проверки (выученная - первой) или None, если альтернатива одна"""
+        alternatives = split_selector(selector)
+        if len(alternatives) < 2:
+            return None
+        with self._lock:
+            counts = self.hits.setdefault((page, selector), dict.fromkeys(alternatives, 0))
+            best = max(alternatives, key=lambda alternative: counts.get(alternative, 0))
+            learned = counts.get(best, 0) > 0
+        if learned:
+            alternatives.remove(best)
+            alternatives.insert(0, best)
+        return alternatives
+
+    def learn(self, page: str, selector: str, alternative: str):
+        """Запомнить, что alternative сработала для selector на странице page"""
+        with self._lock:
+            counts = self.hits.setdefault((page, selector), dict.fromkeys(split_selector(selector), 0))
+            counts[alternative] = counts.get(alternative, 0) + 1
+
+    def merge(self, other: "LocatorCache"):
+        with self._lock:
+            for key, counts in other.hits.items():
+                merged = self.hits.setdefault(key, {})
+                for alternative, count in counts.items():
+                    merged[alternative] = merged.get(alternative, 0) + count
+
+    def report(self) -> List[dict]:
+        """Использованные локаторы: срабатывания альтернатив и ни разу не сработавшие"""
+        with self._lock:
+            items = sorted(self.hits.items())
+        return [
+            {
+                "page": page,
+                "locator": selector,
+                "hits": dict(counts),
+                "unused": [alternative for alternative, count in counts.items() if not count],
+            }
+            for (page, selector), counts in items
+            if any(counts.values())
+        ]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {f"{page}\t{selector}": dict(counts) for (page, selector), counts in self.hits.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LocatorCache":
+        cache = cls()
+        for key, counts in data.items():
+            page, selector = key.split("\t", 1)
+            cache.hits[(page, selector)] = dict(counts)
+        return cache
+
+    def write_report(self, path: str = LOCATOR_REPORT_PATH):
+        """Записать отчет в JSON файл (если локаторы-списки использовались)"""
+        report = self.report()
+        if not path or not report:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+# Один кэш на процесс (воркер xdist): страницы создаются на каждый тест
+locator_cache = LocatorCache()
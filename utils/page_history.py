@@ -0,0 +1,69 @@
+"""Кольцевой буфер последних состояний страницы в UI тесте
+
+Слушатель EventFiringWebDriver запоминает переходы (URL и заголовок),
+клики и ввод текста по последнему найденному локатору. Ожидания в
+странице (utils.dom_wait) находят элементы без find_element, поэтому
+BasePage сообщает локатор сам через remember_locator. Дополнительный
+запрос к браузеру делается только при переходе на новую страницу.
+Буфер прикрепляется к Allure вместе с артефактами упавшего теста.
+"""
+import os
+import time
+from collections import deque
+from typing import List, Tuple
+
+from selenium.webdriver.support.events import AbstractEventListener
+
+PAGE_HISTORY_SIZE = int(os.getenv("UI_PAGE_HISTORY_SIZE", "20"))
+
+_PAGE_STATE_JS = "return [window.location.href, document.title];"
+
+
+class PageHistory(AbstractEventListener):
+    """Последние size событий страницы"""
+
+    def __init__(self, size: int = PAGE_HISTORY_SIZE):
+        self.states = deque(maxlen=size)
+        self.started = time.monotonic()
+        self._locator = None
+
+    def __len__(self):
+        return len(self.states)
+
+    def to_list(self) -> List[dict]:
+        return list(self.states)
+
+    def _add(self, event: str, **details):
+        self.states.append({"t": round(time.monotonic() - self.started, 3), "event": event, **details})
+
+    def _page(self, event: str, driver):
+        try:
+            url, title = driver.execute_script(_PAGE_STATE_JS)
+        except Exception:
+            url, title = None, None
+        self._add(event, url=url, title=title)
+
+    def after_navigate_to(self, url, driver):
+        self._page("navigate", driver)
+
+    def after_navigate_back(self, driver):
+        self._page("back", driver)
+
+    def after_navigate_forward(self, driver):
+        self._page("forward", driver)
+
+    def before_find(self, by, value, driver):
+        self._locator = f"{by}={value}"
+
+    def after_click(self, element, driver):
+        self._add("click", locator=self._locator)
+
+    def after_change_value_of(self, element, driver):
+        self._add("input", locator=self._locator)
+
+
+def remember_locator(driver, locator: Tuple[str, str]):
+    """Передать истории страницы локатор элемента, найденного без find_element"""
+    listener = getattr(driver, "_listener", None)
+    if isinstance(listener, PageHistory):
+        listener.before_find(locator[0], locator[1], driver)
@@ -0,0 +1,180 @@
+"""Блокировка лишних запросов страницы через CDP и статистика загрузки страниц
+
+Страницы Литрес подгружают аналитику, рекламу, шрифты и видео, которые
+не нужны ни одной проверке, а BasePage.open ждет document.readyState ==
+complete - то есть и их тоже. Профиль блокировки передается в Chrome
+командой CDP Network.setBlockedURLs (через /session/{id}/goog/cdp/execute,
+это работает и в Selenoid). Профиль выбирается на тест маркером
+@pytest.mark.block_requests("lite") или переменной UI_BLOCK_PROFILE.
+
+После каждого BasePage.open из Performance API страницы читаются время
+загрузки и объем переданных данных; в конце прогона пишется отчет по
+типам страниц и профилям с экономией относительно профиля "none".
+Кросс-доменные ресурсы без Timing-Allow-Origin отдают transferSize = 0,
+поэтому байты - оценка снизу.
+"""
+import os
+import json
+import logging
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*mc.yandex.ru*",
+    "*an.yandex.ru*", "*yandex.ru/ads*", "*ads.adfox.ru*", "*top-fwz1.mail.ru*", "*vk.com/rtrg*",
+    "*connect.facebook.net*", "*criteo.*", "*mindbox.ru*", "*sentry.io*",
+]
+# Картинки не блокируются: проверки видимости обложек и логотипа зависят от их размеров
+FONTS_AND_MEDIA = ["*.woff2*", "*.woff*", "*.ttf*", "*.otf*", "*.mp4*", "*.webm*"]
+
+PROFILES: Dict[str, List[str]] = {
+    "none": [],
+    "analytics": ANALYTICS,
+    "lite": ANALYTICS + FONTS_AND_MEDIA,
+}
+
+# По умолчанию ничего не блокируется: профиль включается маркером или переменной
+BLOCK_PROFILE = os.getenv("UI_BLOCK_PROFILE", "none")
+# Дополнительные шаблоны через запятую, добавляются к любому профилю кроме "none"
+BLOCKED_URLS = [pattern.strip() for pattern in os.getenv("UI_BLOCKED_URLS", "").split(",") if pattern.strip()]
+PAGE_LOAD_REPORT_PATH = os.getenv("UI_PAGE_LOAD_REPORT", "page-load-report.json")
+
+CDP_COMMAND = "executeCdpCommand"
+
+_PAGE_LOAD_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+if (!nav) return null;
+var resources = performance.getEntriesByType('resource'), bytes = nav.transferSize || 0;
+for (var i = 0; i < resources.length; i++) bytes += resources[i].transferSize || 0;
+return {load_ms: (nav.loadEventEnd || nav.domComplete) - nav.startTime, bytes: bytes,
+        requests: resources.length + 1};
+"""
+
+# Профиль, примененный к сессии: {driver: (профиль, шаблоны)}
+_applied: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def patterns_for(profile: str) -> List[str]:
+    """Шаблоны URL профиля вместе с UI_BLOCKED_URLS"""
+    if profile not in PROFILES:
+        raise ValueError(f"Неизвестный профиль блокировки '{profile}', доступны: {', '.join(PROFILES)}")
+    return PROFILES[profile] + BLOCKED_URLS if PROFILES[profile] else []
+
+
+def cdp(driver, cmd: str, params: dict = None):
+    # У Remote с ChromeOptions команда уже есть (ChromiumRemoteConnection), у прочих - добавляется
+    if CDP_COMMAND not in driver.command_executor._commands:
+        driver.command_executor._commands[CDP_COMMAND] = ("POST", "/session/$sessionId/goog/cdp/execute")
+    return driver.execute(CDP_COMMAND, {"cmd": cmd, "params": params or {}})["value"]
+
+
+def apply_profile(driver, profile: str) -> bool:
+    """Включить профиль блокировки для сессии; False - CDP недоступен (не Chrome)"""
+    driver = getattr(driver, "wrapped_driver", driver)
+    patterns = patterns_for(profile)
+    current = _applied.get(driver)
+    if current is None and not patterns:
+        # Пока ничего не блокировалось, Network.enable не нужен
+        return True
+    if current is None or current[1] != patterns:
+        try:
+            if current is None:
+                cdp(driver, "Network.enable")
+            cdp(driver, "Network.setBlockedURLs", {"urls": patterns})
+        except WebDriverException as e:
+            logger.warning("Request blocking '%s' is not available: %s", profile, e.msg)
+            return False
+    _applied[driver] = (profile, patterns)
+    return True
+
+
+def active_profile(driver) -> str:
+    """Имя профиля, примененного к сессии ("none", если не применялся)"""
+    applied = _applied.get(getattr(driver, "wrapped_driver", driver))
+    return applied[0] if applied else "none"
+
+
+def measure_page_load(driver) -> Optional[dict]:
+    """{load_ms, bytes, requests} текущей страницы из Performance API или None"""
+    try:
+        return driver.execute_script(_PAGE_LOAD_JS)
+    except WebDriverException as e:
+        logger.debug("Page load timing is not available: %s", e.msg)
+        return None
+
+
+class PageLoadStats:
+    """Загрузки страниц по типу страницы и профилю блокировки (потокобезопасно)"""
+
+    def __init__(self):
+        # {(страница, профиль): [число загрузок, сумма мс, сумма байт, сумма запросов]}
+        self.totals: Dict[Tuple[str, str], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, page: str, profile: str, load: Optional[dict]):
+        if not load or load.get("load_ms") is None:
+            return
+        with self._lock:
+            total = self.totals.setdefault((page, profile), [0, 0.0, 0, 0])
+            total[0] += 1
+            total[1] += load["load_ms"]
+            total[2] += load.get("bytes") or 0
+            total[3] += load.get("requests") or 0
+
+    def merge(self, other: "PageLoadStats"):
+        with self._lock:
+            for key, values in other.totals.items():
+                total = self.totals.setdefault(key, [0, 0.0, 0, 0])
+                for i, value in enumerate(values):
+                    total[i] += value
+
+    def report(self) -> List[dict]:
+        """Средние по страницам и профилям и экономия относительно профиля "none" """
+        with self._lock:
+            items = sorted(self.totals.items())
+        means = {
+            key: {"loads": count, "mean_load_ms": round(load_ms / count, 1),
+                  "mean_kb": round(size / count / 1024, 1), "mean_requests": round(requests / count, 1)}
+            for key, (count, load_ms, size, requests) in items
+        }
+        report = []
+        for (page, profile), mean in means.items():
+            row = {"page": page, "profile": profile, **mean}
+            baseline = means.get((page, "none"))
+            if baseline and profile != "none":
+                row["saved_ms"] = round(baseline["mean_load_ms"] - mean["mean_load_ms"], 1)
+                row["saved_kb"] = round(baseline["mean_kb"] - mean["mean_kb"], 1)
+            report.append(row)
+        return report
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {f"{page}\t{profile}": list(values) for (page, profile), values in self.totals.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PageLoadStats":
+        stats = cls()
+        for key, values in data.items():
+            page, profile = key.split("\t", 1)
+            stats.totals[(page, profile)] = list(values)
+        return stats
+
+    def write_report(self, path: str = PAGE_LOAD_REPORT_PATH):
+        """Записать отчет в JSON файл (если страницы открывались)"""
+        report = self.report()
+        if not path or not report:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+# Одна статистика на процесс (воркер xdist), контроллер собирает ее с воркеров
+page_loads = PageLoadStats()